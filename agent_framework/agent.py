@@ -1,26 +1,61 @@
+import asyncio
+import json
+import random
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, ClassVar, Dict, List, Optional, Sequence, Set, Tuple
 from uuid import uuid4
 from datetime import datetime
 from .utils.logging import AgentLogger
 from .utils.tool_registry import ToolRegistry
 
 from .models import (
-    TaskExecution, VerbosityLevel, TaskAnalysis, ToolContext,
+    TaskExecution, VerbosityLevel, TaskAnalysis, ToolContext, SequenceView,
     ToolSelectionHooks, AgentConfig
 )
 from .llm.base import LLMProvider
-from .llm.models import LLMMessage
+from .llm.models import LLMMessage, LLMToolCall
+from .context import RunContext
+from .history import BlobStore, MessageHistory, Summarizer
+from .checkpoint import CheckpointStore
+from .events import (
+    AgentEvent, EventStream, PlanReady, StepStarted, StepFinished, FinalResult, _current_tool
+)
 
 from .utils.formatting import (
     display_task_header, display_analysis, display_chain_of_thought,
     display_execution_plan, display_error, display_final_result
 )
 
-from .exceptions import ToolNotFoundError, ToolExecutionError
+from .http import HttpClientPool
+from .tools.cache import ToolResultCache
+from .utils.hashing import stable_hash
+from .utils.singleflight import SingleFlight
+from .exceptions import (
+    AgentError, ToolNotFoundError, ToolExecutionError, ToolInputError, PlanningError, StateError,
+    PlanValidationError, BudgetExceededError
+)
+from .execution import StepScheduler
+from .planning.cache import PlanCache
+from .planning.bindings import MISSING, BindingCompiler, PlanBindings
+from .planning.catalog import ToolCatalog
+from .planning.validation import PlanEstimate, PlanReport, PlanValidator, ToolMetrics
+from .tools.retrieval import HashingEmbedding, ToolIndex, ToolRetriever
+from .planning.planners import Planner, LLMPlanner, StaticPlanner, PlannerChain, PipelineStep
+from .speculation import Speculator, FirstStepTable
+
+EXECUTION_MODES = ("plan", "tool_calls")
 
 class Agent(ABC):
     """Base class for all agents in the framework"""
+
+    # Declarative plan for agents that always run the same tools. When set,
+    # it is planned without the LLM, which is only used as a fallback.
+    pipeline: ClassVar[Optional[Sequence[PipelineStep]]] = None
+
+    # Tool calls likely to open most plans, started while the planner runs
+    # when speculative prefetch is enabled. "{task}" maps the raw task.
+    speculative_steps: ClassVar[Optional[Sequence[PipelineStep]]] = None
     
     def __init__(
         self,
@@ -31,21 +66,123 @@ class Agent(ABC):
         tool_selection_hooks: Optional[ToolSelectionHooks] = None,
         metadata: Optional[Dict[str, Any]] = None,
         llm_provider: Optional[LLMProvider] = None,
+        max_concurrent_steps: Optional[int] = None,
+        plan_cache: Optional[PlanCache] = None,
+        planner: Optional[Planner] = None,
+        speculative_prefetch: bool = False,
+        speculator: Optional[Speculator] = None,
+        http_pool: Optional[HttpClientPool] = None,
+        tool_cache: Optional[ToolResultCache] = None,
+        coalesce_tool_calls: bool = False,
+        execution_mode: str = "plan",
+        max_tool_turns: int = 8,
+        stream_plan: bool = False,
+        tool_catalog_max_tokens: Optional[int] = None,
+        tool_shortlist_size: Optional[int] = None,
+        tool_retriever: Optional[ToolRetriever] = None,
+        validate_tool_inputs: bool = True,
+        tool_output_sample_rate: float = 0.0,
+        history_max_entries: Optional[int] = None,
+        history_max_tokens: Optional[int] = None,
+        history_inline_bytes: Optional[int] = None,
+        history_blob_dir: Optional[str] = None,
+        history_summarizer: Optional[Summarizer] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        plan_repair_attempts: int = 1,
+        max_plan_cost: Optional[float] = None,
+        max_plan_latency: Optional[float] = None,
+        tool_metrics: Optional[ToolMetrics] = None,
+        step_retries: int = 0,
+        step_retry_delay: float = 1.0,
+        recover_failed_steps: bool = False,
+        max_replans: int = 1,
         **kwargs
     ):
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(
+                f"Invalid execution_mode {execution_mode!r}. Must be one of: {', '.join(EXECUTION_MODES)}"
+            )
         self.agent_id = agent_id or str(uuid4())
         self.config = AgentConfig(
             verbosity=verbosity,
             tool_selection_hooks=tool_selection_hooks,
-            metadata=metadata or {}
+            metadata=metadata or {},
+            max_concurrent_steps=max_concurrent_steps,
+            speculative_prefetch=speculative_prefetch or speculator is not None,
+            execution_mode=execution_mode,
+            max_tool_turns=max_tool_turns,
+            stream_plan=stream_plan,
+            tool_catalog_max_tokens=tool_catalog_max_tokens,
+            tool_shortlist_size=tool_shortlist_size,
+            validate_tool_inputs=validate_tool_inputs,
+            tool_output_sample_rate=tool_output_sample_rate,
+            history_max_entries=history_max_entries,
+            history_max_tokens=history_max_tokens,
+            history_inline_bytes=history_inline_bytes,
+            history_blob_dir=history_blob_dir,
+            plan_repair_attempts=plan_repair_attempts,
+            max_plan_cost=max_plan_cost,
+            max_plan_latency=max_plan_latency,
+            step_retries=step_retries,
+            step_retry_delay=step_retry_delay,
+            recover_failed_steps=recover_failed_steps,
+            max_replans=max_replans
         )
         self.llm_provider = llm_provider
-        self.tool_registry = ToolRegistry()
-        self.current_task: Optional[TaskExecution] = None
-        self.state: Dict[str, Any] = {}
-        self.message_history: List[Dict[str, Any]] = []
+        self.plan_cache = plan_cache
+        self.tool_cache = tool_cache
+        self.checkpoint_store = checkpoint_store
+        self.tool_flights = SingleFlight() if coalesce_tool_calls else None
+        self.planner = planner or self._create_planner()
+        self.speculator = speculator
+        if self.speculator is None and speculative_prefetch:
+            self.speculator = Speculator(steps=self.speculative_steps, table=FirstStepTable())
+        # A pool passed in is shared with other agents, and closed by its owner
+        self.tool_registry = ToolRegistry(http_pool=http_pool)
+        self.binding_compiler = BindingCompiler(self.tool_registry)
+        self.tool_metrics = tool_metrics or ToolMetrics()
+        self.plan_validator = PlanValidator(self.tool_registry, self.binding_compiler, self.tool_metrics)
+        self.tool_catalog = ToolCatalog(
+            self.tool_registry,
+            max_tokens=tool_catalog_max_tokens,
+            model=llm_provider.config.model if llm_provider else "gpt-4"
+        )
+        self.tool_retriever = tool_retriever
+        if self.tool_retriever is None and tool_shortlist_size:
+            self.tool_retriever = ToolRetriever(
+                ToolIndex(self.tool_registry, embedding=HashingEmbedding()),
+                k=tool_shortlist_size
+            )
+        self.history_summarizer = history_summarizer
+        # Shared by every run's history, and created when a payload first needs it
+        self.blob_store: Optional[BlobStore] = None
         self.logger = logger
-        self._current_plan: Optional[TaskAnalysis] = None
+
+    async def warm_up(self) -> None:
+        """Open HTTP connections to the APIs the agent's tools call"""
+        await self.tool_registry.warm_up()
+
+    async def aclose(self) -> None:
+        """Release resources held by the agent's tool instances, HTTP connections and history blobs
+
+        Caches, checkpoint stores and HTTP pools passed in are shared, so
+        they are left to their owner to close, such as ``AgentFactory.aclose``.
+        """
+        await self.tool_registry.aclose()
+        if self.blob_store:
+            self.blob_store.close()
+            self.blob_store = None
+
+    def _get_blob_store(self) -> BlobStore:
+        if self.blob_store is None:
+            self.blob_store = BlobStore(self.config.history_blob_dir)
+        return self.blob_store
+
+    async def __aenter__(self) -> "Agent":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
 
     def _setup_logger(self, logger: AgentLogger) -> None:
         """Create and set up the logger after tools are registered"""
@@ -61,25 +198,40 @@ class Agent(ABC):
         if self.config.verbosity.value >= level.value:
             print(message)
 
-    def _create_tool_context(self, tool_name: str, inputs: Dict[str, Any]) -> ToolContext:
-        """Create a context object for tool execution"""
-        if not self.current_task:
-            raise ValueError("No active task")
-            
+    def _create_run_context(self, task: str, task_id: Optional[str] = None) -> RunContext:
+        """Create the per-run context holding the task record, plan, history and state"""
+        return RunContext(
+            task=TaskExecution(
+                task_id=task_id or str(uuid4()),
+                agent_id=self.agent_id,
+                input=task,
+                start_time=datetime.now(),
+                steps=[]
+            ),
+            message_history=MessageHistory(
+                max_entries=self.config.history_max_entries,
+                max_tokens=self.config.history_max_tokens,
+                inline_bytes=self.config.history_inline_bytes,
+                blob_store=self._get_blob_store,
+                summarizer=self.history_summarizer,
+                model=self.llm_provider.config.model if self.llm_provider else "gpt-4"
+            )
+        )
+
+    def _create_tool_context(self, tool_name: str, inputs: Dict[str, Any], run: RunContext) -> ToolContext:
+        """Create a context object for tool execution, viewing the run's state without copying it"""
         return ToolContext(
-            task=self.current_task.input,
+            task=run.task.input,
             tool_name=tool_name,
             inputs=inputs,
-            available_tools=self.tool_registry.get_formatted_tools(),
-            previous_tools=[step.tool_name for step in self.current_task.steps],
-            previous_results=[step.result for step in self.current_task.steps if step.result],
-            previous_errors=[step.error for step in self.current_task.steps if step.error],
-            message_history=self.message_history.copy(),
+            available_tools=SequenceView(self.tool_registry.get_formatted_tools()),
+            steps=SequenceView(run.task.steps),
+            message_history=run.message_history.view(),
             agent_id=self.agent_id,
-            task_id=self.current_task.task_id,
-            start_time=self.current_task.start_time,
+            task_id=run.task.task_id,
+            start_time=run.task.start_time,
             metadata=self.config.metadata,
-            plan=self._current_plan  # Pass the current plan in the context
+            plan=run.plan  # Pass the current plan in the context
         )
 
     async def call_tool(
@@ -87,14 +239,23 @@ class Agent(ABC):
         tool_name: str,
         inputs: Dict[str, Any],
         execution_reasoning: str,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        run: RunContext,
+        tool_context: Optional[ToolContext] = None
     ) -> Dict[str, Any]:
-        """Execute a tool and log the call with selection reasoning"""
+        """Execute a tool and log the call with selection reasoning
+
+        ``tool_context`` is the context already created for the step, if any,
+        so its hooks share one.
+        """
         tool = self.tool_registry.get_tool(tool_name)
         if not tool:
             raise ValueError(f"Tool {tool_name} not found")
         
-        tool_context = self._create_tool_context(tool_name, inputs)
+        tool_context = tool_context or self._create_tool_context(tool_name, inputs, run)
+        await run.emit(StepStarted(task_id=run.task_id, tool_name=tool_name, inputs=inputs))
+        # Lets LLM-backed tools stream tokens into the run's events
+        stream_token = _current_tool.set((run.events, run.task_id, tool_name)) if run.events else None
         
         try:
             # Call before_execution hook if available
@@ -102,10 +263,10 @@ class Agent(ABC):
                 await tool.hooks.before_execution(tool_context)
             
             # Execute the tool using registry
-            result = await self._execute_tool(tool_name, inputs)
+            result = await self._execute_tool(tool_name, inputs, run)
             
             # Record the execution
-            self.message_history.append({
+            run.message_history.append({
                 "role": "tool",
                 "tool_name": tool_name,
                 "inputs": inputs,
@@ -113,46 +274,101 @@ class Agent(ABC):
                 "reasoning": execution_reasoning,
                 "timestamp": datetime.now()
             })
+            await run.message_history.summarize()
             
             # Call after_execution hook if available
             if tool.hooks:
                 await tool.hooks.after_execution(tool_context, result)
             
+            await run.emit(StepFinished(task_id=run.task_id, tool_name=tool_name, result=result))
             return result
             
         except Exception as e:
             # Call after_execution hook with error if available
             if tool.hooks:
                 await tool.hooks.after_execution(tool_context, None, error=e)
+            await run.emit(StepFinished(task_id=run.task_id, tool_name=tool_name, error=str(e)))
             raise
+        finally:
+            if stream_token is not None:
+                _current_tool.reset(stream_token)
+
+    async def _execute_tool(self, tool_name: str, inputs: Dict[str, Any], run: RunContext) -> Dict[str, Any]:
+        """Execute a tool with given inputs, adopting a matching speculative call if there is one"""
+        if self.config.validate_tool_inputs:
+            violations = self.tool_registry.validate_inputs(tool_name, inputs)
+            if violations:
+                raise ToolInputError(tool_name, violations)
+
+        prefetched = run.speculation.adopt(tool_name, inputs) if run.speculation else None
+        if prefetched:
+            result = await prefetched
+        else:
+            result = await self._invoke_tool(tool_name, inputs)
+        
+        # Store result in state
+        run.state.set_tool_result(tool_name, result)
+        
+        return result
+
+    async def _invoke_tool(self, tool_name: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a tool implementation without touching any run state
 
-    async def _execute_tool(self, tool_name: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a tool with given inputs"""
+        With ``coalesce_tool_calls`` on, identical calls of idempotent tools
+        (marked ``idempotent`` or with a cache policy) already in flight,
+        from this or any concurrent run, are joined rather than repeated.
+        """
         tool_impl = self.tool_registry.get_implementation(tool_name)
         if not tool_impl:
             raise ToolNotFoundError(f"No implementation found for tool: {tool_name}")
-            
+
+        if self.tool_flights and (tool_impl.idempotent or tool_impl.cache_policy):
+            return await self.tool_flights.do(
+                stable_hash([tool_name, inputs]),
+                lambda: self._call_tool_implementation(tool_name, tool_impl, inputs)
+            )
+        return await self._call_tool_implementation(tool_name, tool_impl, inputs)
+
+    async def _call_tool_implementation(self, tool_name: str, tool_impl: Any, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Call a tool, using a cached result where its cache policy allows"""
+        if self.tool_cache and tool_impl.cache_policy:
+            return await self.tool_cache.get_or_call(
+                tool_name,
+                tool_impl.cache_policy,
+                inputs,
+                lambda: self._run_tool_instance(tool_name, inputs)
+            )
+        return await self._run_tool_instance(tool_name, inputs)
+
+    async def _run_tool_instance(self, tool_name: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a call on an instance borrowed from the tool registry, recording its latency"""
         try:
-            tool_instance = tool_impl()
-            result = await tool_instance.execute(**inputs)
-            
-            # Store result in state
-            self.state.set_tool_result(tool_name, result)
-            
-            return result
+            async with self.tool_registry.acquire(tool_name) as tool_instance:
+                started = time.perf_counter()
+                result = await tool_instance.execute(**inputs)
         except Exception as e:
             raise ToolExecutionError(tool_name, e)
+        # Only real executions count, so cached and coalesced calls don't lower the estimate
+        self.tool_metrics.record(tool_name, time.perf_counter() - started)
+
+        # Spot-check that tools keep to their output schema without paying for it on every call
+        if self.config.tool_output_sample_rate and random.random() < self.config.tool_output_sample_rate:
+            violations = self.tool_registry.validate_output(tool_name, result)
+            if violations:
+                message = f"Tool {tool_name} returned output not matching its schema"
+                details = [str(violation) for violation in violations]
+                if self.logger:
+                    self.logger.warning(message, tool=tool_name, violations=details)
+                self.log(f"{message}: {'; '.join(details)}")
+        return result
+
+    def _planning_tools(self, task: str) -> Optional[List[str]]:
+        """Get the names of the tools to offer the LLM for a task, or None for all of them"""
+        return self.tool_retriever.shortlist(task) if self.tool_retriever else None
 
     def _create_planning_prompt(self, task: str) -> List[LLMMessage]:
         """Create prompt for task planning"""
-        tools_description = "\n".join([
-            f"Tool: {tool.name}\n"
-            f"Description: {tool.description}\n"
-            f"Tags: {', '.join(tool.tags)}\n"
-            f"Input Schema: {tool.input_schema}\n"
-            f"Output Schema: {tool.output_schema}\n"
-            for tool in self.tool_registry.get_all_tools().values()
-        ])
+        tools_description = self.tool_catalog.render(self._planning_tools(task))
 
         system_prompt = (
             "You are an intelligent task planning system. Your role is to analyze tasks and create detailed execution plans.\n\n"
@@ -198,13 +414,37 @@ class Agent(ABC):
             )
         ]
 
-    async def plan_task(self, task: str) -> TaskAnalysis:
-        """Create an execution plan for the task using chain of thought reasoning"""
-        if not self.llm_provider:
-            raise RuntimeError("LLM provider not configured")
+    def _create_planner(self) -> Planner:
+        """Create the default planner: the class pipeline if any, falling back to the LLM"""
+        llm_planner = LLMPlanner(plan_cache=self.plan_cache)
+        if not self.pipeline:
+            return llm_planner
+        return PlannerChain([
+            StaticPlanner(self.pipeline, description=f"{type(self).__name__} pipeline"),
+            llm_planner
+        ])
 
-        messages = self._create_planning_prompt(task)
-        
+    def _plan_template(self, task: str) -> Tuple[str, Dict[str, str]]:
+        """Reduce a task to a plan cache template and the slot values that fill it
+
+        Tasks with the same template share a cached plan. By default the
+        template is the task with case and whitespace normalized and there
+        are no slots. Agents whose plans don't depend on the task wording can
+        return a fixed template with the task as a slot value.
+        """
+        return " ".join(task.lower().split()), {}
+
+    async def plan_task(
+        self,
+        task: str,
+        run: Optional[RunContext] = None,
+        on_step: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> TaskAnalysis:
+        """Create an execution plan for the task using chain of thought reasoning
+
+        With ``on_step``, the plan is created incrementally and each step is
+        passed to ``on_step`` as soon as the planner has produced it.
+        """
         # Log the planning prompt
         if self.logger:
             self.logger.on_agent_start(task)
@@ -213,11 +453,12 @@ class Agent(ABC):
             display_task_header(task)
 
         try:
-            plan: TaskAnalysis = await self.llm_provider.generate_structured(
-                messages,
-                TaskAnalysis,
-                self.llm_provider.config
-            )
+            if on_step:
+                plan = await self.planner.plan_incremental(self, task, on_step, run)
+            else:
+                plan = await self.planner.plan(self, task, run)
+            if plan is None:
+                raise PlanningError(f"No planner could create a plan for task: {task}")
             
             # Log the planning response
             if self.logger:
@@ -235,68 +476,387 @@ class Agent(ABC):
                     "Failed to generate task plan",
                     error=str(e),
                     task=task,
-                    task_id=self.current_task.task_id if self.current_task else None
+                    task_id=run.task_id if run else None
                 )
             if self.config.verbosity == VerbosityLevel.HIGH:
                 display_error(str(e))
             raise
 
-    async def run(self, task: str) -> str:
-        """Execute a task and return the result"""
-        self.current_task = TaskExecution(
-            task_id=str(uuid4()),
-            agent_id=self.agent_id,
-            input=task,
-            start_time=datetime.now(),
-            steps=[]
-        )
+    def validate_plan(self, plan: TaskAnalysis) -> PlanReport:
+        """Check a plan against the agent's tools and estimate its latency and cost without running it"""
+        return self.plan_validator.validate(plan)
+
+    def _budget_problems(self, estimate: PlanEstimate) -> List[str]:
+        return estimate.over_budget(self.config.max_plan_cost, self.config.max_plan_latency)
+
+    async def _validated_plan(self, task: str, plan: TaskAnalysis, run: RunContext) -> Tuple[TaskAnalysis, PlanEstimate]:
+        """Validate a plan before it runs, asking the planner to repair it while attempts remain
+
+        A plan over budget is sent back like an invalid one, so the planner
+        can pick cheaper or faster tools. Raises PlanValidationError or
+        BudgetExceededError if the last plan still fails.
+        """
+        for attempt in range(self.config.plan_repair_attempts + 1):
+            report = self.plan_validator.validate(plan)
+            problems = report.problems or self._budget_problems(report.estimate)
+            if not problems:
+                return plan, report.estimate
+            if attempt == self.config.plan_repair_attempts:
+                break
+            self.log(f"Plan rejected, re-planning: {'; '.join(problems)}")
+            repaired = await self.planner.repair(self, task, plan, problems, run)
+            if repaired is None:
+                break
+            plan = repaired
 
+        if self.logger:
+            self.logger.error("Plan rejected", problems=problems, task=task, task_id=run.task_id)
+        if not report.valid:
+            raise PlanValidationError(report.problems)
+        raise BudgetExceededError(report.estimate, problems)
+
+    async def run(self, task: str, events: Optional[EventStream] = None, task_id: Optional[str] = None) -> str:
+        """Execute a task and return the result, sending progress events to ``events`` if given
+
+        The run is checkpointed under ``task_id``, or a generated ID. To
+        resume a failed run, pass the ID to ``resume``. Framework errors
+        (``AgentError``) carry it as ``task_id``; to resume after any other
+        error, choose the ID up front.
+        """
+        run = self._create_run_context(task, task_id=task_id)
+        run.events = events
+        self._checkpoint(run, {"type": "start", "task": task})
+        return await self._execute_run(run)
+
+    async def resume(self, task_id: str, events: Optional[EventStream] = None) -> str:
+        """Continue a checkpointed task, reusing the results of the steps it already completed
+
+        A task that completed returns its stored result, and one that failed
+        before its plan was ready is planned again. Tasks run in tool_calls
+        mode are checkpointed only when they finish, so unfinished ones
+        start over.
+        """
+        if not self.checkpoint_store:
+            raise StateError("No checkpoint store configured")
+        checkpoint = self.checkpoint_store.load(task_id)
+        if checkpoint is None:
+            raise StateError(f"No checkpoint found for task {task_id}")
+        if checkpoint.completed:
+            return checkpoint.output
+
+        run = self._create_run_context(checkpoint.task, task_id=task_id)
+        run.events = events
+        if checkpoint.plan and self.config.execution_mode != "tool_calls":
+            run.plan = checkpoint.plan
+            for index in sorted(checkpoint.results):
+                tool_name, result = checkpoint.results[index]
+                run.completed_steps[index] = result
+                run.state.set_tool_result(tool_name, result)
+            self.log(f"Resuming task {task_id} with {len(run.completed_steps)} completed steps")
+        return await self._execute_run(run)
+
+    def _checkpoint(self, run: RunContext, record: Dict[str, Any]) -> None:
+        """Record the run's progress, without failing the run if the store can't be written"""
+        if not self.checkpoint_store:
+            return
+        try:
+            self.checkpoint_store.append(run.task_id, record)
+        except Exception as e:
+            if self.logger:
+                self.logger.warning("Failed to write checkpoint", error=str(e), task_id=run.task_id)
+            self.log(f"Failed to write checkpoint for task {run.task_id}: {e}")
+
+    async def _execute_run(self, run: RunContext) -> str:
+        """Execute a new or resumed run and return the result"""
+        task = run.task.input
         if self.logger:
             self.logger.on_agent_start(task)
 
         try:
-            # Create a plan using chain of thought reasoning
-            self._current_plan = await self.plan_task(task)
-            
-            # Execute each step in the plan
-            results = []
-            for step in self._current_plan.execution_plan:
-                result = await self._execute_step(step, task, self._current_plan)
-                results.append((step["tool"], result))
+            # Start likely tool calls so they overlap with planning
+            if self.speculator and run.plan is None:
+                run.speculation = self.speculator.start(self, task)
+
+            if self.config.execution_mode == "tool_calls":
+                results = await self._run_tool_calls(task, run)
+            else:
+                results = await self._run_plan(task, run)
             
             # Format final result
-            result = await self._format_result(task, results)
-            self.current_task.output = result
+            result = await self._format_result(task, results, run)
+            run.task.output = result
+            self._checkpoint(run, {"type": "done", "output": result})
+            await run.emit(FinalResult(task_id=run.task_id, result=result))
             
             # Only call on_agent_done after all tools have completed
             if self.logger:
-                await self.logger.on_agent_done(result, self.message_history)
+                await self.logger.on_agent_done(result, list(run.message_history))
             
             if self.config.verbosity == VerbosityLevel.HIGH:
                 display_final_result(result)
             return result
             
         except Exception as e:
-            self.current_task.error = str(e)
-            self.current_task.status = "failed"
+            run.task.error = str(e)
+            run.task.status = "failed"
+            self._checkpoint(run, {"type": "failed", "error": str(e)})
+            if isinstance(e, AgentError):
+                e.task_id = run.task_id  # So callers can resume the run
             raise
         finally:
-            self.current_task.end_time = datetime.now()
-            if self.current_task.status == "in_progress":
-                self.current_task.status = "completed"
-            self._current_plan = None  # Clear the plan
+            if run.speculation:
+                run.speculation.close()
+            run.message_history.close()
+            run.task.end_time = datetime.now()
+            if run.task.status == "in_progress":
+                run.task.status = "completed"
 
-    async def _execute_step(self, step: Dict[str, Any], task: str, plan: TaskAnalysis) -> Any:
-        """Execute a single step in the plan"""
+    async def run_stream(
+        self,
+        task: str,
+        max_buffered_events: int = 64,
+        task_id: Optional[str] = None
+    ) -> AsyncIterator[AgentEvent]:
+        """Execute a task, yielding events as the plan, steps and final result become available
+
+        At most ``max_buffered_events`` events are buffered; beyond that the
+        run waits for the consumer. Closing the generator early cancels the
+        run. Errors from the run are raised after its events are yielded.
+        """
+        events = EventStream(max_size=max_buffered_events)
+
+        async def produce() -> str:
+            try:
+                return await self.run(task, events=events, task_id=task_id)
+            finally:
+                events.close()
+
+        runner = asyncio.ensure_future(produce())
+        try:
+            while (event := await events.next()) is not None:
+                yield event
+            await runner
+        finally:
+            # Nothing reads the stream anymore, so nothing may wait to write to it
+            events.close()
+            if not runner.done():
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+
+    async def _run_plan(self, task: str, run: RunContext) -> List[Tuple[str, Dict[str, Any]]]:
+        """Plan the task, then execute the plan, running independent steps concurrently
+
+        With ``stream_plan`` on, steps start while the planner is still
+        streaming the rest of the plan, so their events can arrive before
+        the plan is ready. A resumed run keeps its plan and skips the steps
+        it already completed. Every completed step is checkpointed.
+
+        Steps are compiled into input bindings as they are submitted, so a
+        plan whose inputs can't be bound fails before any of its tools run
+        (with ``stream_plan``, before any step after the first unbindable
+        one). The bindings also give the scheduler each step's dependencies.
+
+        New plans are validated and estimated before their steps run, and
+        re-planned or rejected if they fail (see ``_validated_plan``). A
+        streamed plan can only be checked once it is complete, so a failing
+        one cancels the steps already started instead of being repaired.
+
+        By default the first failed step fails the run. With
+        ``recover_failed_steps`` on, the remaining work is re-planned instead
+        (see ``_settle_steps``). Failing optional steps are skipped either way.
+        """
+        run.bindings = PlanBindings(self.binding_compiler)
+
+        def dependencies(step: Dict[str, Any], previous_steps: List[Dict[str, Any]]) -> Set[int]:
+            if len(previous_steps) == len(run.bindings):
+                run.bindings.add(step)  # Compiled as the plan streams in
+            return set(run.bindings[len(previous_steps)].dependencies)
+
+        def on_complete(index: int, step: Dict[str, Any], result: Any) -> None:
+            if result is MISSING:
+                return  # A skipped optional step
+            run.completed_steps[index] = result
+            self._checkpoint(run, {"type": "step", "index": index, "tool": step["tool"], "result": result})
+
+        def create_scheduler() -> StepScheduler:
+            return StepScheduler(
+                self.tool_registry,
+                lambda index, step: self._execute_step(step, run, index),
+                max_concurrency=self.config.max_concurrent_steps,
+                completed=run.completed_steps,
+                on_complete=on_complete,
+                dependencies=dependencies
+            )
+
+        scheduler = create_scheduler()
+        if run.plan is None:
+            if self.config.stream_plan:
+                try:
+                    run.plan = await self.plan_task(task, run, on_step=scheduler.submit)
+                    report = self.plan_validator.validate(run.plan)
+                    if not report.valid:
+                        raise PlanValidationError(report.problems)
+                    if problems := self._budget_problems(report.estimate):
+                        raise BudgetExceededError(report.estimate, problems)
+                    run.estimate = report.estimate
+                except BaseException:
+                    await scheduler.cancel()
+                    raise
+            else:
+                # Create a plan using chain of thought reasoning
+                run.plan, run.estimate = await self._validated_plan(task, await self.plan_task(task, run), run)
+            self._checkpoint(run, {"type": "plan", "plan": run.plan})
+        await run.emit(PlanReady(task_id=run.task_id, plan=run.plan, estimate=run.estimate))
+        
+        if run.speculation:
+            run.speculation.retain({step["tool"] for step in run.plan.execution_plan})
+        if not scheduler.steps:
+            run.bindings = self.binding_compiler.compile(run.plan.execution_plan)
+            for step in run.plan.execution_plan:
+                scheduler.submit(step)
+        if self.config.recover_failed_steps:
+            steps, step_results = await self._settle_steps(task, run, scheduler, create_scheduler)
+        else:
+            steps, step_results = scheduler.steps, await scheduler.gather()
+        return [
+            (step["tool"], result)
+            for step, result in zip(steps, step_results)
+            if result is not MISSING
+        ]
+
+    async def _settle_steps(
+        self,
+        task: str,
+        run: RunContext,
+        scheduler: StepScheduler,
+        create_scheduler: Callable[[], StepScheduler]
+    ) -> Tuple[List[Dict[str, Any]], List[Any]]:
+        """Wait for the plan's steps, re-planning the remaining work when some fail
+
+        Steps that don't depend on a failed step still run to completion.
+        The planner is then given the failures and asked for the steps still
+        needed, which run after the completed ones without repeating them.
+        Gives up with the first failure once ``max_replans`` is used up or
+        the planner can't re-plan. Returns the final plan's steps and results.
+        """
+        replans = 0
+        while True:
+            step_results = await scheduler.settle()
+            if not scheduler.failed:
+                return scheduler.steps, step_results
+
+            error = scheduler.failed[min(scheduler.failed)]
+            if replans >= self.config.max_replans:
+                raise error
+            completed = sorted(run.completed_steps)
+            remaining = await self.planner.replan(self, task, run.plan, completed, dict(scheduler.failed), run)
+            if remaining is None:
+                raise error
+            replans += 1
+
+            steps = [scheduler.steps[index] for index in completed] + remaining.execution_plan
+            plan = run.plan.model_copy(update={"execution_plan": steps})
+            report = self.plan_validator.validate(plan)
+            if not report.valid:
+                raise PlanValidationError(report.problems) from error
+            self.log(
+                f"Re-planned the remaining work after failed steps {sorted(scheduler.failed)}, "
+                f"keeping {len(completed)} completed steps: {[step['tool'] for step in remaining.execution_plan]}"
+            )
+
+            run.plan, run.estimate, run.bindings = plan, report.estimate, report.bindings
+            run.completed_steps = {index: run.completed_steps[previous] for index, previous in enumerate(completed)}
+            self._checkpoint(run, {"type": "replan", "plan": plan, "kept": completed})
+            await run.emit(PlanReady(task_id=run.task_id, plan=plan, estimate=report.estimate))
+
+            scheduler = create_scheduler()
+            for step in steps:
+                scheduler.submit(step)
+
+
+    def _create_tool_calling_prompt(self, task: str) -> List[LLMMessage]:
+        """Create the opening messages for the tool-calling loop"""
+        system_prompt = (
+            "You are an agent that completes tasks by calling the tools available to you.\n\n"
+            "- Call every tool you need. Request tools that don't depend on each other in the same turn, "
+            "so they can run in parallel.\n"
+            "- Use the results of earlier calls as inputs to later ones where needed.\n"
+            "- When you have everything the task needs, reply with a short summary and no tool calls."
+        )
+        return [
+            LLMMessage(role="system", content=system_prompt),
+            LLMMessage(role="user", content=f"Task: {task}")
+        ]
+
+    async def _run_tool_calls(self, task: str, run: RunContext) -> List[Tuple[str, Dict[str, Any]]]:
+        """Execute the task with the LLM's native tool calling instead of a separate plan
+
+        Every tool call the model requests in a turn runs concurrently and
+        the results are sent back, until the model answers without calling
+        tools or the turn budget runs out. The model's final answer is kept
+        in the run state as "final_response".
+        """
+        if not self.llm_provider:
+            raise RuntimeError("LLM provider not configured")
+
+        messages = self._create_tool_calling_prompt(task)
+        tools = self.tool_registry.get_formatted_tools(self._planning_tools(task))
+        results: List[Tuple[str, Dict[str, Any]]] = []
+
+        for _ in range(self.config.max_tool_turns):
+            response = await self.llm_provider.generate_with_tools(messages, tools, self.llm_provider.config)
+            if not response.tool_calls:
+                run.state.set_variable("final_response", response.content)
+                return results
+
+            messages.append(LLMMessage(role="assistant", content=response.content, tool_calls=response.tool_calls))
+            outcomes = await asyncio.gather(*(
+                self._execute_tool_call(call, run) for call in response.tool_calls
+            ))
+            for call, (result, error) in zip(response.tool_calls, outcomes):
+                if error is None:
+                    results.append((call.name, result))
+                messages.append(LLMMessage(
+                    role="tool",
+                    tool_call_id=call.id,
+                    content=json.dumps(result if error is None else {"error": str(error)}, default=str)
+                ))
+
+        self.log(f"Tool-calling loop stopped after {self.config.max_tool_turns} turns")
+        return results
+
+    async def _execute_tool_call(
+        self,
+        call: LLMToolCall,
+        run: RunContext
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
+        """Execute a tool call requested by the model, returning the error instead of raising it
+
+        Errors are reported back to the model, which can retry with
+        different inputs or carry on without the tool.
+        """
+        try:
+            result = await self.call_tool(
+                tool_name=call.name,
+                inputs=call.arguments,
+                execution_reasoning="Requested by the model",
+                context={"task": run.task.input},
+                run=run
+            )
+            return result, None
+        except Exception as e:
+            return None, e
+
+    async def _execute_step(self, step: Dict[str, Any], run: RunContext, index: int) -> Any:
+        """Execute the step at ``index`` in the plan, returning MISSING if it is optional and failed"""
         tool_name = step["tool"]
-        if not self.tool_registry.get_tool(tool_name):
-            raise ToolNotFoundError(f"Tool {tool_name} not found")
+        task = run.task.input
         
-        # Map inputs for the tool
-        inputs = await self._map_inputs_to_tool(tool_name, task, step.get("input_mapping", {}))
+        # Resolve the step's compiled input bindings
+        inputs = run.bindings[index].resolve(run.completed_steps, task, run.state)
         
-        # Create tool context once for both calls
-        tool_context = self._create_tool_context(tool_name, inputs)
+        # Create tool context once, shared by the selection and execution hooks
+        tool_context = self._create_tool_context(tool_name, inputs, run)
         
         # Log tool selection first
         if self.logger and (hooks := self.logger.get_tool_selection_hooks()):
@@ -308,69 +868,44 @@ class Agent(ABC):
             )
         
         # Then execute the tool
-        result = await self.call_tool(
-            tool_name=tool_name,
-            inputs=inputs,
-            execution_reasoning=step["reasoning"],
-            context={"task": task, "plan": plan}
-        )
-        
-        return result
+        try:
+            return await self._call_step_tool(step, inputs, run, index, tool_context)
+        except Exception as e:
+            if not step.get("optional"):
+                raise
+            self.log(f"Skipping optional step {index} ({tool_name}): {e}")
+            return MISSING
+
+    async def _call_step_tool(
+        self,
+        step: Dict[str, Any],
+        inputs: Dict[str, Any],
+        run: RunContext,
+        index: int,
+        tool_context: ToolContext
+    ) -> Any:
+        """Call a step's tool, retrying failed executions after a jittered, exponentially growing delay
+
+        Only execution errors are retried; invalid inputs would fail again.
+        """
+        for attempt in range(self.config.step_retries + 1):
+            try:
+                return await self.call_tool(
+                    tool_name=step["tool"],
+                    inputs=inputs,
+                    execution_reasoning=step["reasoning"],
+                    context={"task": run.task.input, "plan": run.plan},
+                    run=run,
+                    tool_context=tool_context
+                )
+            except ToolExecutionError as e:
+                if attempt == self.config.step_retries:
+                    raise
+                delay = random.uniform(0, self.config.step_retry_delay * 2 ** attempt)
+                self.log(f"Step {index} ({step['tool']}) failed, retrying in {delay:.2f}s: {e}")
+                await asyncio.sleep(delay)
 
     @abstractmethod
-    async def _format_result(self, task: str, results: List[tuple[str, Dict[str, Any]]]) -> str:
+    async def _format_result(self, task: str, results: List[tuple[str, Dict[str, Any]]], run: RunContext) -> str:
         """Format the final result from tool executions"""
-        pass
-
-    async def _map_inputs_to_tool(self, tool_name: str, task: str, input_mapping: Dict[str, str]) -> Dict[str, Any]:
-        """Map inputs based on tool schema"""
-        tool = self.tool_registry.get_tool(tool_name)
-        if not tool:
-            raise ToolNotFoundError(f"Tool {tool_name} not found")
-        
-        # Get the tool's input schema
-        required_inputs = tool.input_schema.get("properties", {})
-        
-        # If there's an explicit mapping from the LLM, use it
-        if input_mapping:
-            mapped_inputs = {}
-            for input_name, value_ref in input_mapping.items():
-                # Handle dot notation references (e.g., "event_finder.events")
-                if "." in value_ref:
-                    tool_name, field = value_ref.split(".")
-                    tool_result = self.state.get_tool_result(tool_name)
-                    if tool_result and isinstance(tool_result, dict):
-                        mapped_inputs[input_name] = tool_result.get(field)
-                else:
-                    # Try to get the entire tool result
-                    tool_result = self.state.get_tool_result(value_ref)
-                    if tool_result is not None:
-                        mapped_inputs[input_name] = tool_result
-                    else:
-                        # Fall back to using the value as is
-                        mapped_inputs[input_name] = value_ref
-            return mapped_inputs
-
-        # Try to map inputs based on schema and state
-        mapped_inputs = {}
-        for input_name, input_schema in required_inputs.items():
-            # Check for referenced tool outputs in schema
-            if "$ref" in input_schema:
-                ref_tool = input_schema.get("$ref").split("/")[-1]  # Get referenced type name
-                # Look for any tool result that matches this type
-                for tool_name, result in self.state.tool_results.items():
-                    if result and isinstance(result, dict):  # Basic type check
-                        mapped_inputs[input_name] = result
-                        break
-            # Otherwise try direct mapping
-            elif self.state.has_tool_result(input_name):
-                mapped_inputs[input_name] = self.state.get_tool_result(input_name)
-            elif self.state.has_variable(input_name):
-                mapped_inputs[input_name] = self.state.get_variable(input_name)
-            elif input_schema.get("type") == "string":
-                mapped_inputs[input_name] = task
-        
-        if mapped_inputs:
-            return mapped_inputs
-            
-        raise ValueError(f"Could not map inputs for tool {tool_name}")
\ No newline at end of file
+        pass
\ No newline at end of file
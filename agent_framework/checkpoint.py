@@ -0,0 +1,248 @@
+"""Checkpoints of agent runs, so interrupted runs can resume without redoing completed steps"""
+import json
+import os
+import sqlite3
+import struct
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from pydantic import BaseModel
+from .models import TaskAnalysis
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """Serialize a checkpoint record as compressed, compact JSON"""
+    return zlib.compress(json.dumps(record, separators=(",", ":"), default=_to_json).encode())
+
+def decode_record(data: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(data))
+
+class CheckpointStore(ABC):
+    """Append-only log of checkpoint records per task
+
+    A run writes a record when it starts, when its plan is ready, after
+    each completed step and when it finishes; ``Checkpoint.from_records``
+    turns them back into the run's progress.
+    """
+
+    @abstractmethod
+    def append(self, task_id: str, record: Dict[str, Any]) -> None:
+        """Add a record to a task's log"""
+        pass
+
+    @abstractmethod
+    def records(self, task_id: str) -> List[Dict[str, Any]]:
+        """Get a task's records in the order they were written"""
+        pass
+
+    @abstractmethod
+    def delete(self, task_id: str) -> None:
+        """Forget a task's records"""
+        pass
+
+    def load(self, task_id: str) -> Optional["Checkpoint"]:
+        """Get a task's checkpoint, or None if nothing was recorded for it"""
+        records = self.records(task_id)
+        return Checkpoint.from_records(task_id, records) if records else None
+
+    def close(self) -> None:
+        """Release any files or connections held by the store"""
+        pass
+
+class MemoryCheckpointStore(CheckpointStore):
+    """Checkpoints held in memory, surviving failed runs but not the process"""
+
+    def __init__(self):
+        # Encoded, so later changes to a result don't alter its checkpoint
+        self._records: Dict[str, List[bytes]] = defaultdict(list)
+
+    def append(self, task_id: str, record: Dict[str, Any]) -> None:
+        self._records[task_id].append(encode_record(record))
+
+    def records(self, task_id: str) -> List[Dict[str, Any]]:
+        return [decode_record(data) for data in self._records.get(task_id, [])]
+
+    def delete(self, task_id: str) -> None:
+        self._records.pop(task_id, None)
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Checkpoints persisted to a SQLite database"""
+
+    def __init__(self, path: Union[str, Path], table: str = "checkpoints"):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid checkpoint table name: {table}")
+        self.path = str(path)
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, task_id TEXT NOT NULL, record BLOB NOT NULL)"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_task_id ON {self.table} (task_id)")
+
+    def append(self, task_id: str, record: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO {self.table} (task_id, record) VALUES (?, ?)", (task_id, encode_record(record))
+            )
+
+    def records(self, task_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT record FROM {self.table} WHERE task_id = ? ORDER BY seq", (task_id,)
+            ).fetchall()
+        return [decode_record(row[0]) for row in rows]
+
+    def delete(self, task_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE task_id = ?", (task_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class FileCheckpointStore(CheckpointStore):
+    """Checkpoints appended to a single log file
+
+    Each entry is a length-prefixed, compressed record, and a partial entry
+    left at the end by a crash is ignored. Record offsets per task are kept
+    in memory, built by scanning the file once when it is opened. With
+    ``fsync`` on, every record is flushed to disk before the run carries on.
+    Deleting a task appends a tombstone rather than rewriting the file.
+    """
+
+    _HEADER = struct.Struct(">I")
+
+    def __init__(self, path: Union[str, Path], fsync: bool = True):
+        self.path = str(path)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._offsets: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._file = open(self.path, "a+b")
+        self._scan()
+
+    def _scan(self) -> None:
+        self._file.seek(0)
+        offset = 0
+        while True:
+            header = self._file.read(self._HEADER.size)
+            if len(header) < self._HEADER.size:
+                break
+            (size,) = self._HEADER.unpack(header)
+            data = self._file.read(size)
+            if len(data) < size:
+                break
+            entry = decode_record(data)
+            self._index(entry["task_id"], entry, offset + self._HEADER.size, size)
+            offset += self._HEADER.size + size
+        # Drop a partial entry from a crash, so new entries stay readable
+        self._file.truncate(offset)
+
+    def _index(self, task_id: str, entry: Dict[str, Any], offset: int, size: int) -> None:
+        if entry.get("deleted"):
+            self._offsets.pop(task_id, None)
+        else:
+            self._offsets[task_id].append((offset, size))
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        data = encode_record(entry)
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell() + self._HEADER.size
+            self._file.write(self._HEADER.pack(len(data)) + data)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._index(entry["task_id"], entry, offset, len(data))
+
+    def append(self, task_id: str, record: Dict[str, Any]) -> None:
+        self._write({"task_id": task_id, "record": record})
+
+    def records(self, task_id: str) -> List[Dict[str, Any]]:
+        records = []
+        with self._lock:
+            for offset, size in self._offsets.get(task_id, []):
+                self._file.seek(offset)
+                records.append(decode_record(self._file.read(size))["record"])
+        return records
+
+    def delete(self, task_id: str) -> None:
+        self._write({"task_id": task_id, "deleted": True})
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+@dataclass
+class Checkpoint:
+    """A run's progress, rebuilt from its checkpoint records
+
+    Step results are as JSON stores them, so a tool that returned a
+    Pydantic model or datetimes gets dicts and strings back on resume.
+    With stream_plan on, steps can be recorded before the plan; without a
+    plan record their results are unusable, since replanning may order the
+    steps differently. A replan record replaces the plan after a step
+    failed, renumbering the kept results to match it.
+    """
+    task_id: str = field(metadata={"description": "ID of the checkpointed task"})
+    task: str = field(metadata={"description": "Input the task was run with"})
+    plan: Optional[TaskAnalysis] = field(
+        default=None,
+        metadata={"description": "The run's plan, once planning completed"}
+    )
+    results: Dict[int, Tuple[str, Any]] = field(
+        default_factory=dict,
+        metadata={"description": "Tool name and result of each completed step, by plan index"}
+    )
+    output: Optional[str] = field(
+        default=None,
+        metadata={"description": "Final result, if the run completed"}
+    )
+    error: Optional[str] = field(
+        default=None,
+        metadata={"description": "Error the last attempt failed with, if any"}
+    )
+
+    @property
+    def completed(self) -> bool:
+        return self.output is not None
+
+    @classmethod
+    def from_records(cls, task_id: str, records: List[Dict[str, Any]]) -> "Checkpoint":
+        checkpoint = cls(task_id=task_id, task="")
+        for record in records:
+            kind = record.get("type")
+            if kind == "start":
+                checkpoint.task = record["task"]
+            elif kind == "plan":
+                checkpoint.plan = TaskAnalysis(**record["plan"])
+            elif kind == "replan":
+                checkpoint.plan = TaskAnalysis(**record["plan"])
+                checkpoint.results = {
+                    index: checkpoint.results[previous]
+                    for index, previous in enumerate(record["kept"])
+                    if previous in checkpoint.results
+                }
+            elif kind == "step":
+                checkpoint.results[record["index"]] = (record["tool"], record["result"])
+            elif kind == "done":
+                checkpoint.output = record["output"]
+                checkpoint.error = None
+            elif kind == "failed":
+                checkpoint.error = record["error"]
+        return checkpoint
@@ -19,6 +19,45 @@ class AgentConfiguration:
     metadata: Dict[str, Any] = field(default_factory=dict)
     enable_logging: bool = field(default=True)
     enable_tool_selection: bool = field(default=True)
+    max_concurrent_steps: Optional[int] = field(default=None)
+    enable_plan_cache: bool = field(default=False)
+    plan_cache_path: Optional[str] = field(default=None)
+    plan_cache_ttl: Optional[float] = field(default=3600)
+    speculative_prefetch: bool = field(default=False)
+    http_timeout: float = field(default=30.0)
+    http_limit_per_host: int = field(default=10)
+    enable_tool_cache: bool = field(default=True)
+    tool_cache_path: Optional[str] = field(default=None)
+    checkpoint_backend: Optional[str] = field(default=None)
+    checkpoint_path: Optional[str] = field(default=None)
+    coalesce_calls: bool = field(default=False)
+    enable_llm_cache: bool = field(default=False)
+    llm_cache_path: Optional[str] = field(default=None)
+    llm_cache_max_temperature: float = field(default=0.3)
+    llm_requests_per_minute: Optional[float] = field(default=None)
+    llm_tokens_per_minute: Optional[float] = field(default=None)
+    llm_max_concurrency: Optional[int] = field(default=None)
+    llm_max_retries: int = field(default=2)
+    llm_hedge_requests: bool = field(default=False)
+    llm_deadline: Optional[float] = field(default=None)
+    execution_mode: str = field(default="plan")
+    max_tool_turns: int = field(default=8)
+    stream_plan: bool = field(default=False)
+    tool_catalog_max_tokens: Optional[int] = field(default=None)
+    tool_shortlist_size: Optional[int] = field(default=None)
+    validate_tool_inputs: bool = field(default=True)
+    tool_output_sample_rate: float = field(default=0.0)
+    history_max_entries: Optional[int] = field(default=None)
+    history_max_tokens: Optional[int] = field(default=None)
+    history_inline_bytes: Optional[int] = field(default=None)
+    history_blob_dir: Optional[str] = field(default=None)
+    plan_repair_attempts: int = field(default=1)
+    max_plan_cost: Optional[float] = field(default=None)
+    max_plan_latency: Optional[float] = field(default=None)
+    step_retries: int = field(default=0)
+    step_retry_delay: float = field(default=1.0)
+    recover_failed_steps: bool = field(default=False)
+    max_replans: int = field(default=1)
 
     @staticmethod
     def get_env(key: str, default: Optional[str] = None) -> Optional[str]:
@@ -65,7 +104,46 @@ class AgentConfiguration:
                 "env": os.getenv("ENVIRONMENT", "development")
             },
             enable_logging=os.getenv("ENABLE_LOGGING", "true").lower() == "true",
-            enable_tool_selection=os.getenv("ENABLE_TOOL_SELECTION", "true").lower() == "true"
+            enable_tool_selection=os.getenv("ENABLE_TOOL_SELECTION", "true").lower() == "true",
+            max_concurrent_steps=int(os.getenv("MAX_CONCURRENT_STEPS")) if os.getenv("MAX_CONCURRENT_STEPS") else None,
+            enable_plan_cache=os.getenv("ENABLE_PLAN_CACHE", "false").lower() == "true",
+            plan_cache_path=os.getenv("PLAN_CACHE_PATH"),
+            plan_cache_ttl=float(os.getenv("PLAN_CACHE_TTL", "3600")),
+            speculative_prefetch=os.getenv("ENABLE_SPECULATIVE_PREFETCH", "false").lower() == "true",
+            http_timeout=float(os.getenv("HTTP_TIMEOUT", "30")),
+            http_limit_per_host=int(os.getenv("HTTP_LIMIT_PER_HOST", "10")),
+            enable_tool_cache=os.getenv("ENABLE_TOOL_CACHE", "true").lower() == "true",
+            tool_cache_path=os.getenv("TOOL_CACHE_PATH"),
+            checkpoint_backend=os.getenv("CHECKPOINT_BACKEND"),
+            checkpoint_path=os.getenv("CHECKPOINT_PATH"),
+            coalesce_calls=os.getenv("COALESCE_CALLS", "false").lower() == "true",
+            enable_llm_cache=os.getenv("ENABLE_LLM_CACHE", "false").lower() == "true",
+            llm_cache_path=os.getenv("LLM_CACHE_PATH"),
+            llm_cache_max_temperature=float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.3")),
+            llm_requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE")) if os.getenv("LLM_REQUESTS_PER_MINUTE") else None,
+            llm_tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE")) if os.getenv("LLM_TOKENS_PER_MINUTE") else None,
+            llm_max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY")) if os.getenv("LLM_MAX_CONCURRENCY") else None,
+            llm_max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+            llm_hedge_requests=os.getenv("LLM_HEDGE_REQUESTS", "false").lower() == "true",
+            llm_deadline=float(os.getenv("LLM_DEADLINE")) if os.getenv("LLM_DEADLINE") else None,
+            execution_mode=os.getenv("EXECUTION_MODE", "plan"),
+            max_tool_turns=int(os.getenv("MAX_TOOL_TURNS", "8")),
+            stream_plan=os.getenv("STREAM_PLAN", "false").lower() == "true",
+            tool_catalog_max_tokens=int(os.getenv("TOOL_CATALOG_MAX_TOKENS")) if os.getenv("TOOL_CATALOG_MAX_TOKENS") else None,
+            tool_shortlist_size=int(os.getenv("TOOL_SHORTLIST_SIZE")) if os.getenv("TOOL_SHORTLIST_SIZE") else None,
+            validate_tool_inputs=os.getenv("VALIDATE_TOOL_INPUTS", "true").lower() == "true",
+            tool_output_sample_rate=float(os.getenv("TOOL_OUTPUT_SAMPLE_RATE", "0")),
+            history_max_entries=int(os.getenv("HISTORY_MAX_ENTRIES")) if os.getenv("HISTORY_MAX_ENTRIES") else None,
+            history_max_tokens=int(os.getenv("HISTORY_MAX_TOKENS")) if os.getenv("HISTORY_MAX_TOKENS") else None,
+            history_inline_bytes=int(os.getenv("HISTORY_INLINE_BYTES")) if os.getenv("HISTORY_INLINE_BYTES") else None,
+            history_blob_dir=os.getenv("HISTORY_BLOB_DIR"),
+            plan_repair_attempts=int(os.getenv("PLAN_REPAIR_ATTEMPTS", "1")),
+            max_plan_cost=float(os.getenv("MAX_PLAN_COST")) if os.getenv("MAX_PLAN_COST") else None,
+            max_plan_latency=float(os.getenv("MAX_PLAN_LATENCY")) if os.getenv("MAX_PLAN_LATENCY") else None,
+            step_retries=int(os.getenv("STEP_RETRIES", "0")),
+            step_retry_delay=float(os.getenv("STEP_RETRY_DELAY", "1")),
+            recover_failed_steps=os.getenv("RECOVER_FAILED_STEPS", "false").lower() == "true",
+            max_replans=int(os.getenv("MAX_REPLANS", "1"))
         )
     
     def with_overrides(self, **overrides) -> "AgentConfiguration":
@@ -92,5 +170,44 @@ class AgentConfiguration:
             verbosity=VerbosityLevel(config_dict.get("verbosity", "low")),
             metadata=config_dict.get("metadata", {}),
             enable_logging=config_dict.get("enable_logging", True),
-            enable_tool_selection=config_dict.get("enable_tool_selection", True)
+            enable_tool_selection=config_dict.get("enable_tool_selection", True),
+            max_concurrent_steps=config_dict.get("max_concurrent_steps"),
+            enable_plan_cache=config_dict.get("enable_plan_cache", False),
+            plan_cache_path=config_dict.get("plan_cache_path"),
+            plan_cache_ttl=config_dict.get("plan_cache_ttl", 3600),
+            speculative_prefetch=config_dict.get("speculative_prefetch", False),
+            http_timeout=config_dict.get("http_timeout", 30.0),
+            http_limit_per_host=config_dict.get("http_limit_per_host", 10),
+            enable_tool_cache=config_dict.get("enable_tool_cache", True),
+            tool_cache_path=config_dict.get("tool_cache_path"),
+            checkpoint_backend=config_dict.get("checkpoint_backend"),
+            checkpoint_path=config_dict.get("checkpoint_path"),
+            coalesce_calls=config_dict.get("coalesce_calls", False),
+            enable_llm_cache=config_dict.get("enable_llm_cache", False),
+            llm_cache_path=config_dict.get("llm_cache_path"),
+            llm_cache_max_temperature=config_dict.get("llm_cache_max_temperature", 0.3),
+            llm_requests_per_minute=config_dict.get("llm_requests_per_minute"),
+            llm_tokens_per_minute=config_dict.get("llm_tokens_per_minute"),
+            llm_max_concurrency=config_dict.get("llm_max_concurrency"),
+            llm_max_retries=config_dict.get("llm_max_retries", 2),
+            llm_hedge_requests=config_dict.get("llm_hedge_requests", False),
+            llm_deadline=config_dict.get("llm_deadline"),
+            execution_mode=config_dict.get("execution_mode", "plan"),
+            max_tool_turns=config_dict.get("max_tool_turns", 8),
+            stream_plan=config_dict.get("stream_plan", False),
+            tool_catalog_max_tokens=config_dict.get("tool_catalog_max_tokens"),
+            tool_shortlist_size=config_dict.get("tool_shortlist_size"),
+            validate_tool_inputs=config_dict.get("validate_tool_inputs", True),
+            tool_output_sample_rate=config_dict.get("tool_output_sample_rate", 0.0),
+            history_max_entries=config_dict.get("history_max_entries"),
+            history_max_tokens=config_dict.get("history_max_tokens"),
+            history_inline_bytes=config_dict.get("history_inline_bytes"),
+            history_blob_dir=config_dict.get("history_blob_dir"),
+            plan_repair_attempts=config_dict.get("plan_repair_attempts", 1),
+            max_plan_cost=config_dict.get("max_plan_cost"),
+            max_plan_latency=config_dict.get("max_plan_latency"),
+            step_retries=config_dict.get("step_retries", 0),
+            step_retry_delay=config_dict.get("step_retry_delay", 1.0),
+            recover_failed_steps=config_dict.get("recover_failed_steps", False),
+            max_replans=config_dict.get("max_replans", 1)
         ) 
\ No newline at end of file
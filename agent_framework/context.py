@@ -0,0 +1,68 @@
+from typing import Any, Dict, Optional, TYPE_CHECKING
+from dataclasses import dataclass, field
+from .models import TaskExecution, TaskAnalysis
+from .state import AgentState
+from .history import MessageHistory
+
+if TYPE_CHECKING:
+    from .events import AgentEvent, EventStream
+    from .speculation import SpeculationBatch
+    from .planning.bindings import PlanBindings
+    from .planning.validation import PlanEstimate
+
+@dataclass
+class RunContext:
+    """Per-run execution state, created by ``Agent.run`` for every task
+
+    Keeping the task record, plan, message history and tool results here
+    instead of on the agent lets a single agent instance serve many
+    overlapping runs on one event loop.
+    """
+    task: TaskExecution = field(metadata={"description": "Record of the task being executed"})
+    state: AgentState = field(
+        default_factory=AgentState,
+        metadata={"description": "Variables and tool results for this run"}
+    )
+    message_history: MessageHistory = field(
+        default_factory=MessageHistory,
+        metadata={"description": "Tool executions recorded during this run"}
+    )
+    plan: Optional[TaskAnalysis] = field(
+        default=None,
+        metadata={"description": "Execution plan for this run, once planning has completed"}
+    )
+    speculation: Optional["SpeculationBatch"] = field(
+        default=None,
+        metadata={"description": "Tool calls started speculatively while planning"}
+    )
+    completed_steps: Dict[int, Any] = field(
+        default_factory=dict,
+        metadata={"description": "Results of completed plan steps by plan index, including an earlier attempt's"}
+    )
+    bindings: Optional["PlanBindings"] = field(
+        default=None,
+        metadata={"description": "Compiled input bindings of the plan's steps"}
+    )
+    estimate: Optional["PlanEstimate"] = field(
+        default=None,
+        metadata={"description": "Expected latency and cost of the plan, checked against the budgets before it ran"}
+    )
+    events: Optional["EventStream"] = field(
+        default=None,
+        metadata={"description": "Stream receiving progress events when the run is streamed"}
+    )
+
+    @property
+    def task_id(self) -> str:
+        """ID of the task being executed"""
+        return self.task.task_id
+
+    @property
+    def input(self) -> str:
+        """Original input given to the agent"""
+        return self.task.input
+
+    async def emit(self, event: "AgentEvent") -> None:
+        """Send an event to the run's stream, if it is being streamed"""
+        if self.events is not None:
+            await self.events.emit(event)
@@ -0,0 +1,113 @@
+"""Typed events streamed by ``Agent.run_stream``"""
+import asyncio
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, ClassVar, Dict, Optional, Tuple, TYPE_CHECKING
+from .models import TaskAnalysis
+
+if TYPE_CHECKING:
+    from .planning.validation import PlanEstimate
+
+@dataclass
+class AgentEvent:
+    """Base class for events emitted while a task runs"""
+    type: ClassVar[str] = "event"
+    task_id: str
+
+@dataclass
+class PlanReady(AgentEvent):
+    """The execution plan has been created, with its estimate once it has been validated"""
+    type: ClassVar[str] = "plan_ready"
+    plan: TaskAnalysis
+    estimate: Optional["PlanEstimate"] = None
+
+@dataclass
+class StepStarted(AgentEvent):
+    """A tool call is about to run"""
+    type: ClassVar[str] = "step_started"
+    tool_name: str
+    inputs: Dict[str, Any]
+
+@dataclass
+class StepFinished(AgentEvent):
+    """A tool call has finished, with its result or error"""
+    type: ClassVar[str] = "step_finished"
+    tool_name: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+@dataclass
+class TokenDelta(AgentEvent):
+    """A chunk of text generated by an LLM-backed tool"""
+    type: ClassVar[str] = "token_delta"
+    tool_name: str
+    text: str
+
+@dataclass
+class FinalResult(AgentEvent):
+    """The formatted result of the task"""
+    type: ClassVar[str] = "final_result"
+    result: str
+
+class EventStream:
+    """Bounded queue of events for one run
+
+    Emitting waits while the queue is full, so a slow consumer slows the
+    run down instead of letting events pile up in memory. Once the stream
+    is closed, events are dropped and emitters waiting for room return, so
+    calls outliving the run, such as a shared in-flight tool call still
+    streaming tokens, never block on a consumer that has gone.
+    """
+
+    _CLOSED = object()
+
+    def __init__(self, max_size: int = 64):
+        self._queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max_size)
+        self._closed = False
+        self._closed_event = asyncio.Event()
+
+    async def emit(self, event: AgentEvent) -> None:
+        """Queue an event, waiting for room if the consumer is behind; dropped once the stream is closed"""
+        if self._closed:
+            return
+        if not self._queue.full():
+            self._queue.put_nowait(event)
+            return
+        put = asyncio.ensure_future(self._queue.put(event))
+        closed = asyncio.ensure_future(self._closed_event.wait())
+        try:
+            await asyncio.wait({put, closed}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            put.cancel()
+            closed.cancel()
+
+    def close(self) -> None:
+        """Mark the end of the stream, without waiting for the consumer"""
+        self._closed = True
+        self._closed_event.set()
+        try:
+            self._queue.put_nowait(self._CLOSED)
+        except asyncio.QueueFull:
+            # The consumer sees the stream is closed once it drains the queue
+            pass
+
+    async def next(self) -> Optional[AgentEvent]:
+        """Get the next event, or None once the stream is closed and drained"""
+        if self._closed and self._queue.empty():
+            return None
+        event = await self._queue.get()
+        return None if event is self._CLOSED else event
+
+# Stream, task ID and tool name of the tool call running in the current task
+_current_tool: ContextVar[Optional[Tuple[EventStream, str, str]]] = ContextVar("current_tool_stream", default=None)
+
+def is_streaming() -> bool:
+    """Check whether the current tool call is part of a streamed run"""
+    return _current_tool.get() is not None
+
+async def emit_token(text: str) -> None:
+    """Stream a chunk of generated text from inside a tool; a no-op outside streamed runs"""
+    current = _current_tool.get()
+    if current is not None and text:
+        stream, task_id, tool_name = current
+        await stream.emit(TokenDelta(task_id=task_id, tool_name=tool_name, text=text))
@@ -1,6 +1,9 @@
+from typing import Any, List, Optional
+
 class AgentError(Exception):
     """Base class for agent framework exceptions"""
-    pass
+    # ID of the run that raised the error, so callers can resume it
+    task_id: Optional[str] = None
 
 class ToolError(AgentError):
     """Base class for tool-related errors"""
@@ -17,6 +20,14 @@ class ToolExecutionError(ToolError):
         self.original_error = original_error
         super().__init__(f"Tool {tool_name} execution failed: {str(original_error)}")
 
+class ToolInputError(ToolError):
+    """Raised before a tool runs when its inputs don't match the tool's input schema"""
+    def __init__(self, tool_name: str, violations: List[Any]):
+        self.tool_name = tool_name
+        self.violations = violations
+        details = "; ".join(str(violation) for violation in violations)
+        super().__init__(f"Invalid inputs for tool {tool_name}: {details}")
+
 class ConfigurationError(AgentError):
     """Raised when there's a configuration problem"""
     pass
@@ -25,6 +36,26 @@ class PlanningError(AgentError):
     """Raised when task planning fails"""
     pass
 
+class BindingError(PlanningError):
+    """Raised before a plan runs when a step's inputs can't be bound"""
+    def __init__(self, step_index: int, tool_name: str, message: str):
+        self.step_index = step_index
+        self.tool_name = tool_name
+        super().__init__(f"Step {step_index} ({tool_name}): {message}")
+
+class PlanValidationError(PlanningError):
+    """Raised before a plan runs when it fails validation and couldn't be repaired"""
+    def __init__(self, problems: List[str]):
+        self.problems = problems
+        super().__init__(f"Invalid plan: {'; '.join(problems)}")
+
+class BudgetExceededError(PlanningError):
+    """Raised before a plan runs when its estimated cost or latency is over budget"""
+    def __init__(self, estimate: Any, problems: List[str]):
+        self.estimate = estimate
+        self.problems = problems
+        super().__init__(f"Plan over budget: {'; '.join(problems)}")
+
 class StateError(AgentError):
     """Raised when there's a state-related error"""
     pass 
\ No newline at end of file
@@ -0,0 +1,166 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from .utils.tool_registry import ToolRegistry
+
+def _schema_refs(property_schema: Dict[str, Any]) -> List[str]:
+    """Get the names of the types a schema property references via $ref"""
+    candidates = [property_schema]
+    for key in ("allOf", "anyOf", "oneOf"):
+        candidates.extend(property_schema.get(key, []))
+    return [
+        candidate["$ref"].split("/")[-1]
+        for candidate in candidates
+        if isinstance(candidate, dict) and "$ref" in candidate
+    ]
+
+def step_dependencies(
+    step: Dict[str, Any],
+    previous_steps: List[Dict[str, Any]],
+    tool_registry: ToolRegistry
+) -> Set[int]:
+    """Get the indices of earlier plan steps whose results a step consumes
+
+    Dependencies are taken from explicit ``input_mapping`` references
+    (e.g. "event_finder.events" or "weather_retriever"). Steps without a
+    mapping are matched through their tool's input schema: a property named
+    after an earlier tool, or a $ref to an earlier tool's output type. A $ref
+    that can't be matched depends on every earlier step, since the schema
+    based mapping may pick up any earlier result. Repeated uses of the same
+    tool always run in plan order.
+    """
+    latest: Dict[str, int] = {}
+    for index, previous in enumerate(previous_steps):
+        latest[previous["tool"]] = index
+
+    dependencies: Set[int] = set()
+    if step["tool"] in latest:
+        dependencies.add(latest[step["tool"]])
+
+    input_mapping = step.get("input_mapping") or {}
+    if input_mapping:
+        for value_ref in input_mapping.values():
+            if isinstance(value_ref, str) and value_ref.split(".")[0] in latest:
+                dependencies.add(latest[value_ref.split(".")[0]])
+        return dependencies
+
+    tool = tool_registry.get_tool(step["tool"])
+    if not tool:
+        return dependencies
+
+    for input_name, input_schema in tool.input_schema.get("properties", {}).items():
+        if input_name in latest:
+            dependencies.add(latest[input_name])
+            continue
+        for ref_name in _schema_refs(input_schema):
+            producers = [
+                index for index, previous in enumerate(previous_steps)
+                if (producer := tool_registry.get_tool(previous["tool"]))
+                and producer.output_schema.get("title") == ref_name
+            ]
+            dependencies.update(producers or range(len(previous_steps)))
+
+    return dependencies
+
+class StepScheduler:
+    """Runs plan steps concurrently as soon as the steps they depend on complete
+
+    Steps are submitted in plan order and the dependency graph is built
+    incrementally, so a step can only ever depend on steps submitted before
+    it. Results are returned in submission order regardless of completion
+    order.
+
+    Steps are executed with their plan index. Their dependencies come from
+    ``dependencies`` if given, called with the step and the steps before
+    it, and from ``step_dependencies`` otherwise. Steps whose index is in
+    ``completed`` aren't executed; their stored result is returned instead.
+    ``on_complete`` is called with the index, step and result of every step
+    as soon as it has been executed, before its dependents start. Errors
+    raised by executing a step are kept in ``failed`` by index; dependents
+    of a failed step fail with the same error without executing.
+    """
+
+    def __init__(
+        self,
+        tool_registry: ToolRegistry,
+        execute_step: Callable[[int, Dict[str, Any]], Awaitable[Any]],
+        max_concurrency: Optional[int] = None,
+        completed: Optional[Dict[int, Any]] = None,
+        on_complete: Optional[Callable[[int, Dict[str, Any], Any], None]] = None,
+        dependencies: Optional[Callable[[Dict[str, Any], List[Dict[str, Any]]], Set[int]]] = None
+    ):
+        self.tool_registry = tool_registry
+        self._execute_step = execute_step
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.completed = completed if completed is not None else {}
+        self._on_complete = on_complete
+        self._dependencies = dependencies or (
+            lambda step, previous_steps: step_dependencies(step, previous_steps, tool_registry)
+        )
+        self.steps: List[Dict[str, Any]] = []
+        self.dependencies: List[Set[int]] = []
+        self.failed: Dict[int, Exception] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def submit(self, step: Dict[str, Any]) -> int:
+        """Schedule a step and return its index in the plan"""
+        dependencies = set(self._dependencies(step, self.steps))
+        upstream = [self._tasks[index] for index in sorted(dependencies)]
+
+        self.steps.append(step)
+        self.dependencies.append(dependencies)
+        index = len(self.steps) - 1
+        self._tasks.append(asyncio.ensure_future(self._run_step(index, step, upstream)))
+        return index
+
+    async def _run_step(self, index: int, step: Dict[str, Any], upstream: List[asyncio.Task]) -> Any:
+        """Wait for upstream steps, then execute the step under the concurrency cap"""
+        if index in self.completed:
+            return self.completed[index]
+        if upstream:
+            await asyncio.wait(upstream)
+            for task in upstream:
+                task.result()  # Re-raise upstream failures instead of running
+
+        try:
+            if self._semaphore is None:
+                result = await self._execute_step(index, step)
+            else:
+                async with self._semaphore:
+                    result = await self._execute_step(index, step)
+        except Exception as e:
+            self.failed[index] = e
+            raise
+        if self._on_complete:
+            self._on_complete(index, step, result)
+        return result
+
+    async def gather(self) -> List[Any]:
+        """Wait for all submitted steps and return their results in plan order
+
+        The first failure cancels every step that is still pending and is
+        re-raised.
+        """
+        try:
+            return await asyncio.gather(*self._tasks)
+        except BaseException:
+            await self.cancel()
+            raise
+
+    async def settle(self) -> List[Any]:
+        """Wait for all submitted steps, letting the rest finish when some fail
+
+        Returns results in plan order, with the exception in place of the
+        result of each step that failed or depends on a failed step.
+        """
+        try:
+            return await asyncio.gather(*self._tasks, return_exceptions=True)
+        except BaseException:
+            await self.cancel()
+            raise
+
+    async def cancel(self) -> None:
+        """Cancel all pending steps and wait for them to unwind"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
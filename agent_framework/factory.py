@@ -2,6 +2,17 @@ from typing import Optional, Type
 from .config import AgentConfiguration
 from .llm.base import LLMProvider
 from .llm.openai_provider import OpenAIProvider
+from .llm.singleflight import SingleFlightProvider
+from .llm.caching import CachingProvider
+from .llm.governor import RateGovernor
+from .llm.resilience import ResilientProvider
+from .planning.cache import PlanCache
+from .planning.validation import ToolMetrics
+from .http import HttpClientPool
+from .tools.cache import ToolResultCache
+from .checkpoint import CheckpointStore, MemoryCheckpointStore, SQLiteCheckpointStore, FileCheckpointStore
+from .exceptions import ConfigurationError
+from .utils.cache import CacheStore, InMemoryCache, SQLiteCache
 from .utils.logging import ConsoleAgentLogger
 from .agent import Agent
 
@@ -12,18 +23,139 @@ class AgentFactory:
         self.config = config
         self._llm_provider: Optional[LLMProvider] = None
         self._logger: Optional[ConsoleAgentLogger] = None
+        self._plan_cache: Optional[PlanCache] = None
+        self._http_pool: Optional[HttpClientPool] = None
+        self._tool_cache: Optional[ToolResultCache] = None
+        self._checkpoint_store: Optional[CheckpointStore] = None
+        self._tool_metrics: Optional[ToolMetrics] = None
+        self._llm_cache_store: Optional[CacheStore] = None
     
     def get_llm_provider(self) -> LLMProvider:
         """Get or create LLM provider"""
         if not self._llm_provider:
+            resilient = bool(self.config.llm_max_retries or self.config.llm_hedge_requests or self.config.llm_deadline)
             if "openai" in self.config.api_keys:
                 self._llm_provider = OpenAIProvider(
-                    config=self.config.llm_config
+                    config=self.config.llm_config,
+                    governor=self.get_rate_governor(),
+                    # Retries are left to the ResilientProvider when there is one
+                    max_retries=0 if resilient else self.config.llm_max_retries
                 )
             else:
                 raise ValueError("No LLM provider configured")
+            if resilient:
+                self._llm_provider = ResilientProvider(
+                    self._llm_provider,
+                    max_retries=self.config.llm_max_retries,
+                    hedge=self.config.llm_hedge_requests,
+                    deadline=self.config.llm_deadline
+                )
+            if self.config.enable_llm_cache:
+                if self.config.llm_cache_path:
+                    store = SQLiteCache(self.config.llm_cache_path, table="llm_responses")
+                else:
+                    store = InMemoryCache()
+                self._llm_cache_store = store
+                self._llm_provider = CachingProvider(
+                    self._llm_provider,
+                    store=store,
+                    max_temperature=self.config.llm_cache_max_temperature
+                )
+            # Coalesce outside the cache so concurrent misses share one call
+            if self.config.coalesce_calls:
+                self._llm_provider = SingleFlightProvider(self._llm_provider)
         return self._llm_provider
     
+    def get_rate_governor(self) -> Optional[RateGovernor]:
+        """Create the LLM rate governor if any quota or concurrency limit is configured"""
+        if not (
+            self.config.llm_requests_per_minute
+            or self.config.llm_tokens_per_minute
+            or self.config.llm_max_concurrency
+        ):
+            return None
+        return RateGovernor(
+            requests_per_minute=self.config.llm_requests_per_minute,
+            tokens_per_minute=self.config.llm_tokens_per_minute,
+            max_concurrency=self.config.llm_max_concurrency or 16
+        )
+    
+    def get_plan_cache(self) -> Optional[PlanCache]:
+        """Get or create the plan cache shared by all agents from this factory"""
+        if not self.config.enable_plan_cache:
+            return None
+        if not self._plan_cache:
+            if self.config.plan_cache_path:
+                store = SQLiteCache(self.config.plan_cache_path, table="plans")
+            else:
+                store = InMemoryCache()
+            self._plan_cache = PlanCache(store=store, ttl=self.config.plan_cache_ttl)
+        return self._plan_cache
+    
+    def get_tool_cache(self) -> Optional[ToolResultCache]:
+        """Get or create the tool result cache shared by all agents from this factory"""
+        if not self.config.enable_tool_cache:
+            return None
+        if not self._tool_cache:
+            self._tool_cache = ToolResultCache(path=self.config.tool_cache_path)
+        return self._tool_cache
+    
+    def get_checkpoint_store(self) -> Optional[CheckpointStore]:
+        """Get or create the checkpoint store shared by all agents from this factory"""
+        backend = self.config.checkpoint_backend
+        if not backend:
+            return None
+        if not self._checkpoint_store:
+            if backend == "memory":
+                self._checkpoint_store = MemoryCheckpointStore()
+            elif backend in ("sqlite", "file"):
+                if not self.config.checkpoint_path:
+                    raise ConfigurationError(f"CHECKPOINT_PATH is required for the {backend} checkpoint backend")
+                store_class = SQLiteCheckpointStore if backend == "sqlite" else FileCheckpointStore
+                self._checkpoint_store = store_class(self.config.checkpoint_path)
+            else:
+                raise ConfigurationError(f"Unknown checkpoint backend: {backend}")
+        return self._checkpoint_store
+    
+    def get_tool_metrics(self) -> ToolMetrics:
+        """Get or create the tool latency and cost metrics shared by all agents from this factory"""
+        if not self._tool_metrics:
+            self._tool_metrics = ToolMetrics()
+        return self._tool_metrics
+    
+    def get_http_pool(self) -> HttpClientPool:
+        """Get or create the HTTP connection pool shared by all agents from this factory"""
+        if not self._http_pool:
+            self._http_pool = HttpClientPool(
+                limit_per_host=self.config.http_limit_per_host,
+                timeout=self.config.http_timeout
+            )
+        return self._http_pool
+    
+    async def aclose(self) -> None:
+        """Close the resources shared by this factory's agents
+
+        Waits for background tool cache refreshes and closes cache and
+        checkpoint databases and pooled HTTP connections. Call it once the
+        agents are done, typically at application shutdown.
+        """
+        if self._tool_cache is not None:
+            await self._tool_cache.aclose()
+            self._tool_cache = None
+        if self._plan_cache is not None:
+            self._plan_cache.close()
+            self._plan_cache = None
+        if self._llm_cache_store is not None:
+            self._llm_cache_store.close()
+            self._llm_cache_store = None
+            self._llm_provider = None
+        if self._checkpoint_store is not None:
+            self._checkpoint_store.close()
+            self._checkpoint_store = None
+        if self._http_pool is not None:
+            await self._http_pool.close()
+            self._http_pool = None
+    
     def get_logger(self, agent_id: str) -> Optional[ConsoleAgentLogger]:
         """Get logger if enabled"""
         if self.config.enable_logging:
@@ -48,6 +180,32 @@ class AgentFactory:
             logger=logger,
             verbosity=self.config.verbosity,
             metadata=self.config.metadata,
+            max_concurrent_steps=self.config.max_concurrent_steps,
+            plan_cache=self.get_plan_cache(),
+            speculative_prefetch=self.config.speculative_prefetch,
+            http_pool=self.get_http_pool(),
+            coalesce_tool_calls=self.config.coalesce_calls,
+            execution_mode=self.config.execution_mode,
+            max_tool_turns=self.config.max_tool_turns,
+            stream_plan=self.config.stream_plan,
+            tool_catalog_max_tokens=self.config.tool_catalog_max_tokens,
+            tool_shortlist_size=self.config.tool_shortlist_size,
+            validate_tool_inputs=self.config.validate_tool_inputs,
+            tool_output_sample_rate=self.config.tool_output_sample_rate,
+            history_max_entries=self.config.history_max_entries,
+            history_max_tokens=self.config.history_max_tokens,
+            history_inline_bytes=self.config.history_inline_bytes,
+            history_blob_dir=self.config.history_blob_dir,
+            plan_repair_attempts=self.config.plan_repair_attempts,
+            max_plan_cost=self.config.max_plan_cost,
+            max_plan_latency=self.config.max_plan_latency,
+            step_retries=self.config.step_retries,
+            step_retry_delay=self.config.step_retry_delay,
+            recover_failed_steps=self.config.recover_failed_steps,
+            max_replans=self.config.max_replans,
+            tool_metrics=self.get_tool_metrics(),
+            tool_cache=self.get_tool_cache(),
+            checkpoint_store=self.get_checkpoint_store(),
             **kwargs
         )
         
@@ -0,0 +1,306 @@
+"""Bounded message history, with large payloads kept in an on-disk blob store"""
+import hashlib
+import inspect
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+from collections import Counter, deque
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+from .utils.tokens import count_tokens
+
+class BlobStore:
+    """Content-addressed store of byte payloads on disk
+
+    Blobs are named by their SHA-256, so storing the same payload twice
+    keeps one copy, and are written atomically, so readers never see a
+    partial blob. Reads go through mmap, letting callers parse large
+    payloads without holding a second copy in the heap. Without a
+    ``directory``, a temporary one is created and removed by ``close``.
+
+    Each ``put`` takes a reference to the blob, and ``release`` gives it
+    back; a blob is deleted once no references are left, so histories
+    sharing a payload keep it until the last one is done with it.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self._owned = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="agent-blobs-")
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._refs: Dict[str, int] = {}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def put(self, data: bytes) -> str:
+        """Store a payload, taking a reference to it, and get its key
+
+        The payload is written synchronously, so on an event loop a put
+        blocks it for as long as the write takes.
+        """
+        key = hashlib.sha256(data).hexdigest()
+        path = self._path(key)
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+                with os.fdopen(fd, "wb") as file:
+                    file.write(data)
+                os.replace(temporary, path)
+            self._refs[key] = self._refs.get(key, 0) + 1
+        return key
+
+    def release(self, key: str) -> None:
+        """Give back a reference taken by ``put``, deleting the blob when it was the last"""
+        with self._lock:
+            refs = self._refs.get(key, 0) - 1
+            if refs > 0:
+                self._refs[key] = refs
+                return
+            self._refs.pop(key, None)
+        self.delete(key)
+
+    def open(self, key: str) -> Union[mmap.mmap, bytes]:
+        """Map a blob into memory read-only; the caller closes the map"""
+        with open(self._path(key), "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return b""  # Empty files can't be mapped
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get(self, key: str) -> bytes:
+        """Read a whole blob"""
+        blob = self.open(key)
+        if isinstance(blob, bytes):
+            return blob
+        with blob:
+            return blob[:]
+
+    def delete(self, key: str) -> None:
+        """Remove a blob, if it is stored, regardless of its references"""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        """Remove the store's directory if the store created it"""
+        if self._owned:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+@dataclass(frozen=True)
+class BlobRef:
+    """Lightweight stand-in for a payload moved to a blob store"""
+    key: str
+    size: int
+    preview: str
+    store: BlobStore = field(repr=False, compare=False)
+
+    def load(self) -> Any:
+        """Read the payload back, as the JSON-compatible value it was stored as"""
+        blob = self.store.open(self.key)
+        if isinstance(blob, bytes):
+            return json.loads(blob or b"null")
+        with blob:
+            return json.loads(blob[:])
+
+    def __str__(self) -> str:
+        return f"<blob {self.key[:12]} {self.size} bytes: {self.preview}>"
+
+# Called with the current summary entry (or None) and the entries leaving the
+# history, returning the new summary entry; may be a coroutine function
+Summarizer = Callable[[Optional[Dict[str, Any]], List[Dict[str, Any]]], Union[Dict[str, Any], Awaitable[Dict[str, Any]]]]
+
+class MessageHistory(Sequence):
+    """Message and tool-call history with bounded size
+
+    Entries are kept inline while they fit within ``max_entries`` and
+    ``max_tokens``; older ones are evicted first. Payload fields (tool
+    ``inputs`` and ``result``) larger than ``inline_bytes`` are written to
+    the blob store and replaced by a BlobRef, so the history holds at most
+    a preview of them. With a ``summarizer``, evicted entries are folded
+    into a single summary entry by ``summarize``, which is kept at the front
+    of the history and counts toward the budgets like any other entry.
+    Tokens are only counted when there is a ``max_tokens`` budget.
+
+    Spilling is off unless ``inline_bytes`` is set. Blobs are written
+    synchronously as entries are appended, and released as their entries
+    are evicted (after ``summarize`` has seen them, with a summarizer) and
+    by ``close`` when the run ends. Anyone given the entries, such as a
+    logger, has to load their BlobRefs before then.
+    """
+
+    PAYLOAD_FIELDS = ("inputs", "result")
+    PREVIEW_CHARS = 200
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        inline_bytes: Optional[int] = None,
+        blob_store: Optional[Union[BlobStore, Callable[[], BlobStore]]] = None,
+        summarizer: Optional[Summarizer] = None,
+        model: str = "gpt-4"
+    ):
+        self.max_entries = max_entries
+        self.max_tokens = max_tokens
+        self.inline_bytes = inline_bytes
+        self.summarizer = summarizer
+        self.model = model
+        # A factory, so the blob store is only created once a payload needs it
+        self._blob_store = blob_store
+        self._entries: Deque[Tuple[Dict[str, Any], int]] = deque()
+        self._tokens = 0
+        self._evicted = 0
+        self._pending: List[Dict[str, Any]] = []
+        self.summary: Optional[Dict[str, Any]] = None
+        self._summary_tokens = 0
+        # References this history took with BlobStore.put and has to give back
+        self._spilled: Counter = Counter()
+
+    @property
+    def blob_store(self) -> Optional[BlobStore]:
+        if self._blob_store is not None and not isinstance(self._blob_store, BlobStore):
+            self._blob_store = self._blob_store()
+        return self._blob_store
+
+    @property
+    def tokens(self) -> int:
+        """Approximate token count of the entries held, including the summary (0 without a token budget)"""
+        return self._tokens + self._summary_tokens
+
+    @property
+    def evicted(self) -> int:
+        """Number of entries evicted so far"""
+        return self._evicted
+
+    def _spill(self, value: Any) -> Any:
+        if self.inline_bytes is None or self._blob_store is None or isinstance(value, BlobRef):
+            return value
+        data = json.dumps(value, default=str).encode()
+        if len(data) <= self.inline_bytes:
+            return value
+        preview = data[:self.PREVIEW_CHARS].decode(errors="ignore")
+        ref = BlobRef(key=self.blob_store.put(data), size=len(data), preview=preview, store=self.blob_store)
+        self._spilled[ref] += 1
+        return ref
+
+    def _count(self, entry: Dict[str, Any]) -> int:
+        if self.max_tokens is None:
+            return 0
+        return count_tokens(json.dumps(entry, default=str), self.model)
+
+    def _release(self, entry: Dict[str, Any]) -> None:
+        for key in self.PAYLOAD_FIELDS:
+            value = entry.get(key)
+            # BlobRefs appended as they were belong to whoever created them
+            if isinstance(value, BlobRef) and self._spilled.get(value):
+                self._spilled[value] -= 1
+                if not self._spilled[value]:
+                    del self._spilled[value]
+                value.store.release(value.key)
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Add an entry, moving its large payloads to the blob store and evicting old entries over budget"""
+        entry = {key: self._spill(value) if key in self.PAYLOAD_FIELDS else value for key, value in entry.items()}
+        tokens = self._count(entry)
+        self._entries.append((entry, tokens))
+        self._tokens += tokens
+        self._enforce()
+
+    def _enforce(self) -> None:
+        # The newest entry is always kept, even if it alone is over budget
+        while len(self._entries) > 1 and (
+            (self.max_entries is not None and len(self) > self.max_entries)
+            or (self.max_tokens is not None and self.tokens > self.max_tokens)
+        ):
+            entry, tokens = self._entries.popleft()
+            self._tokens -= tokens
+            self._evicted += 1
+            if self.summarizer:
+                self._pending.append(entry)
+            else:
+                self._release(entry)
+
+    async def summarize(self) -> None:
+        """Fold entries evicted since the last call into the summary entry"""
+        if not self.summarizer or not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        try:
+            summary = self.summarizer(self.summary, pending)
+            if inspect.isawaitable(summary):
+                summary = await summary
+        finally:
+            for entry in pending:
+                self._release(entry)
+        self.summary = summary
+        self._summary_tokens = self._count(summary) if summary else 0
+        self._enforce()
+
+    def close(self) -> None:
+        """Release the blobs of every entry held, once the run no longer needs its history"""
+        for entry in self._pending:
+            self._release(entry)
+        self._pending = []
+        while self._entries:
+            entry, _ = self._entries.popleft()
+            self._release(entry)
+            self._evicted += 1
+        self._tokens = 0
+
+    def view(self) -> "HistoryView":
+        """Read-only view of the history as it is now, without copying it"""
+        return HistoryView(self, self._evicted + len(self._entries))
+
+    def _entry_at(self, position: int) -> Dict[str, Any]:
+        # Position counts every entry ever appended
+        return self._entries[position - self._evicted][0]
+
+    def __len__(self) -> int:
+        return len(self._entries) + (1 if self.summary else 0)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if self.summary:
+            if index == 0:
+                return self.summary
+            index -= 1
+        if not 0 <= index < len(self._entries):
+            raise IndexError("MessageHistory index out of range")
+        return self._entries[index][0]
+
+    def __iter__(self):
+        if self.summary:
+            yield self.summary
+        for entry, _ in self._entries:
+            yield entry
+
+class HistoryView(Sequence):
+    """The entries of a history up to a point, skipping any evicted since"""
+
+    def __init__(self, history: MessageHistory, stop: int):
+        self._history = history
+        self._stop = stop
+
+    def _start(self) -> int:
+        return min(self._history.evicted, self._stop)
+
+    def __len__(self) -> int:
+        return self._stop - self._start()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("HistoryView index out of range")
+        return self._history._entry_at(self._start() + index)
@@ -0,0 +1,96 @@
+"""Shared HTTP connection pooling for tools that call web APIs"""
+import asyncio
+from typing import Iterable, Optional, TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import aiohttp
+
+class HttpClientPool:
+    """A lazily created aiohttp session shared by all tools of an agent
+
+    Reusing one session keeps connections alive between calls, so repeated
+    calls to the same API skip the TCP and TLS handshakes and the DNS
+    lookup. Connections are limited per host and DNS results are cached.
+    aiohttp is only imported when the first session is created.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        timeout: float = 30.0,
+        connect_timeout: float = 10.0
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def session(self) -> "aiohttp.ClientSession":
+        """Get the shared session, creating it on first use in this event loop
+
+        A session left over from another event loop is closed and replaced.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            try:
+                import aiohttp
+            except ImportError as e:
+                raise ImportError(
+                    "aiohttp is required for HttpClientPool. Install it with `pip install aiohttp`"
+                ) from e
+
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            stale = self._session
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout)
+            )
+            self._loop = loop
+            if stale is not None and not stale.closed:
+                try:
+                    await stale.close()
+                except Exception:
+                    pass  # Its event loop may be gone already, and its connections with it
+        return self._session
+
+    async def warm_up(self, urls: Iterable[str]) -> None:
+        """Open a pooled connection to each host ahead of the first real call
+
+        Failures are ignored, since warming up is only an optimization.
+        """
+        origins = {
+            f"{parts.scheme}://{parts.netloc}"
+            for parts in (urlsplit(url) for url in urls)
+            if parts.scheme and parts.netloc
+        }
+        if not origins:
+            return
+
+        session = await self.session()
+
+        async def touch(origin: str) -> None:
+            async with session.head(origin, allow_redirects=False) as response:
+                await response.release()
+
+        await asyncio.gather(*(touch(origin) for origin in origins), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Close the session and all pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
@@ -1,7 +1,19 @@
 """LLM Provider Package"""
 
 from .base import LLMProvider
-from .models import LLMMessage, LLMResponse, LLMConfig
+from .models import LLMMessage, LLMResponse, LLMConfig, StructuredChunk
 from .openai_provider import OpenAIProvider
+from .delegating import DelegatingProvider
+from .singleflight import SingleFlightProvider
+from .caching import CachingProvider, bypass_cache
+from .governor import RateGovernor, request_priority
+from .resilience import ResilientProvider, call_deadline
+from .local_provider import LocalProvider
+from .structured import stream_structured
 
-__all__ = ['LLMProvider', 'LLMMessage', 'LLMResponse', 'LLMConfig', 'OpenAIProvider'] 
\ No newline at end of file
+__all__ = [
+    'LLMProvider', 'LLMMessage', 'LLMResponse', 'LLMConfig', 'StructuredChunk', 'OpenAIProvider',
+    'DelegatingProvider', 'SingleFlightProvider', 'CachingProvider', 'bypass_cache',
+    'RateGovernor', 'request_priority', 'ResilientProvider', 'call_deadline', 'LocalProvider',
+    'stream_structured'
+] 
\ No newline at end of file
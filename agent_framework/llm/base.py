@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence, Type, TypeVar
+from pydantic import BaseModel
 
-from .models import LLMMessage, LLMResponse, LLMConfig
+from .models import LLMMessage, LLMResponse, LLMConfig, StructuredChunk
+from .structured import stream_structured
+
+T = TypeVar('T', bound=BaseModel)
 
 class LLMProvider(ABC):
     """Base class for LLM providers"""
@@ -25,4 +29,42 @@ class LLMProvider(ABC):
         config: Optional[LLMConfig] = None
     ):
         """Generate a streaming response from the LLM"""
-        pass 
\ No newline at end of file
+        pass
+
+    async def generate_structured(
+        self,
+        messages: List[LLMMessage],
+        output_model: Type[T],
+        config: Optional[LLMConfig] = None
+    ) -> T:
+        """Generate a response parsed into the given Pydantic model"""
+        raise NotImplementedError(f"{type(self).__name__} does not support structured output")
+
+    async def generate_structured_stream(
+        self,
+        messages: List[LLMMessage],
+        output_model: Type[T],
+        config: Optional[LLMConfig] = None,
+        stream_fields: Sequence[str] = ()
+    ) -> AsyncGenerator[StructuredChunk, None]:
+        """Generate a structured response, yielding its fields as they complete
+
+        Providers that can't stream structured output generate the whole
+        response first and then yield its parts.
+        """
+        result = await self.generate_structured(messages, output_model, config)
+
+        async def whole():
+            yield result.model_dump_json()
+
+        async for chunk in stream_structured(whole(), output_model, stream_fields):
+            yield chunk
+
+    async def generate_with_tools(
+        self,
+        messages: List[LLMMessage],
+        tools: List[Dict[str, Any]],
+        config: Optional[LLMConfig] = None
+    ) -> LLMResponse:
+        """Generate a response that may request calls to the given tools"""
+        raise NotImplementedError(f"{type(self).__name__} does not support tool calling")
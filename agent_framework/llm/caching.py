@@ -0,0 +1,149 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Iterator, List, Optional, Sequence, Type
+
+from .base import LLMProvider, T
+from .delegating import DelegatingProvider
+from .models import LLMMessage, LLMResponse, LLMConfig, StructuredChunk
+from .structured import stream_structured
+from ..utils.cache import CacheStats, CacheStore, InMemoryCache
+from ..utils.hashing import stable_hash
+
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+@contextmanager
+def bypass_cache() -> Iterator[None]:
+    """Skip response caches for LLM calls made within the block
+
+    The block still runs concurrently with other tasks, which keep using the
+    cache.
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+@dataclass
+class LLMCacheStats(CacheStats):
+    """Counters describing how an LLM response cache is being used"""
+    bypassed: int = 0
+
+class CachingProvider(DelegatingProvider):
+    """Caches responses of a wrapped provider for repeated identical requests
+
+    Responses are keyed on the messages, the effective config (including
+    the model) and, for structured output, the output schema. With
+    ``normalize`` on, message content differing only in surrounding or
+    repeated whitespace shares an entry. Requests sampled above
+    ``max_temperature`` are never cached, since their callers expect
+    varied output. Structured hits return a copy of the validated model
+    without re-parsing. Structured streams share entries with
+    ``generate_structured`` and replay hits as a stream.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        store: Optional[CacheStore] = None,
+        ttl: Optional[float] = None,
+        max_temperature: float = 0.3,
+        normalize: bool = True
+    ):
+        super().__init__(provider)
+        self.store = store if store is not None else InMemoryCache(max_size=1024)
+        self.ttl = ttl
+        self.max_temperature = max_temperature
+        self.normalize = normalize
+        self.stats = LLMCacheStats()
+
+    def _cacheable(self, config: Optional[LLMConfig]) -> bool:
+        if _bypass.get() or (config or self.config).temperature > self.max_temperature:
+            self.stats.bypassed += 1
+            return False
+        return True
+
+    def _key(self, method: str, messages: List[LLMMessage], config: Optional[LLMConfig], schema: Any = None) -> str:
+        message_data = [message.model_dump() for message in messages]
+        if self.normalize:
+            for message in message_data:
+                message["content"] = " ".join(message["content"].split())
+        return stable_hash([method, message_data, (config or self.config).model_dump(), schema])
+
+    def _structured_key(self, messages: List[LLMMessage], output_model: Type[T], config: Optional[LLMConfig]) -> str:
+        schema = [f"{output_model.__module__}.{output_model.__qualname__}", output_model.model_json_schema()]
+        return self._key("generate_structured", messages, config, schema)
+
+    def _get(self, key: str) -> Optional[Any]:
+        cached = self.store.get(key)
+        if cached is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return cached.model_copy(deep=True)
+
+    async def generate(
+        self,
+        messages: List[LLMMessage],
+        config: Optional[LLMConfig] = None
+    ) -> LLMResponse:
+        if not self._cacheable(config):
+            return await self.provider.generate(messages, config)
+
+        key = self._key("generate", messages, config)
+        if (cached := self._get(key)) is not None:
+            return cached
+
+        response = await self.provider.generate(messages, config)
+        # Truncated responses are worth retrying rather than replaying
+        if response.finish_reason != "length":
+            self.store.set(key, response, ttl=self.ttl)
+        return response
+
+    async def generate_structured(
+        self,
+        messages: List[LLMMessage],
+        output_model: Type[T],
+        config: Optional[LLMConfig] = None
+    ) -> T:
+        if not self._cacheable(config):
+            return await self.provider.generate_structured(messages, output_model, config)
+
+        key = self._structured_key(messages, output_model, config)
+        if (cached := self._get(key)) is not None:
+            return cached
+
+        result = await self.provider.generate_structured(messages, output_model, config)
+        self.store.set(key, result, ttl=self.ttl)
+        return result
+
+    async def generate_structured_stream(
+        self,
+        messages: List[LLMMessage],
+        output_model: Type[T],
+        config: Optional[LLMConfig] = None,
+        stream_fields: Sequence[str] = ()
+    ) -> AsyncGenerator[StructuredChunk, None]:
+        if not self._cacheable(config):
+            async for chunk in self.provider.generate_structured_stream(messages, output_model, config, stream_fields):
+                yield chunk
+            return
+
+        key = self._structured_key(messages, output_model, config)
+        if (cached := self._get(key)) is not None:
+            async def replay():
+                yield cached.model_dump_json()
+
+            async for chunk in stream_structured(replay(), output_model, stream_fields):
+                yield chunk
+            return
+
+        async for chunk in self.provider.generate_structured_stream(messages, output_model, config, stream_fields):
+            if chunk.result is not None:
+                self.store.set(key, chunk.result, ttl=self.ttl)
+            yield chunk
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        self.store.clear()
@@ -0,0 +1,63 @@
+from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence, Type
+
+from .base import LLMProvider, T
+from .models import LLMMessage, LLMResponse, LLMConfig, StructuredChunk
+
+class DelegatingProvider(LLMProvider):
+    """Base class for providers that wrap another provider to add behaviour
+
+    All calls are forwarded to the wrapped provider unchanged; subclasses
+    override the methods they want to change. Attributes the wrapper doesn't
+    define, such as ``client``, are looked up on the wrapped provider.
+    """
+
+    def __init__(self, provider: LLMProvider):
+        super().__init__(provider.config)
+        self.provider = provider
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the wrapper itself
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+    async def generate(
+        self,
+        messages: List[LLMMessage],
+        config: Optional[LLMConfig] = None
+    ) -> LLMResponse:
+        return await self.provider.generate(messages, config)
+
+    async def generate_stream(
+        self,
+        messages: List[LLMMessage],
+        config: Optional[LLMConfig] = None
+    ) -> AsyncGenerator[LLMResponse, None]:
+        async for chunk in self.provider.generate_stream(messages, config):
+            yield chunk
+
+    async def generate_structured(
+        self,
+        messages: List[LLMMessage],
+        output_model: Type[T],
+        config: Optional[LLMConfig] = None
+    ) -> T:
+        return await self.provider.generate_structured(messages, output_model, config)
+
+    async def generate_structured_stream(
+        self,
+        messages: List[LLMMessage],
+        output_model: Type[T],
+        config: Optional[LLMConfig] = None,
+        stream_fields: Sequence[str] = ()
+    ) -> AsyncGenerator[StructuredChunk, None]:
+        async for chunk in self.provider.generate_structured_stream(messages, output_model, config, stream_fields):
+            yield chunk
+
+    async def generate_with_tools(
+        self,
+        messages: List[LLMMessage],
+        tools: List[Dict[str, Any]],
+        config: Optional[LLMConfig] = None
+    ) -> LLMResponse:
+        return await self.provider.generate_with_tools(messages, tools, config)
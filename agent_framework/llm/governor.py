@@ -0,0 +1,268 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
+
+R = TypeVar("R")
+
+# Priority lanes; lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 5
+PRIORITY_BATCH = 10
+
+_priority: ContextVar[int] = ContextVar("llm_request_priority", default=PRIORITY_DEFAULT)
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """Set the governor priority lane for LLM calls made within the block"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether an API error is an HTTP 429 rate limit response"""
+    return getattr(error, "status_code", None) == 429 or getattr(error, "status", None) == 429
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate
+
+    A request larger than the bucket's capacity is admitted once the bucket
+    is full and leaves it in debt, so oversized requests are slowed down
+    rather than blocked forever.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Get the seconds until the amount can be consumed"""
+        self._refill()
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def consume(self, amount: float) -> None:
+        """Take tokens from the bucket; a negative amount returns them"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+@dataclass
+class GovernorMetrics:
+    """Counters describing the load a governor has seen"""
+    requests: int = 0
+    rate_limited: int = 0
+    retries: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    estimated_tokens: int = 0
+    used_tokens: int = 0
+
+    @property
+    def average_wait(self) -> float:
+        """Average seconds requests spent queued"""
+        return self.total_wait / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> Dict[str, Union[int, float]]:
+        """Get the counters and average wait as a plain dict"""
+        return {**asdict(self), "average_wait": self.average_wait}
+
+class Permit:
+    """Admission of one request, used to report its actual token usage"""
+
+    def __init__(self, estimated_tokens: int):
+        self.estimated_tokens = estimated_tokens
+        self.used_tokens: Optional[int] = None
+
+    def record_usage(self, tokens: int) -> None:
+        """Report the tokens the request actually used, from the response usage"""
+        self.used_tokens = tokens
+
+class RateGovernor:
+    """Admission control for LLM requests against the provider's quotas
+
+    Requests wait in priority lanes until a concurrency slot is free and
+    the request-per-minute and token-per-minute buckets can cover them.
+    Token charges start from an estimate and are corrected once the
+    response reports its usage. The concurrency limit adapts with AIMD.
+    Each successful request raises it a little. It is cut multiplicatively
+    on a 429 or when latency exceeds the target, so throughput settles just
+    under the quota instead of swinging between idle and throttled.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        latency_target: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        rate_limit_retries: int = 2
+    ):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.rate_limit_retries = rate_limit_retries
+        self.concurrency_limit = float(max_concurrency)
+        self.active = 0
+        self.metrics = GovernorMetrics()
+        self._waiters: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for admission"""
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    def snapshot(self) -> Dict[str, Union[int, float]]:
+        """Get current queue depth, concurrency and counters"""
+        return {
+            **self.metrics.as_dict(),
+            "queue_depth": self.queue_depth,
+            "active": self.active,
+            "concurrency_limit": self.concurrency_limit
+        }
+
+    def _dispatch(self) -> None:
+        if self._wakeup:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+        while self._waiters and self.active < max(1, int(self.concurrency_limit)):
+            priority, sequence, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            delay = self._paused_until - time.monotonic()
+            for bucket, amount in ((self.request_bucket, 1), (self.token_bucket, tokens)):
+                if bucket:
+                    delay = max(delay, bucket.delay(amount))
+            if delay > 0:
+                self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+
+            heapq.heappop(self._waiters)
+            if self.request_bucket:
+                self.request_bucket.consume(1)
+            if self.token_bucket:
+                self.token_bucket.consume(tokens)
+            self.active += 1
+            future.set_result(None)
+
+    async def _admit(self, tokens: int, priority: int) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), tokens, future))
+        queued_at = time.monotonic()
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the caller was cancelled
+                self._release(tokens, 0, None)
+            raise
+        wait = time.monotonic() - queued_at
+        self.metrics.requests += 1
+        self.metrics.total_wait += wait
+        self.metrics.max_wait = max(self.metrics.max_wait, wait)
+
+    def _release(self, estimated: int, used: Optional[int], latency: Optional[float]) -> None:
+        self.active -= 1
+        if used is not None:
+            self.metrics.used_tokens += used
+            if self.token_bucket:
+                self.token_bucket.consume(used - estimated)
+        if latency is not None:
+            if self.latency_target and latency > self.latency_target:
+                self._decrease()
+            else:
+                self.concurrency_limit = min(
+                    self.max_concurrency,
+                    self.concurrency_limit + 1 / max(self.concurrency_limit, 1)
+                )
+        self._dispatch()
+
+    def _decrease(self) -> None:
+        # Cut at most once per second so one burst of slow or throttled responses counts once
+        now = time.monotonic()
+        if now - self._last_decrease < 1.0:
+            return
+        self._last_decrease = now
+        self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * self.decrease_factor)
+
+    def _on_rate_limited(self, error: BaseException) -> None:
+        self.metrics.rate_limited += 1
+        self._decrease()
+        pause = _retry_after(error) or 1.0
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int, priority: Optional[int] = None) -> AsyncIterator[Permit]:
+        """Wait for admission and hold a concurrency slot for the duration of a request
+
+        The priority defaults to the lane set with ``request_priority``.
+        """
+        priority = _priority.get() if priority is None else priority
+        await self._admit(estimated_tokens, priority)
+        self.metrics.estimated_tokens += estimated_tokens
+        permit = Permit(estimated_tokens)
+        started = time.monotonic()
+        try:
+            yield permit
+        except BaseException as e:
+            if is_rate_limit_error(e):
+                self._on_rate_limited(e)
+            self._release(estimated_tokens, permit.used_tokens, None)
+            raise
+        self._release(estimated_tokens, permit.used_tokens, time.monotonic() - started)
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[R]],
+        estimated_tokens: int,
+        usage: Optional[Callable[[R], Optional[int]]] = None,
+        priority: Optional[int] = None
+    ) -> R:
+        """Make a request under the governor, retrying it after rate limit responses"""
+        attempt = 0
+        while True:
+            try:
+                async with self.acquire(estimated_tokens, priority) as permit:
+                    result = await call()
+                    if usage and (used := usage(result)) is not None:
+                        permit.record_usage(used)
+                    return result
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.rate_limit_retries:
+                    raise
+                # The governor has paused admissions, so the retry waits out the limit
+                attempt += 1
+                self.metrics.retries += 1
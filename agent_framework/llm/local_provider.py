@@ -0,0 +1,117 @@
+import asyncio
+import re
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, List, Optional, Sequence, Type, Union
+
+from .base import LLMProvider, T
+from .models import LLMMessage, LLMResponse, LLMConfig, LLMToolCall, StructuredChunk
+from .structured import stream_structured
+
+Reply = Union[str, BaseException, List[LLMToolCall], Callable[[List[LLMMessage]], Any]]
+
+class LocalProvider(LLMProvider):
+    """Offline provider that answers from a script instead of calling an API
+
+    Useful for developing agents without an API key and for exercising
+    caching, retry and hedging behaviour deterministically. Each call
+    takes the next reply from ``replies`` (the last one repeats): a string
+    is returned as content, an exception is raised, and a callable is
+    called with the messages. A list of ``LLMToolCall`` requests tool
+    calls from ``generate_with_tools``. ``latency`` delays every call,
+    either by a fixed number of seconds or by a function of the call number.
+    Streamed replies are split into words, ``stream_delay`` seconds apart.
+    """
+
+    def __init__(
+        self,
+        replies: Sequence[Reply] = ("",),
+        latency: Union[float, Callable[[int], float]] = 0.0,
+        config: Optional[LLMConfig] = None,
+        stream_delay: float = 0.0
+    ):
+        super().__init__(config or LLMConfig(model="local"))
+        if not replies:
+            raise ValueError("LocalProvider needs at least one reply")
+        self.replies = list(replies)
+        self.latency = latency
+        self.stream_delay = stream_delay
+        self.calls: List[List[LLMMessage]] = []
+
+    async def _reply(self, messages: List[LLMMessage]) -> Any:
+        call_number = len(self.calls)
+        self.calls.append(list(messages))
+        delay = self.latency(call_number) if callable(self.latency) else self.latency
+        if delay:
+            await asyncio.sleep(delay)
+
+        reply = self.replies[min(call_number, len(self.replies) - 1)]
+        if isinstance(reply, BaseException):
+            raise reply
+        if callable(reply):
+            reply = reply(messages)
+            if asyncio.iscoroutine(reply):
+                reply = await reply
+        return reply
+
+    async def generate(
+        self,
+        messages: List[LLMMessage],
+        config: Optional[LLMConfig] = None
+    ) -> LLMResponse:
+        reply = await self._reply(messages)
+        if isinstance(reply, LLMResponse):
+            return reply
+        return LLMResponse(content=str(reply), finish_reason="stop")
+
+    async def generate_stream(
+        self,
+        messages: List[LLMMessage],
+        config: Optional[LLMConfig] = None
+    ) -> AsyncGenerator[LLMResponse, None]:
+        response = await self.generate(messages, config)
+        async for chunk in self._split(response.content):
+            yield LLMResponse(content=chunk)
+
+    async def _split(self, text: str) -> AsyncIterator[str]:
+        for chunk in re.findall(r"\s*\S+", text):
+            await asyncio.sleep(self.stream_delay)
+            yield chunk
+
+    async def generate_structured(
+        self,
+        messages: List[LLMMessage],
+        output_model: Type[T],
+        config: Optional[LLMConfig] = None
+    ) -> T:
+        reply = await self._reply(messages)
+        if isinstance(reply, output_model):
+            return reply
+        if isinstance(reply, str):
+            return output_model.model_validate_json(reply)
+        return output_model.model_validate(reply)
+
+    async def generate_structured_stream(
+        self,
+        messages: List[LLMMessage],
+        output_model: Type[T],
+        config: Optional[LLMConfig] = None,
+        stream_fields: Sequence[str] = ()
+    ) -> AsyncGenerator[StructuredChunk, None]:
+        reply = await self._reply(messages)
+        if not isinstance(reply, str):
+            result = reply if isinstance(reply, output_model) else output_model.model_validate(reply)
+            reply = result.model_dump_json(indent=1)
+        async for chunk in stream_structured(self._split(reply), output_model, stream_fields):
+            yield chunk
+
+    async def generate_with_tools(
+        self,
+        messages: List[LLMMessage],
+        tools: List[Dict[str, Any]],
+        config: Optional[LLMConfig] = None
+    ) -> LLMResponse:
+        reply = await self._reply(messages)
+        if isinstance(reply, LLMResponse):
+            return reply
+        if isinstance(reply, list) and all(isinstance(call, LLMToolCall) for call in reply):
+            return LLMResponse(content="", finish_reason="tool_calls", tool_calls=reply)
+        return LLMResponse(content=str(reply), finish_reason="stop")
@@ -1,11 +1,19 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 from pydantic import BaseModel, Field
 
+class LLMToolCall(BaseModel):
+    """A tool call requested by the LLM"""
+    id: str
+    name: str
+    arguments: Dict[str, Any] = Field(default_factory=dict)
+
 class LLMMessage(BaseModel):
     """Message format for LLM interactions"""
     role: str
     content: str
     name: Optional[str] = None
+    tool_call_id: Optional[str] = None
+    tool_calls: Optional[List[LLMToolCall]] = None
 
 class LLMResponse(BaseModel):
     """Structured response from LLM"""
@@ -13,6 +21,20 @@ class LLMResponse(BaseModel):
     raw_response: Dict[str, Any] = Field(default_factory=dict)
     finish_reason: Optional[str] = None
     usage: Optional[Dict[str, int]] = None
+    tool_calls: List[LLMToolCall] = Field(default_factory=list)
+
+class StructuredChunk(BaseModel):
+    """Part of a structured response that has finished streaming
+
+    ``path`` locates the part, e.g. ``("execution_plan", 0)`` for the first
+    plan step. Completed fields carry their validated ``value``, streamed
+    string fields carry ``text`` deltas, and the last chunk carries the
+    complete validated ``result``.
+    """
+    path: Tuple[Union[str, int], ...] = ()
+    value: Any = None
+    text: Optional[str] = None
+    result: Optional[Any] = None
 
 class LLMConfig(BaseModel):
     """Configuration for LLM provider"""
@@ -1,23 +1,36 @@
-from typing import Any, Dict, List, Optional, AsyncGenerator, Type, TypeVar
+import json
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Optional, AsyncGenerator, Sequence, Type, TypeVar
 from openai import AsyncOpenAI
 from pydantic import BaseModel
 import os
 from dotenv import load_dotenv
 
 from .base import LLMProvider
-from .models import LLMMessage, LLMResponse, LLMConfig
+from .governor import RateGovernor
+from .models import LLMMessage, LLMResponse, LLMConfig, LLMToolCall, StructuredChunk
+from .structured import stream_structured
+from ..utils.tokens import estimate_message_tokens
 
 T = TypeVar('T', bound=BaseModel)
 
 class OpenAIProvider(LLMProvider):
-    """OpenAI implementation of LLM provider"""
+    """OpenAI implementation of LLM provider
+
+    ``max_retries`` is passed to the OpenAI client, which retries twice by
+    default; set it to 0 when the provider is wrapped in a
+    ResilientProvider, so retries aren't stacked.
+    """
     
     def __init__(
         self,
         config: LLMConfig,
-        organization: Optional[str] = None
+        organization: Optional[str] = None,
+        governor: Optional[RateGovernor] = None,
+        max_retries: Optional[int] = None
     ):
         super().__init__(config)
+        self.governor = governor
         
         # Load environment variables
         load_dotenv()
@@ -28,7 +41,8 @@ class OpenAIProvider(LLMProvider):
             raise ValueError("OpenAI API key must be provided or set in OPENAI_API_KEY environment variable")
             
         self.client = AsyncOpenAI(
-            api_key=self.api_key
+            api_key=self.api_key,
+            **({"max_retries": max_retries} if max_retries is not None else {})
         )
 
     def _prepare_messages(
@@ -39,8 +53,18 @@ class OpenAIProvider(LLMProvider):
         return [
             {
                 "role": msg.role,
-                "content": msg.content,
-                **({"name": msg.name} if msg.name else {})
+                # Assistant messages that only call tools carry no content
+                "content": msg.content if msg.content or not msg.tool_calls else None,
+                **({"name": msg.name} if msg.name else {}),
+                **({"tool_call_id": msg.tool_call_id} if msg.tool_call_id else {}),
+                **({"tool_calls": [
+                    {
+                        "id": call.id,
+                        "type": "function",
+                        "function": {"name": call.name, "arguments": json.dumps(call.arguments)}
+                    }
+                    for call in msg.tool_calls
+                ]} if msg.tool_calls else {})
             }
             for msg in messages
         ]
@@ -59,6 +83,23 @@ class OpenAIProvider(LLMProvider):
             **cfg.custom_settings
         }
 
+    def _estimate_tokens(self, openai_messages: List[Dict[str, Any]], api_config: Dict[str, Any]) -> int:
+        """Estimate the tokens a request counts against the quota: its prompt plus the completion limit"""
+        return estimate_message_tokens(openai_messages, api_config["model"]) + (api_config.get("max_tokens") or 0)
+
+    async def _create_completion(self, openai_messages: List[Dict[str, Any]], api_config: Dict[str, Any], **kwargs: Any) -> Any:
+        """Create a chat completion, through the rate governor when one is configured"""
+        def create():
+            return self.client.chat.completions.create(messages=openai_messages, **kwargs, **api_config)
+
+        if not self.governor:
+            return await create()
+        return await self.governor.run(
+            create,
+            self._estimate_tokens(openai_messages, api_config),
+            usage=lambda response: response.usage.total_tokens if response.usage else None
+        )
+
     async def generate(
         self,
         messages: List[LLMMessage],
@@ -68,10 +109,7 @@ class OpenAIProvider(LLMProvider):
         openai_messages = self._prepare_messages(messages)
         api_config = self._prepare_config(config)
         
-        response = await self.client.chat.completions.create(
-            messages=openai_messages,
-            **api_config
-        )
+        response = await self._create_completion(openai_messages, api_config)
         
         choice = response.choices[0]
         return LLMResponse(
@@ -90,19 +128,38 @@ class OpenAIProvider(LLMProvider):
         openai_messages = self._prepare_messages(messages)
         api_config = self._prepare_config(config)
         
-        stream = await self.client.chat.completions.create(
-            messages=openai_messages,
-            stream=True,
-            **api_config
-        )
-        
-        async for chunk in stream:
-            if chunk.choices[0].delta.content:
-                yield LLMResponse(
-                    content=chunk.choices[0].delta.content,
-                    raw_response=chunk.model_dump(),
-                    finish_reason=chunk.choices[0].finish_reason
-                ) 
+        async with AsyncExitStack() as stack:
+            # A stream holds its concurrency slot until it has been fully read
+            if self.governor:
+                await stack.enter_async_context(
+                    self.governor.acquire(self._estimate_tokens(openai_messages, api_config))
+                )
+            stream = await self.client.chat.completions.create(
+                messages=openai_messages,
+                stream=True,
+                **api_config
+            )
+            
+            async for chunk in stream:
+                if chunk.choices[0].delta.content:
+                    yield LLMResponse(
+                        content=chunk.choices[0].delta.content,
+                        raw_response=chunk.model_dump(),
+                        finish_reason=chunk.choices[0].finish_reason
+                    ) 
+
+    def _structured_output_tool(self, output_model: Type[BaseModel]) -> Dict[str, Any]:
+        """Get the request arguments forcing a tool call whose arguments follow the model's schema"""
+        # Create function definition from Pydantic model
+        function_def = {
+            "name": "output_structured_data",
+            "description": f"Output data in {output_model.__name__} format",
+            "parameters": output_model.model_json_schema()
+        }
+        return {
+            "tools": [{"type": "function", "function": function_def}],
+            "tool_choice": {"type": "function", "function": {"name": "output_structured_data"}}
+        }
 
     async def generate_structured(
         self,
@@ -110,27 +167,84 @@ class OpenAIProvider(LLMProvider):
         output_model: Type[T],
         config: Optional[LLMConfig] = None
     ) -> T:
-        """Generate a response with structured output using function calling"""
+        """Generate a response with structured output using a forced tool call"""
         openai_messages = self._prepare_messages(messages)
         api_config = self._prepare_config(config)
         
-        # Create function definition from Pydantic model
-        schema = output_model.model_json_schema()
-        function_def = {
-            "name": "output_structured_data",
-            "description": f"Output data in {output_model.__name__} format",
-            "parameters": schema
-        }
-        
-        response = await self.client.chat.completions.create(
-            messages=openai_messages,
-            functions=[function_def],
-            function_call={"name": "output_structured_data"},
-            **api_config
+        response = await self._create_completion(
+            openai_messages,
+            api_config,
+            **self._structured_output_tool(output_model)
         )
         
         try:
-            function_args = response.choices[0].message.function_call.arguments
+            function_args = response.choices[0].message.tool_calls[0].function.arguments
             return output_model.model_validate_json(function_args)
         except Exception as e:
-            raise ValueError(f"Failed to parse structured output: {e}") 
\ No newline at end of file
+            raise ValueError(f"Failed to parse structured output: {e}")
+
+    async def generate_structured_stream(
+        self,
+        messages: List[LLMMessage],
+        output_model: Type[T],
+        config: Optional[LLMConfig] = None,
+        stream_fields: Sequence[str] = ()
+    ) -> AsyncGenerator[StructuredChunk, None]:
+        """Generate structured output, parsing the forced tool call's arguments as they stream"""
+        openai_messages = self._prepare_messages(messages)
+        api_config = self._prepare_config(config)
+        
+        async with AsyncExitStack() as stack:
+            if self.governor:
+                await stack.enter_async_context(
+                    self.governor.acquire(self._estimate_tokens(openai_messages, api_config))
+                )
+            stream = await self.client.chat.completions.create(
+                messages=openai_messages,
+                stream=True,
+                **self._structured_output_tool(output_model),
+                **api_config
+            )
+
+            async def arguments():
+                async for chunk in stream:
+                    tool_calls = chunk.choices[0].delta.tool_calls if chunk.choices else None
+                    if tool_calls and tool_calls[0].function and tool_calls[0].function.arguments:
+                        yield tool_calls[0].function.arguments
+
+            async for part in stream_structured(arguments(), output_model, stream_fields):
+                yield part
+
+    async def generate_with_tools(
+        self,
+        messages: List[LLMMessage],
+        tools: List[Dict[str, Any]],
+        config: Optional[LLMConfig] = None
+    ) -> LLMResponse:
+        """Generate a response that may request several tool calls at once"""
+        openai_messages = self._prepare_messages(messages)
+        api_config = self._prepare_config(config)
+        
+        response = await self._create_completion(
+            openai_messages,
+            api_config,
+            tools=tools,
+            tool_choice="auto"
+        )
+        
+        choice = response.choices[0]
+        tool_calls = []
+        for call in choice.message.tool_calls or []:
+            try:
+                arguments = json.loads(call.function.arguments or "{}")
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid arguments for tool call {call.function.name}: {e}")
+            tool_calls.append(LLMToolCall(id=call.id, name=call.function.name, arguments=arguments))
+        
+        return LLMResponse(
+            content=choice.message.content or "",
+            raw_response=response.model_dump(),
+            finish_reason=choice.finish_reason,
+            usage=response.usage.model_dump() if response.usage else None,
+            tool_calls=tool_calls
+        ) 
\ No newline at end of file
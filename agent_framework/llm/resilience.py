@@ -0,0 +1,201 @@
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Type, TypeVar
+
+from .base import LLMProvider, T
+from .delegating import DelegatingProvider
+from .models import LLMMessage, LLMResponse, LLMConfig
+
+R = TypeVar("R")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+RETRYABLE_ERROR_NAMES = frozenset({"APIConnectionError", "APITimeoutError"})
+
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_call_deadline", default=None)
+
+@contextmanager
+def call_deadline(seconds: float) -> Iterator[None]:
+    """Limit the total time, retries and hedges included, of LLM calls made within the block"""
+    token = _deadline.set(seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def is_retryable(error: BaseException) -> bool:
+    """Check whether an error is transient, so the same request may succeed if retried"""
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    if status in RETRYABLE_STATUS_CODES:
+        return True
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+class LatencyHistogram:
+    """Latencies of recent successful calls, used to pick the hedge delay"""
+
+    def __init__(self, window: int = 512):
+        self._samples: deque = deque(maxlen=window)
+
+    def record(self, latency: float) -> None:
+        """Add a latency sample in seconds"""
+        self._samples.append(latency)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Get the latency below which the given fraction of samples fall"""
+        if not self._samples:
+            return None
+        ordered: List[float] = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+        return ordered[index]
+
+@dataclass
+class ResilienceStats:
+    """Counters describing retries, hedges and deadlines"""
+    calls: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    deadline_exceeded: int = 0
+    failures: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Get the counters as a plain dict"""
+        return asdict(self)
+
+class ResilientProvider(DelegatingProvider):
+    """Retries, hedges and time-limits calls to a wrapped provider
+
+    Retryable errors (rate limits, server errors, timeouts and connection
+    failures) are retried with full-jitter exponential backoff. With
+    hedging on, a second identical request is started once the first has
+    run longer than the ``hedge_percentile`` latency of recent calls; the
+    first response wins and the other request is cancelled. Hedging only
+    starts once ``min_samples`` latencies have been recorded. A deadline
+    bounds each call including its retries. Streaming calls are passed
+    through unchanged.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        max_retries: int = 2,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        min_hedge_delay: float = 0.05,
+        min_samples: int = 20,
+        deadline: Optional[float] = None,
+        histogram: Optional[LatencyHistogram] = None
+    ):
+        super().__init__(provider)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self.deadline = deadline
+        self.histogram = histogram or LatencyHistogram()
+        self.stats = ResilienceStats()
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.hedge or len(self.histogram) < self.min_samples:
+            return None
+        return max(self.min_hedge_delay, self.histogram.percentile(self.hedge_percentile) or 0.0)
+
+    async def _timed(self, call: Callable[[], Awaitable[R]]) -> R:
+        started = time.monotonic()
+        result = await call()
+        self.histogram.record(time.monotonic() - started)
+        return result
+
+    async def _attempt(self, call: Callable[[], Awaitable[R]]) -> R:
+        """Make one attempt, hedged with a second request if the first runs long"""
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is None:
+            return await self._timed(call)
+
+        primary = asyncio.ensure_future(self._timed(call))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+            if done:
+                return primary.result()
+            self.stats.hedges += 1
+            pending.add(asyncio.ensure_future(self._timed(call)))
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.stats.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call(self, call: Callable[[], Awaitable[R]]) -> R:
+        self.stats.calls += 1
+
+        async def with_retries() -> R:
+            attempt = 0
+            while True:
+                try:
+                    return await self._attempt(call)
+                except Exception as e:
+                    if not is_retryable(e) or attempt >= self.max_retries:
+                        self.stats.failures += 1
+                        raise
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                self.stats.retries += 1
+
+        deadline = _deadline.get() or self.deadline
+        if deadline is None:
+            return await with_retries()
+        try:
+            return await asyncio.wait_for(with_retries(), timeout=deadline)
+        except asyncio.TimeoutError:
+            self.stats.deadline_exceeded += 1
+            raise
+
+    async def generate(
+        self,
+        messages: List[LLMMessage],
+        config: Optional[LLMConfig] = None
+    ) -> LLMResponse:
+        return await self._call(lambda: self.provider.generate(messages, config))
+
+    async def generate_structured(
+        self,
+        messages: List[LLMMessage],
+        output_model: Type[T],
+        config: Optional[LLMConfig] = None
+    ) -> T:
+        return await self._call(lambda: self.provider.generate_structured(messages, output_model, config))
+
+    async def generate_with_tools(
+        self,
+        messages: List[LLMMessage],
+        tools: List[Dict[str, Any]],
+        config: Optional[LLMConfig] = None
+    ) -> LLMResponse:
+        return await self._call(lambda: self.provider.generate_with_tools(messages, tools, config))
@@ -0,0 +1,51 @@
+from typing import Any, List, Optional, Type
+
+from .base import LLMProvider, T
+from .delegating import DelegatingProvider
+from .models import LLMMessage, LLMResponse, LLMConfig
+from ..utils.hashing import stable_hash
+from ..utils.singleflight import SingleFlight
+
+class SingleFlightProvider(DelegatingProvider):
+    """Coalesces identical concurrent requests into a single LLM call
+
+    Requests are identical when their messages, effective config and (for
+    structured output) output schema match. Every caller gets the one
+    response, so concurrent callers of a high temperature request see the
+    same sample rather than independent ones. Streaming requests are not
+    coalesced.
+    """
+
+    def __init__(self, provider: LLMProvider, single_flight: Optional[SingleFlight] = None):
+        super().__init__(provider)
+        self.single_flight = single_flight or SingleFlight()
+
+    def _key(self, method: str, messages: List[LLMMessage], config: Optional[LLMConfig], schema: Any = None) -> str:
+        return stable_hash([
+            method,
+            [message.model_dump() for message in messages],
+            (config or self.config).model_dump(),
+            schema
+        ])
+
+    async def generate(
+        self,
+        messages: List[LLMMessage],
+        config: Optional[LLMConfig] = None
+    ) -> LLMResponse:
+        return await self.single_flight.do(
+            self._key("generate", messages, config),
+            lambda: self.provider.generate(messages, config)
+        )
+
+    async def generate_structured(
+        self,
+        messages: List[LLMMessage],
+        output_model: Type[T],
+        config: Optional[LLMConfig] = None
+    ) -> T:
+        schema = [f"{output_model.__module__}.{output_model.__qualname__}", output_model.model_json_schema()]
+        return await self.single_flight.do(
+            self._key("generate_structured", messages, config, schema),
+            lambda: self.provider.generate_structured(messages, output_model, config)
+        )
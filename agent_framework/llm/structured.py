@@ -0,0 +1,52 @@
+from functools import lru_cache
+from typing import Any, AsyncGenerator, AsyncIterable, Optional, Sequence, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+
+from .models import StructuredChunk
+from ..utils.json_stream import JsonStreamParser, JsonStringDelta
+
+@lru_cache(maxsize=256)
+def _field_adapter(output_model: Type[BaseModel], field_name: str, item: bool) -> Optional[TypeAdapter]:
+    """Get a validator for a model field, or for the items of a list field"""
+    field = output_model.model_fields.get(field_name)
+    if field is None:
+        return None
+    annotation = field.annotation
+    if item:
+        if get_origin(annotation) not in (list, tuple) or not get_args(annotation):
+            return None
+        annotation = get_args(annotation)[0]
+    return TypeAdapter(annotation)
+
+def _validate_part(output_model: Type[BaseModel], path: Tuple[Union[str, int], ...], value: Any) -> Any:
+    adapter = _field_adapter(output_model, path[0], len(path) > 1)
+    return adapter.validate_python(value) if adapter else value
+
+async def stream_structured(
+    chunks: AsyncIterable[str],
+    output_model: Type[BaseModel],
+    stream_fields: Sequence[str] = ()
+) -> AsyncGenerator[StructuredChunk, None]:
+    """Parse streamed JSON text into validated fields of ``output_model`` as they complete
+
+    Top-level fields are yielded once complete, and so are the items of
+    list fields, each validated against the field's type. Text of the
+    string fields named in ``stream_fields`` is yielded as it arrives. The
+    last chunk holds the complete validated model.
+    """
+    parser = JsonStreamParser(max_depth=2, stream_strings=[(name,) for name in stream_fields])
+    try:
+        async for text in chunks:
+            for event in parser.feed(text):
+                if isinstance(event, JsonStringDelta):
+                    yield StructuredChunk(path=event.path, text=event.text)
+                elif event.path and isinstance(event.path[0], str):
+                    yield StructuredChunk(
+                        path=event.path,
+                        value=_validate_part(output_model, event.path, event.value)
+                    )
+        yield StructuredChunk(result=output_model.model_validate(parser.result()))
+    except ValueError as e:
+        # JSON and validation errors are both ValueErrors
+        raise ValueError(f"Failed to parse structured output: {e}")
@@ -1,4 +1,7 @@
+import warnings
 from datetime import datetime
+from collections.abc import Sequence
+from functools import cached_property
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 from enum import Enum
@@ -59,38 +62,133 @@ class TaskAnalysis(BaseModel):
         description="Chain of thought reasoning that led to this plan"
     )
 
-@dataclass
+class SequenceView(Sequence):
+    """Read-only view of the first ``length`` items of a list, without copying it
+
+    Lists that are only ever appended to, like a run's message history,
+    look the same through the view as they did when it was created.
+    """
+
+    def __init__(self, items: List[Any], length: Optional[int] = None):
+        self._items = items
+        self._length = len(items) if length is None else length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._items[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("SequenceView index out of range")
+        return self._items[index]
+
+    def __repr__(self) -> str:
+        return f"SequenceView({list(self)!r})"
+
+@dataclass(init=False)
 class ToolContext:
-    """Context object passed to tool hooks"""
+    """Context object passed to tool hooks
+
+    Created once per step and shared by all of its hooks. The message
+    history, available tools and previous steps are read-only views of the
+    run as it was when the step started, and the previous_* lists are only
+    built from ``steps`` when a hook first reads them, so steps whose hooks
+    don't look at them cost nothing extra however long the run gets.
+
+    Passing ``previous_tools``, ``previous_results`` or ``previous_errors``
+    is deprecated; pass ``steps`` instead.
+    """
+    task: str = field(metadata={"description": "The current task being executed"})
+    tool_name: str = field(metadata={"description": "Name of the tool being executed"})
+    inputs: Dict[str, Any] = field(metadata={"description": "Input parameters for the tool"})
+    available_tools: Sequence[Dict[str, Any]] = field(
+        repr=False,
+        metadata={"description": "Tools available to the agent, in OpenAI function calling format"}
+    )
+    message_history: Sequence[Dict[str, Any]] = field(
+        repr=False,
+        metadata={"description": "History of messages and tool executions before this step"}
+    )
+    agent_id: str = field(metadata={"description": "ID of the agent executing the tool"})
+    task_id: str = field(metadata={"description": "ID of the current task"})
+    start_time: datetime = field(metadata={"description": "When the task started"})
+    metadata: Dict[str, Any] = field(metadata={"description": "Additional metadata from agent configuration"})
+    plan: Optional[TaskAnalysis] = field(
+        default=None,
+        repr=False,
+        metadata={"description": "The agent's planning analysis"}
+    )
+    steps: Sequence["ExecutionStep"] = field(
+        default=(),
+        repr=False,
+        metadata={"description": "Steps of the task executed before this one"}
+    )
+
     def __init__(
         self,
         task: str,
         tool_name: str,
         inputs: Dict[str, Any],
-        available_tools: List[Dict[str, Any]],
-        previous_tools: List[str],
-        previous_results: List[Any],
-        previous_errors: List[Any],
-        message_history: List[Dict[str, Any]],
+        available_tools: Sequence[Dict[str, Any]],
+        message_history: Sequence[Dict[str, Any]],
         agent_id: str,
         task_id: str,
         start_time: datetime,
         metadata: Dict[str, Any],
-        plan: Optional[TaskAnalysis] = None
+        plan: Optional[TaskAnalysis] = None,
+        steps: Sequence["ExecutionStep"] = (),
+        *,
+        previous_tools: Optional[List[str]] = None,
+        previous_results: Optional[List[Any]] = None,
+        previous_errors: Optional[List[Any]] = None
     ):
         self.task = task
         self.tool_name = tool_name
         self.inputs = inputs
         self.available_tools = available_tools
-        self.previous_tools = previous_tools
-        self.previous_results = previous_results
-        self.previous_errors = previous_errors
         self.message_history = message_history
         self.agent_id = agent_id
         self.task_id = task_id
         self.start_time = start_time
         self.metadata = metadata
-        self.plan = plan  # The agent's planning analysis
+        self.plan = plan
+        self.steps = steps
+
+        previous = {
+            name: value
+            for name, value in (
+                ("previous_tools", previous_tools),
+                ("previous_results", previous_results),
+                ("previous_errors", previous_errors)
+            )
+            if value is not None
+        }
+        if previous:
+            warnings.warn(
+                f"Passing {', '.join(previous)} to ToolContext is deprecated; pass steps instead",
+                DeprecationWarning,
+                stacklevel=2
+            )
+            # Take the place of the lists the cached properties would build
+            self.__dict__.update((name, list(value)) for name, value in previous.items())
+
+    @cached_property
+    def previous_tools(self) -> List[str]:
+        """Names of the tools executed earlier in the task"""
+        return [step.tool_name for step in self.steps]
+
+    @cached_property
+    def previous_results(self) -> List[Any]:
+        """Results of earlier tool executions"""
+        return [step.result for step in self.steps if step.result]
+
+    @cached_property
+    def previous_errors(self) -> List[Any]:
+        """Errors from earlier tool executions"""
+        return [step.error for step in self.steps if step.error]
 
 @dataclass
 class Tool:
@@ -245,4 +343,84 @@ class AgentConfig:
     metadata: Dict[str, Any] = field(
         default_factory=dict,
         metadata={"description": "Additional configuration metadata"}
+    )
+    max_concurrent_steps: Optional[int] = field(
+        default=None,
+        metadata={"description": "Maximum number of independent plan steps to execute at once (None for no limit)"}
+    )
+    speculative_prefetch: bool = field(
+        default=False,
+        metadata={"description": "Start likely first tool calls while the planner is running"}
+    )
+    execution_mode: str = field(
+        default="plan",
+        metadata={"description": "How tasks are executed: 'plan' (plan, then run steps) or 'tool_calls' (native tool-calling loop)"}
+    )
+    max_tool_turns: int = field(
+        default=8,
+        metadata={"description": "Maximum LLM turns in the tool-calling loop"}
+    )
+    stream_plan: bool = field(
+        default=False,
+        metadata={"description": "Start plan steps as the planner streams them instead of after the whole plan"}
+    )
+    tool_catalog_max_tokens: Optional[int] = field(
+        default=None,
+        metadata={"description": "Token budget for the tool catalog in planning prompts (None for no limit)"}
+    )
+    tool_shortlist_size: Optional[int] = field(
+        default=None,
+        metadata={"description": "Number of most relevant tools offered to the LLM per task (None for all tools)"}
+    )
+    validate_tool_inputs: bool = field(
+        default=True,
+        metadata={"description": "Check tool inputs against the tool's input schema before calling it"}
+    )
+    tool_output_sample_rate: float = field(
+        default=0.0,
+        metadata={"description": "Fraction of tool results checked against the tool's output schema"}
+    )
+    history_max_entries: Optional[int] = field(
+        default=None,
+        metadata={"description": "Maximum number of entries kept in a run's message history (None for no limit)"}
+    )
+    history_max_tokens: Optional[int] = field(
+        default=None,
+        metadata={"description": "Token budget for a run's message history (None for no limit)"}
+    )
+    history_inline_bytes: Optional[int] = field(
+        default=None,
+        metadata={"description": "Size above which tool inputs and results in the history are moved to disk (None to keep all inline)"}
+    )
+    history_blob_dir: Optional[str] = field(
+        default=None,
+        metadata={"description": "Directory for history payloads moved to disk (None for a temporary directory)"}
+    )
+    plan_repair_attempts: int = field(
+        default=1,
+        metadata={"description": "Re-planning attempts for a plan that fails validation before the run fails"}
+    )
+    max_plan_cost: Optional[float] = field(
+        default=None,
+        metadata={"description": "Budget for a plan's estimated cost; plans over it are rejected before running (None for no limit)"}
+    )
+    max_plan_latency: Optional[float] = field(
+        default=None,
+        metadata={"description": "Budget in seconds for a plan's estimated latency (None for no limit)"}
+    )
+    step_retries: int = field(
+        default=0,
+        metadata={"description": "Retries of a plan step whose tool execution failed"}
+    )
+    step_retry_delay: float = field(
+        default=1.0,
+        metadata={"description": "Base delay in seconds between step retries, doubled on each attempt"}
+    )
+    recover_failed_steps: bool = field(
+        default=False,
+        metadata={"description": "Re-plan the remaining work when steps fail, keeping completed results"}
+    )
+    max_replans: int = field(
+        default=1,
+        metadata={"description": "Re-plans allowed per run when recovering from failed steps"}
     )
\ No newline at end of file
@@ -0,0 +1,13 @@
+"""Planning Package"""
+
+from .bindings import BindingCompiler, PlanBindings
+from .cache import PlanCache, validate_plan_tools
+from .catalog import ToolCatalog
+from .planners import Planner, LLMPlanner, StaticPlanner, PlannerChain, PipelineStep
+from .validation import PlanValidator, PlanEstimate, ToolMetrics
+
+__all__ = [
+    'PlanCache', 'validate_plan_tools', 'Planner', 'LLMPlanner', 'StaticPlanner',
+    'PlannerChain', 'PipelineStep', 'ToolCatalog', 'BindingCompiler', 'PlanBindings',
+    'PlanValidator', 'PlanEstimate', 'ToolMetrics'
+]
@@ -0,0 +1,261 @@
+"""Plans compiled into explicit dataflow bindings between steps"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+from ..exceptions import BindingError, ToolNotFoundError
+from ..execution import _schema_refs
+from ..state import AgentState
+from ..tools.validation import compile_schema
+from ..utils.hashing import stable_hash
+from ..utils.tool_registry import ToolRegistry
+
+MISSING = object()
+
+# Input mapping value standing for the task text, so it is never read as a reference
+TASK_PLACEHOLDER = "{task}"
+
+@dataclass(frozen=True)
+class Binding(ABC):
+    """Where one step input comes from"""
+
+    @abstractmethod
+    def resolve(self, results: Mapping[int, Any], task: str, state: AgentState) -> Any:
+        """Get the input value, or MISSING to leave the input out"""
+        pass
+
+    @property
+    def step(self) -> Optional[int]:
+        """Index of the step producing the value, if any"""
+        return None
+
+@dataclass(frozen=True)
+class StepOutput(Binding):
+    """The result of an earlier step, or a field within it"""
+    producer: int
+    path: Tuple[str, ...] = ()
+
+    @property
+    def step(self) -> Optional[int]:
+        return self.producer
+
+    def resolve(self, results: Mapping[int, Any], task: str, state: AgentState) -> Any:
+        value = results.get(self.producer, MISSING)
+        for key in self.path:
+            # A field of a result that isn't an object is left out
+            if not isinstance(value, dict):
+                return MISSING
+            value = value.get(key)
+        return value
+
+@dataclass(frozen=True)
+class LiteralValue(Binding):
+    """A value written into the plan"""
+    value: Any
+
+    def resolve(self, results: Mapping[int, Any], task: str, state: AgentState) -> Any:
+        return self.value
+
+@dataclass(frozen=True)
+class TaskText(Binding):
+    """The task text, mapped with "{task}" in an input mapping"""
+
+    def resolve(self, results: Mapping[int, Any], task: str, state: AgentState) -> Any:
+        return task
+
+@dataclass(frozen=True)
+class StateValue(Binding):
+    """A run state variable, or the task text for string inputs when it isn't set"""
+    name: str
+    task_fallback: bool = False
+
+    def resolve(self, results: Mapping[int, Any], task: str, state: AgentState) -> Any:
+        if state.has_variable(self.name):
+            return state.get_variable(self.name)
+        return task if self.task_fallback else MISSING
+
+@dataclass(frozen=True)
+class StepBindings:
+    """Compiled bindings for one plan step"""
+    index: int
+    tool: str
+    inputs: Dict[str, Binding] = field(default_factory=dict)
+    dependencies: frozenset = frozenset()
+
+    def resolve(self, results: Mapping[int, Any], task: str, state: AgentState) -> Dict[str, Any]:
+        """Get the step's inputs, given the results of the steps completed so far"""
+        inputs = {}
+        for name, binding in self.inputs.items():
+            value = binding.resolve(results, task, state)
+            if value is not MISSING:
+                inputs[name] = value
+        return inputs
+
+class PlanBindings(Sequence):
+    """Bindings for each step of a plan, compiled in plan order
+
+    Steps can be added one at a time as a plan streams in, since a step only
+    ever binds to steps before it.
+    """
+
+    def __init__(self, compiler: "BindingCompiler"):
+        self._compiler = compiler
+        self.steps: List[Dict[str, Any]] = []
+        self._bindings: List[StepBindings] = []
+
+    def add(self, step: Dict[str, Any]) -> StepBindings:
+        """Compile the next step, raising BindingError if any of its inputs can't be bound"""
+        bindings = self._compiler.compile_step(step, self.steps)
+        self.steps.append(step)
+        self._bindings.append(bindings)
+        return bindings
+
+    def __len__(self) -> int:
+        return len(self._bindings)
+
+    def __getitem__(self, index):
+        return self._bindings[index]
+
+class BindingCompiler:
+    """Compiles plan steps into bindings against a tool registry
+
+    Explicit ``input_mapping`` entries bind to the latest earlier step of
+    the named tool ("event_finder" or "event_finder.events"), to the task
+    text ("{task}"), or are taken as literal values when they don't start
+    with a tool name. Steps without a mapping
+    bind each input by schema: a property named after an earlier tool, a
+    $ref to an earlier tool's output type (or else the earliest earlier
+    result), a run state variable, and finally the task text for required
+    string inputs, or for all string inputs when none is bound to an
+    earlier step. Compiled plans are cached
+    until the registry changes, so cached plans are only compiled once.
+    """
+
+    def __init__(self, tool_registry: ToolRegistry, max_plans: int = 256):
+        self.tool_registry = tool_registry
+        self.max_plans = max_plans
+        self._plans: "OrderedDict[str, PlanBindings]" = OrderedDict()
+        self._version: Optional[int] = None
+
+    def compile(self, steps: List[Dict[str, Any]]) -> PlanBindings:
+        """Compile a whole plan, raising BindingError before any step runs if it can't be bound"""
+        if self._version != self.tool_registry.version:
+            self._plans.clear()
+            self._version = self.tool_registry.version
+        key = stable_hash(steps)
+        plan = self._plans.get(key)
+        if plan is not None:
+            self._plans.move_to_end(key)
+            return plan
+
+        plan = PlanBindings(self)
+        for step in steps:
+            plan.add(step)
+        self._plans[key] = plan
+        if len(self._plans) > self.max_plans:
+            self._plans.popitem(last=False)
+        return plan
+
+    def compile_step(self, step: Dict[str, Any], previous_steps: List[Dict[str, Any]]) -> StepBindings:
+        """Compile one step, given the steps before it"""
+        index = len(previous_steps)
+        tool = self.tool_registry.get_tool(step["tool"])
+        if not tool:
+            raise ToolNotFoundError(f"Tool {step['tool']} not found")
+
+        latest: Dict[str, int] = {}
+        for position, previous in enumerate(previous_steps):
+            latest[previous["tool"]] = position
+
+        input_mapping = step.get("input_mapping") or {}
+        if input_mapping:
+            inputs = self._bind_mapping(index, tool.name, input_mapping, latest)
+        else:
+            inputs = self._bind_schema(tool.input_schema, previous_steps, latest)
+        self._check(index, tool.name, tool.input_schema, inputs)
+
+        dependencies: Set[int] = {binding.step for binding in inputs.values() if binding.step is not None}
+        # Repeated uses of the same tool always run in plan order
+        if tool.name in latest:
+            dependencies.add(latest[tool.name])
+        return StepBindings(index=index, tool=tool.name, inputs=inputs, dependencies=frozenset(dependencies))
+
+    def _bind_mapping(
+        self,
+        index: int,
+        tool_name: str,
+        input_mapping: Dict[str, Any],
+        latest: Dict[str, int]
+    ) -> Dict[str, Binding]:
+        inputs: Dict[str, Binding] = {}
+        for input_name, value_ref in input_mapping.items():
+            if not isinstance(value_ref, str):
+                inputs[input_name] = LiteralValue(value_ref)
+                continue
+            if value_ref == TASK_PLACEHOLDER:
+                inputs[input_name] = TaskText()
+                continue
+            producer, *path = value_ref.split(".")
+            if producer in latest:
+                inputs[input_name] = StepOutput(latest[producer], tuple(path))
+            elif self.tool_registry.get_tool(producer):
+                raise BindingError(
+                    index, tool_name, f"input {input_name!r} refers to {producer!r}, which no earlier step runs"
+                )
+            else:
+                # Not a reference, even with dots in it, like "3.5" or "St. Louis"
+                inputs[input_name] = LiteralValue(value_ref)
+        return inputs
+
+    def _bind_schema(
+        self,
+        input_schema: Dict[str, Any],
+        previous_steps: List[Dict[str, Any]],
+        latest: Dict[str, int]
+    ) -> Dict[str, Binding]:
+        required = set(input_schema.get("required", []))
+        properties = input_schema.get("properties", {})
+        inputs: Dict[str, Binding] = {}
+        text_inputs: List[str] = []
+        for input_name, property_schema in properties.items():
+            # The same $refs, including those under allOf/anyOf/oneOf, as the scheduler's step_dependencies
+            ref_names = _schema_refs(property_schema)
+            if ref_names:
+                producers = [
+                    position for position, previous in enumerate(previous_steps)
+                    if (producer := self.tool_registry.get_tool(previous["tool"]))
+                    and producer.output_schema.get("title") in ref_names
+                ]
+                if producers or previous_steps:
+                    inputs[input_name] = StepOutput(producers[-1] if producers else 0)
+            elif input_name in latest:
+                inputs[input_name] = StepOutput(latest[input_name])
+            elif property_schema.get("type") == "string":
+                text_inputs.append(input_name)
+            else:
+                inputs[input_name] = StateValue(input_name)
+
+        bound_to_steps = any(isinstance(binding, StepOutput) for binding in inputs.values())
+        for input_name in text_inputs:
+            inputs[input_name] = StateValue(input_name, task_fallback=input_name in required or not bound_to_steps)
+        return inputs
+
+    def _check(self, index: int, tool_name: str, input_schema: Dict[str, Any], inputs: Dict[str, Binding]) -> None:
+        """Check required inputs are bound and literal values match their schemas"""
+        properties = input_schema.get("properties", {})
+        unbound = [name for name in input_schema.get("required", []) if name not in inputs]
+        if unbound:
+            raise BindingError(index, tool_name, f"required inputs {unbound} are not bound")
+        for input_name, binding in inputs.items():
+            property_schema = properties.get(input_name)
+            if isinstance(binding, LiteralValue) and property_schema:
+                # Definitions live at the root of the input schema
+                schema = {**property_schema, "$defs": input_schema.get("$defs", {})}
+                violations = compile_schema(schema).validate(binding.value)
+                if violations:
+                    details = "; ".join(
+                        f"{input_name}{'' if violation.path[:1] in ('', '[') else '.'}{violation.path}: {violation.message}"
+                        for violation in violations
+                    )
+                    raise BindingError(index, tool_name, f"invalid literal input {details}")
@@ -0,0 +1,123 @@
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from ..models import TaskAnalysis
+from .bindings import TASK_PLACEHOLDER
+from ..utils.cache import CacheStore, CacheStats, InMemoryCache
+from ..utils.hashing import stable_hash
+from ..utils.tool_registry import ToolRegistry
+
+if TYPE_CHECKING:
+    from ..agent import Agent
+
+def _slot_placeholder(name: str) -> str:
+    return "{" + name + "}"
+
+def validate_plan_tools(plan: TaskAnalysis, tool_registry: ToolRegistry) -> List[str]:
+    """Check that a plan only uses registered tools and known tool inputs
+
+    Returns a list of problems, which is empty when the plan can be executed
+    against the registry.
+    """
+    errors = []
+    for index, step in enumerate(plan.execution_plan):
+        tool = tool_registry.get_tool(step.get("tool", ""))
+        if not tool:
+            errors.append(f"Step {index}: tool {step.get('tool')!r} is not registered")
+            continue
+        properties = tool.input_schema.get("properties", {})
+        for input_name in (step.get("input_mapping") or {}):
+            if properties and input_name not in properties:
+                errors.append(f"Step {index}: tool {tool.name!r} has no input {input_name!r}")
+    return errors
+
+class PlanCache:
+    """Cache of execution plans so repeated tasks skip the planning LLM call
+
+    Plans are keyed on the agent class, the task template produced by
+    ``Agent._plan_template`` and the fingerprint of the agent's tool
+    registry. Templated tasks (for example agents whose task is just a
+    location) share one cached plan, with slot values substituted back into
+    the plan's input mappings on reuse. Cached plans are re-validated
+    against the registry before they are returned.
+    """
+
+    def __init__(self, store: Optional[CacheStore] = None, ttl: Optional[float] = 3600):
+        self.store = store if store is not None else InMemoryCache(max_size=1024)
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    def _key(self, agent: "Agent", template: str) -> str:
+        agent_class = type(agent)
+        return stable_hash([
+            f"{agent_class.__module__}.{agent_class.__qualname__}",
+            template,
+            agent.tool_registry.fingerprint()
+        ])
+
+    def get(self, agent: "Agent", task: str) -> Optional[TaskAnalysis]:
+        """Get a cached plan for the task, or None on a miss"""
+        template, slots = agent._plan_template(task)
+        key = self._key(agent, template)
+        cached = self.store.get(key)
+        if cached is None:
+            self.stats.misses += 1
+            return None
+
+        placeholders = {_slot_placeholder(name): value for name, value in slots.items()}
+        plan = TaskAnalysis.model_validate(cached)
+        for step in plan.execution_plan:
+            if step.get("input_mapping"):
+                step["input_mapping"] = {
+                    input_name: placeholders.get(value_ref, value_ref) if isinstance(value_ref, str) else value_ref
+                    for input_name, value_ref in step["input_mapping"].items()
+                }
+
+        if validate_plan_tools(plan, agent.tool_registry):
+            self.store.delete(key)
+            self.stats.invalidations += 1
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return plan
+
+    def set(self, agent: "Agent", task: str, plan: TaskAnalysis) -> None:
+        """Cache a plan for the task
+
+        Plans for templated tasks are only cached when every literal input
+        value is one of the template's slot values, since any other literal
+        was extracted from this particular task and would be wrong for the
+        next one.
+        """
+        if validate_plan_tools(plan, agent.tool_registry):
+            return
+
+        template, slots = agent._plan_template(task)
+        slot_names = {value.strip().lower(): name for name, value in slots.items()}
+        data: Dict[str, Any] = plan.model_dump()
+        for step in data["execution_plan"]:
+            input_mapping = step.get("input_mapping") or {}
+            for input_name, value_ref in input_mapping.items():
+                if not isinstance(value_ref, str) or not slots or value_ref == TASK_PLACEHOLDER:
+                    continue
+                if value_ref.strip().lower() in slot_names:
+                    input_mapping[input_name] = _slot_placeholder(slot_names[value_ref.strip().lower()])
+                elif not agent.tool_registry.get_tool(value_ref.split(".")[0]):
+                    return
+
+        self.store.set(self._key(agent, template), data, ttl=self.ttl)
+
+    def invalidate(self, agent: "Agent", task: str) -> None:
+        """Remove the cached plan for the task, such as one that failed validation"""
+        template, _ = agent._plan_template(task)
+        key = self._key(agent, template)
+        if self.store.get(key) is not None:
+            self.store.delete(key)
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Remove all cached plans"""
+        self.store.clear()
+
+    def close(self) -> None:
+        """Close the underlying store"""
+        self.store.close()
@@ -0,0 +1,147 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+from ..models import Tool
+from ..utils.tokens import count_tokens
+from ..utils.tool_registry import ToolRegistry
+
+@dataclass(frozen=True)
+class CatalogDetail:
+    """How much of each tool's metadata a rendered catalog includes"""
+    output_depth: int
+    tags: bool = True
+    input_descriptions: bool = True
+    description_sentences: Optional[int] = None
+
+# From most to least detailed; each level drops the detail least useful for planning
+DETAIL_LEVELS: Tuple[CatalogDetail, ...] = (
+    CatalogDetail(output_depth=3),
+    CatalogDetail(output_depth=1),
+    CatalogDetail(output_depth=1, tags=False),
+    CatalogDetail(output_depth=1, tags=False, input_descriptions=False),
+    CatalogDetail(output_depth=0, tags=False, input_descriptions=False),
+    CatalogDetail(output_depth=0, tags=False, input_descriptions=False, description_sentences=1),
+)
+
+def _resolve(schema: Dict[str, Any], definitions: Dict[str, Any]) -> Dict[str, Any]:
+    ref = schema.get("$ref")
+    if isinstance(ref, str):
+        return definitions.get(ref.split("/")[-1], {})
+    if len(schema.get("allOf", [])) == 1:
+        return _resolve(schema["allOf"][0], definitions)
+    return schema
+
+def type_digest(schema: Dict[str, Any], definitions: Dict[str, Any], depth: int) -> str:
+    """Render a JSON schema as a compact type, expanding nested objects ``depth`` levels deep"""
+    schema = _resolve(schema, definitions)
+    if "enum" in schema:
+        return "|".join(str(value) for value in schema["enum"])
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            return "|".join(type_digest(option, definitions, depth) for option in schema[key])
+
+    schema_type = schema.get("type", "any")
+    if isinstance(schema_type, list):
+        return "|".join(schema_type)
+    if schema_type == "array":
+        items = schema.get("items")
+        return f"array[{type_digest(items, definitions, depth)}]" if isinstance(items, dict) and items else "array"
+    if schema_type == "object" and depth > 0 and schema.get("properties"):
+        return "{" + properties_digest(schema, definitions, depth - 1) + "}"
+    return schema_type
+
+def properties_digest(
+    schema: Dict[str, Any],
+    definitions: Dict[str, Any],
+    depth: int,
+    descriptions: bool = False
+) -> str:
+    """Render an object schema's properties as ``name: type`` pairs, marking required ones with *"""
+    required = set(schema.get("required", []))
+    parts = []
+    for name, property_schema in schema.get("properties", {}).items():
+        part = f"{name}{'*' if name in required else ''}: {type_digest(property_schema, definitions, depth)}"
+        description = property_schema.get("description") or _resolve(property_schema, definitions).get("description")
+        if descriptions and description:
+            part += f" ({description})"
+        parts.append(part)
+    return "; ".join(parts)
+
+def _sentences(text: str, count: Optional[int]) -> str:
+    if count is None:
+        return text
+    return " ".join(re.split(r"(?<=[.!?])\s+", text.strip())[:count])
+
+def describe_tool(tool: Tool, detail: CatalogDetail) -> str:
+    """Render one tool's catalog entry"""
+    lines = [f"Tool: {tool.name}", f"Description: {_sentences(tool.description, detail.description_sentences)}"]
+    if detail.tags and tool.tags:
+        lines.append(f"Tags: {', '.join(tool.tags)}")
+
+    input_definitions = tool.input_schema.get("$defs") or tool.input_schema.get("definitions") or {}
+    inputs = properties_digest(tool.input_schema, input_definitions, 1, descriptions=detail.input_descriptions)
+    lines.append(f"Inputs: {inputs or 'none'}")
+
+    if detail.output_depth > 0 and tool.output_schema.get("properties"):
+        output_definitions = tool.output_schema.get("$defs") or tool.output_schema.get("definitions") or {}
+        lines.append(f"Output: {properties_digest(tool.output_schema, output_definitions, detail.output_depth - 1)}")
+    return "\n".join(lines) + "\n"
+
+class ToolCatalog:
+    """Description of a registry's tools for planning prompts
+
+    Schemas are rendered as compact digests (property names, types and
+    required markers) instead of raw JSON. With a ``max_tokens`` budget,
+    the most detailed rendering that fits is used; if even the least
+    detailed one doesn't fit, it is used anyway, since every tool must stay
+    plannable. Entries and their token counts are cached until the
+    registry changes, so catalogs of any subset of tools are cheap.
+    """
+
+    HEADER = "Inputs marked * are required.\n\n"
+
+    def __init__(self, tool_registry: ToolRegistry, max_tokens: Optional[int] = None, model: str = "gpt-4"):
+        self.tool_registry = tool_registry
+        self.max_tokens = max_tokens
+        self.model = model
+        self._version: Optional[int] = None
+        self._entries: Dict[CatalogDetail, Dict[str, Tuple[str, int]]] = {}
+        self._rendered: Dict[Optional[Tuple[str, ...]], Tuple[str, int]] = {}
+
+    def _entries_at(self, detail: CatalogDetail) -> Dict[str, Tuple[str, int]]:
+        if detail not in self._entries:
+            self._entries[detail] = {
+                tool.name: (text := describe_tool(tool, detail), count_tokens(text, self.model))
+                for tool in self.tool_registry.list_tools()
+            }
+        return self._entries[detail]
+
+    def _render(self, names: Optional[Sequence[str]]) -> Tuple[str, int]:
+        header_tokens = count_tokens(self.HEADER, self.model)
+        for detail in DETAIL_LEVELS:
+            entries = self._entries_at(detail)
+            selected = [entries[name] for name in names if name in entries] if names is not None else list(entries.values())
+            tokens = header_tokens + sum(count for _, count in selected)
+            if self.max_tokens is None or tokens <= self.max_tokens:
+                break
+        return self.HEADER + "\n".join(text for text, _ in selected), tokens
+
+    def render(self, names: Optional[Sequence[str]] = None) -> str:
+        """Get the catalog text for all tools, or for the named ones in the given order"""
+        return self._cached(names)[0]
+
+    def tokens(self, names: Optional[Sequence[str]] = None) -> int:
+        """Get the approximate token count of the catalog for all tools or the named ones"""
+        return self._cached(names)[1]
+
+    def _cached(self, names: Optional[Sequence[str]]) -> Tuple[str, int]:
+        if self._version != self.tool_registry.version:
+            self._entries.clear()
+            self._rendered.clear()
+            self._version = self.tool_registry.version
+        key = tuple(names) if names is not None else None
+        if key not in self._rendered:
+            if len(self._rendered) >= 256:
+                self._rendered.clear()
+            self._rendered[key] = self._render(names)
+        return self._rendered[key]
@@ -0,0 +1,363 @@
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, TYPE_CHECKING
+from ..context import RunContext
+from ..exceptions import PlanningError
+from ..llm.models import LLMMessage
+from ..models import TaskAnalysis
+from .bindings import TASK_PLACEHOLDER
+from .cache import PlanCache
+
+if TYPE_CHECKING:
+    from ..agent import Agent
+
+class Planner(ABC):
+    """Base class for strategies that turn a task into an execution plan"""
+
+    @abstractmethod
+    async def plan(self, agent: "Agent", task: str, run: Optional[RunContext] = None) -> Optional[TaskAnalysis]:
+        """Create a plan for the task, or return None if this planner can't handle it"""
+        pass
+
+    async def plan_incremental(
+        self,
+        agent: "Agent",
+        task: str,
+        on_step: Callable[[Dict[str, Any]], Any],
+        run: Optional[RunContext] = None
+    ) -> Optional[TaskAnalysis]:
+        """Create a plan, passing each step to ``on_step`` as soon as it is known
+
+        By default the whole plan is created first and its steps are then
+        passed on in order.
+        """
+        plan = await self.plan(agent, task, run)
+        if plan is not None:
+            for step in plan.execution_plan:
+                on_step(step)
+        return plan
+
+    async def repair(
+        self,
+        agent: "Agent",
+        task: str,
+        plan: TaskAnalysis,
+        problems: List[str],
+        run: Optional[RunContext] = None
+    ) -> Optional[TaskAnalysis]:
+        """Create a corrected plan given the problems found in ``plan``, or return None if this planner can't"""
+        return None
+
+    async def replan(
+        self,
+        agent: "Agent",
+        task: str,
+        plan: TaskAnalysis,
+        completed: Sequence[int],
+        failures: Dict[int, Exception],
+        run: Optional[RunContext] = None
+    ) -> Optional[TaskAnalysis]:
+        """Plan the work that remains after steps of ``plan`` failed, or return None if this planner can't
+
+        ``completed`` holds the indices of the steps whose results are kept,
+        and ``failures`` the error of each failed step. The returned plan
+        only has the steps still to run; they run after the completed steps,
+        so their inputs can refer to those steps' tools.
+        """
+        return None
+
+class LLMPlanner(Planner):
+    """Plans by asking the agent's LLM provider for a structured TaskAnalysis
+
+    When a plan cache is given, cached plans are reused and new plans are
+    stored for the next matching task, as long as they are complete and
+    pass the agent's plan validation. Incremental planning streams the
+    TaskAnalysis and hands over each execution plan entry as soon as it
+    has been generated, before the remaining fields.
+    """
+
+    def __init__(self, plan_cache: Optional[PlanCache] = None):
+        self.plan_cache = plan_cache
+
+    def _remember(self, agent: "Agent", task: str, plan: Optional[TaskAnalysis]) -> None:
+        if self.plan_cache and plan is not None and agent.validate_plan(plan).valid:
+            self.plan_cache.set(agent, task, plan)
+
+    async def plan(self, agent: "Agent", task: str, run: Optional[RunContext] = None) -> Optional[TaskAnalysis]:
+        if self.plan_cache and (plan := self.plan_cache.get(agent, task)):
+            return plan
+
+        if not agent.llm_provider:
+            raise RuntimeError("LLM provider not configured")
+
+        messages = agent._create_planning_prompt(task)
+        plan = await agent.llm_provider.generate_structured(
+            messages,
+            TaskAnalysis,
+            agent.llm_provider.config
+        )
+        self._remember(agent, task, plan)
+        return plan
+
+    async def plan_incremental(
+        self,
+        agent: "Agent",
+        task: str,
+        on_step: Callable[[Dict[str, Any]], Any],
+        run: Optional[RunContext] = None
+    ) -> Optional[TaskAnalysis]:
+        if self.plan_cache and (plan := self.plan_cache.get(agent, task)):
+            for step in plan.execution_plan:
+                on_step(step)
+            return plan
+
+        if not agent.llm_provider:
+            raise RuntimeError("LLM provider not configured")
+
+        messages = agent._create_planning_prompt(task)
+        plan = None
+        async for chunk in agent.llm_provider.generate_structured_stream(
+            messages,
+            TaskAnalysis,
+            agent.llm_provider.config
+        ):
+            if chunk.path[:1] == ("execution_plan",) and len(chunk.path) == 2:
+                on_step(chunk.value)
+            elif chunk.result is not None:
+                plan = chunk.result
+        self._remember(agent, task, plan)
+        return plan
+
+    async def repair(
+        self,
+        agent: "Agent",
+        task: str,
+        plan: TaskAnalysis,
+        problems: List[str],
+        run: Optional[RunContext] = None
+    ) -> Optional[TaskAnalysis]:
+        """Re-plan with the rejected plan and its problems in the conversation
+
+        The model only has to correct the plan rather than reason about the
+        task again, which keeps the extra call short. The rejected plan is
+        dropped from the cache, and the corrected one takes its place.
+        """
+        if not agent.llm_provider:
+            return None
+        if self.plan_cache:
+            self.plan_cache.invalidate(agent, task)
+
+        messages = agent._create_planning_prompt(task) + [
+            LLMMessage(role="assistant", content=json.dumps(plan.model_dump(), default=str)),
+            LLMMessage(
+                role="user",
+                content=(
+                    "This plan can't be executed:\n"
+                    + "\n".join(f"- {problem}" for problem in problems)
+                    + "\n\nReturn a corrected plan with ALL required fields, using only the available tools "
+                    "and the fields their outputs provide."
+                )
+            )
+        ]
+        repaired = await agent.llm_provider.generate_structured(
+            messages,
+            TaskAnalysis,
+            agent.llm_provider.config
+        )
+        self._remember(agent, task, repaired)
+        return repaired
+
+    async def replan(
+        self,
+        agent: "Agent",
+        task: str,
+        plan: TaskAnalysis,
+        completed: Sequence[int],
+        failures: Dict[int, Exception],
+        run: Optional[RunContext] = None
+    ) -> Optional[TaskAnalysis]:
+        """Ask for a plan of the remaining work, with the original plan and its failures in the conversation
+
+        The result depends on this run's failures, so it isn't cached.
+        """
+        if not agent.llm_provider:
+            return None
+
+        steps = plan.execution_plan
+        done = ", ".join(f"{index} ({steps[index]['tool']})" for index in completed) or "none"
+        failed = "\n".join(f"- Step {index} ({steps[index]['tool']}): {error}" for index, error in failures.items())
+        messages = agent._create_planning_prompt(task) + [
+            LLMMessage(role="assistant", content=json.dumps(plan.model_dump(), default=str)),
+            LLMMessage(
+                role="user",
+                content=(
+                    f"These steps failed:\n{failed}\n\n"
+                    f"Completed steps, whose results are kept: {done}.\n\n"
+                    "Return a plan with ALL required fields whose execution_plan has only the steps still needed "
+                    "to complete the task. Use an alternative tool for a failed step, repeat it if the error looks "
+                    "temporary, or leave it out if it isn't essential. Steps can use the results of completed steps."
+                )
+            )
+        ]
+        return await agent.llm_provider.generate_structured(
+            messages,
+            TaskAnalysis,
+            agent.llm_provider.config
+        )
+
+@dataclass
+class PipelineStep:
+    """A step in a declarative pipeline
+
+    Input mapping values may reference earlier tools as in LLM plans
+    (e.g. "weather_retriever" or "event_finder.events"), or use "{task}" to
+    pass the raw task. The placeholder is kept in the plan and bound by the
+    binding compiler, so the task is never read as a reference. Steps with
+    a ``when`` predicate are only included when it returns True for the
+    task. Optional steps are skipped if they fail, leaving their results
+    out of later steps' inputs.
+    """
+    tool: str = field(metadata={"description": "Name of the tool to run"})
+    reasoning: str = field(default="", metadata={"description": "Why the tool is part of the pipeline"})
+    input_mapping: Dict[str, Any] = field(
+        default_factory=dict,
+        metadata={"description": "Mapping of tool inputs to tool output references, literals or {task}"}
+    )
+    when: Optional[Callable[[str], bool]] = field(
+        default=None,
+        metadata={"description": "Predicate on the task deciding whether the step is included"}
+    )
+    optional: bool = field(
+        default=False,
+        metadata={"description": "Whether the pipeline can complete without this step if it fails"}
+    )
+
+class StaticPlanner(Planner):
+    """Builds plans from a fixed pipeline without calling the LLM
+
+    An optional ``applies`` predicate restricts the planner to matching
+    tasks, so it can sit in front of an LLM planner and only handle the
+    tasks it is sure about.
+    """
+
+    def __init__(
+        self,
+        steps: Sequence[PipelineStep],
+        applies: Optional[Callable[[str], bool]] = None,
+        description: str = "Fixed pipeline"
+    ):
+        self.steps = list(steps)
+        self.applies = applies
+        self.description = description
+
+    async def plan(self, agent: "Agent", task: str, run: Optional[RunContext] = None) -> Optional[TaskAnalysis]:
+        if self.applies and not self.applies(task):
+            return None
+
+        steps = [step for step in self.steps if step.when is None or step.when(task)]
+        if not steps:
+            return None
+
+        execution_plan = []
+        tool_capabilities: Dict[str, List[str]] = {}
+        for step in steps:
+            tool = agent.tool_registry.get_tool(step.tool)
+            tool_capabilities[step.tool] = list(tool.tags) if tool else []
+            entry: Dict[str, Any] = {"tool": step.tool, "reasoning": step.reasoning or f"Run {step.tool}"}
+            if step.input_mapping:
+                entry["input_mapping"] = dict(step.input_mapping)
+            if step.optional:
+                entry["optional"] = True
+            execution_plan.append(entry)
+
+        return TaskAnalysis(
+            input_analysis=f"{self.description} for task: {task}",
+            available_tools=list(tool_capabilities),
+            tool_capabilities=tool_capabilities,
+            execution_plan=execution_plan,
+            requirements_coverage={step.tool: [step.tool] for step in steps},
+            chain_of_thought=[entry["reasoning"] for entry in execution_plan]
+        )
+
+class PlannerChain(Planner):
+    """Tries planners in order and returns the first plan produced
+
+    Typically a static or rule-based planner comes first with an LLM
+    planner as the fallback for everything else. When incremental planning
+    falls back after a planner has already passed on some steps, the
+    fallback plan has to start with those steps, which are not passed on
+    again.
+    """
+
+    def __init__(self, planners: Sequence[Planner]):
+        self.planners = list(planners)
+
+    async def plan(self, agent: "Agent", task: str, run: Optional[RunContext] = None) -> Optional[TaskAnalysis]:
+        for planner in self.planners:
+            plan = await planner.plan(agent, task, run)
+            if plan is not None:
+                return plan
+        return None
+
+    async def plan_incremental(
+        self,
+        agent: "Agent",
+        task: str,
+        on_step: Callable[[Dict[str, Any]], Any],
+        run: Optional[RunContext] = None
+    ) -> Optional[TaskAnalysis]:
+        submitted: List[Dict[str, Any]] = []
+
+        def forward() -> Callable[[Dict[str, Any]], Any]:
+            position = 0
+
+            def forward_step(step: Dict[str, Any]) -> Any:
+                nonlocal position
+                index, position = position, position + 1
+                if index < len(submitted):
+                    # Already running from an earlier planner's partial plan
+                    if step != submitted[index]:
+                        raise PlanningError(f"Fallback plan step {index} differs from the step already started")
+                    return None
+                submitted.append(step)
+                return on_step(step)
+
+            return forward_step
+
+        for planner in self.planners:
+            plan = await planner.plan_incremental(agent, task, forward(), run)
+            if plan is not None:
+                if len(plan.execution_plan) < len(submitted):
+                    raise PlanningError(f"Fallback plan has fewer steps than the {len(submitted)} already started")
+                return plan
+        return None
+
+    async def repair(
+        self,
+        agent: "Agent",
+        task: str,
+        plan: TaskAnalysis,
+        problems: List[str],
+        run: Optional[RunContext] = None
+    ) -> Optional[TaskAnalysis]:
+        for planner in self.planners:
+            repaired = await planner.repair(agent, task, plan, problems, run)
+            if repaired is not None:
+                return repaired
+        return None
+
+    async def replan(
+        self,
+        agent: "Agent",
+        task: str,
+        plan: TaskAnalysis,
+        completed: Sequence[int],
+        failures: Dict[int, Exception],
+        run: Optional[RunContext] = None
+    ) -> Optional[TaskAnalysis]:
+        for planner in self.planners:
+            remaining = await planner.replan(agent, task, plan, completed, failures, run)
+            if remaining is not None:
+                return remaining
+        return None
@@ -0,0 +1,249 @@
+"""Checks and cost estimates for plans, run before any of their steps execute"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+from ..exceptions import BindingError, ToolNotFoundError
+from ..models import TaskAnalysis
+from ..utils.tool_registry import ToolRegistry
+from .bindings import BindingCompiler, PlanBindings, StepOutput
+
+@dataclass
+class _ToolStats:
+    calls: int = 0
+    latency: float = 0.0
+    cost: Optional[float] = None
+
+class ToolMetrics:
+    """Running latency and cost averages per tool, used to estimate plans
+
+    Averages are exponentially weighted, so estimates follow tools whose
+    latency changes. Tools that haven't been called yet are estimated at
+    ``default_latency``. Costs come from ``costs`` (per call, in whatever
+    unit budgets use, such as dollars or API credits) unless observed
+    costs are recorded.
+    """
+
+    def __init__(
+        self,
+        default_latency: float = 1.0,
+        costs: Optional[Dict[str, float]] = None,
+        smoothing: float = 0.2
+    ):
+        self.default_latency = default_latency
+        self.costs = dict(costs or {})
+        self.smoothing = smoothing
+        self._stats: Dict[str, _ToolStats] = {}
+
+    def record(self, tool_name: str, latency: float, cost: Optional[float] = None) -> None:
+        """Record one call of a tool"""
+        stats = self._stats.setdefault(tool_name, _ToolStats())
+        if stats.calls == 0:
+            stats.latency = latency
+        else:
+            stats.latency += self.smoothing * (latency - stats.latency)
+        if cost is not None:
+            stats.cost = cost if stats.cost is None else stats.cost + self.smoothing * (cost - stats.cost)
+        stats.calls += 1
+
+    def calls(self, tool_name: str) -> int:
+        stats = self._stats.get(tool_name)
+        return stats.calls if stats else 0
+
+    def latency(self, tool_name: str) -> float:
+        """Expected seconds per call"""
+        stats = self._stats.get(tool_name)
+        return stats.latency if stats and stats.calls else self.default_latency
+
+    def cost(self, tool_name: str) -> float:
+        """Expected cost per call"""
+        stats = self._stats.get(tool_name)
+        if stats and stats.cost is not None:
+            return stats.cost
+        return self.costs.get(tool_name, 0.0)
+
+@dataclass(frozen=True)
+class StepEstimate:
+    """Expected latency and cost of one plan step"""
+    index: int
+    tool: str
+    latency: float
+    cost: float
+    samples: int = field(metadata={"description": "Number of recorded calls the estimate is based on"})
+
+@dataclass(frozen=True)
+class PlanEstimate:
+    """Expected latency and cost of a plan
+
+    ``latency`` is the critical path through the plan's dependencies, as
+    independent steps run concurrently; ``sequential_latency`` is the sum.
+    """
+    steps: Tuple[StepEstimate, ...]
+    latency: float
+    sequential_latency: float
+    cost: float
+
+    def over_budget(self, max_cost: Optional[float] = None, max_latency: Optional[float] = None) -> List[str]:
+        """Describe each budget the plan is expected to exceed"""
+        problems = []
+        if max_cost is not None and self.cost > max_cost:
+            problems.append(f"estimated cost {self.cost:.4g} exceeds the budget of {max_cost:.4g}")
+        if max_latency is not None and self.latency > max_latency:
+            problems.append(f"estimated latency {self.latency:.2f}s exceeds the budget of {max_latency:.2f}s")
+        return problems
+
+@dataclass
+class PlanReport:
+    """Outcome of validating a plan"""
+    problems: List[str] = field(default_factory=list)
+    bindings: Optional[PlanBindings] = None
+    estimate: Optional[PlanEstimate] = None
+
+    @property
+    def valid(self) -> bool:
+        return not self.problems
+
+def _resolve(schema: Dict[str, Any], definitions: Dict[str, Any]) -> Dict[str, Any]:
+    ref = schema.get("$ref")
+    if isinstance(ref, str):
+        return definitions.get(ref.split("/")[-1], {})
+    if len(schema.get("allOf", [])) == 1:
+        return _resolve(schema["allOf"][0], definitions)
+    return schema
+
+def _json_types(schema: Dict[str, Any], definitions: Dict[str, Any]) -> Optional[Set[str]]:
+    """Get the JSON types a schema allows, or None if it doesn't constrain them"""
+    schema = _resolve(schema, definitions)
+    options = schema.get("anyOf") or schema.get("oneOf")
+    if options:
+        types: Set[str] = set()
+        for option in options:
+            option_types = _json_types(option, definitions)
+            if option_types is None:
+                return None
+            types |= option_types
+        return types
+    schema_type = schema.get("type")
+    if isinstance(schema_type, str):
+        return {schema_type}
+    if isinstance(schema_type, list):
+        return set(schema_type)
+    if "properties" in schema:
+        return {"object"}
+    return None
+
+def _definitions(schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {**schema.get("definitions", {}), **schema.get("$defs", {})}
+
+_UNKNOWN = object()
+
+def _output_field(output_schema: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    """Get the schema of a field within a tool's output, None if the field doesn't exist, or _UNKNOWN"""
+    definitions = _definitions(output_schema)
+    schema = output_schema
+    for key in path:
+        properties = _resolve(schema, definitions).get("properties")
+        if not properties:
+            return _UNKNOWN
+        if key not in properties:
+            return None
+        schema = properties[key]
+    return schema
+
+class PlanValidator:
+    """Checks a plan against the registry and estimates what it will cost
+
+    A plan is valid when every step's tool is registered, every input can
+    be bound (see BindingCompiler), every field a step reads from an
+    earlier result is in that tool's output schema, and the types on both
+    ends of each binding are compatible where both schemas declare them.
+    All problems are reported together, so one re-plan can fix them all.
+    """
+
+    def __init__(self, tool_registry: ToolRegistry, binding_compiler: BindingCompiler, metrics: ToolMetrics):
+        self.tool_registry = tool_registry
+        self.binding_compiler = binding_compiler
+        self.metrics = metrics
+
+    def validate(self, plan: TaskAnalysis) -> PlanReport:
+        """Check a plan and, if it is valid, estimate it"""
+        steps = plan.execution_plan
+        try:
+            bindings = self.binding_compiler.compile(steps)
+        except (BindingError, ToolNotFoundError):
+            return PlanReport(problems=self._binding_problems(steps))
+
+        problems: List[str] = []
+        for step in bindings:
+            problems.extend(self._check_types(step.index, step.tool, step.inputs, steps))
+        if problems:
+            return PlanReport(problems=problems)
+        return PlanReport(bindings=bindings, estimate=self.estimate(bindings))
+
+    def _binding_problems(self, steps: List[Dict[str, Any]]) -> List[str]:
+        """Compile each step on its own, collecting every problem instead of stopping at the first"""
+        problems = []
+        for index, step in enumerate(steps):
+            try:
+                bindings = self.binding_compiler.compile_step(step, steps[:index])
+            except BindingError as e:
+                problems.append(str(e))
+                continue
+            except ToolNotFoundError as e:
+                problems.append(f"Step {index}: {e}")
+                continue
+            problems.extend(self._check_types(index, bindings.tool, bindings.inputs, steps))
+        return problems
+
+    def _check_types(self, index: int, tool_name: str, inputs: Dict[str, Any], steps: List[Dict[str, Any]]) -> List[str]:
+        problems = []
+        tool = self.tool_registry.get_tool(tool_name)
+        input_definitions = _definitions(tool.input_schema)
+        properties = tool.input_schema.get("properties", {})
+        for input_name, binding in inputs.items():
+            if not isinstance(binding, StepOutput):
+                continue
+            producer_name = steps[binding.producer]["tool"]
+            producer = self.tool_registry.get_tool(producer_name)
+            produced = _output_field(producer.output_schema, binding.path)
+            source = ".".join((producer_name, *binding.path))
+            if produced is None:
+                problems.append(
+                    f"Step {index} ({tool_name}): input {input_name!r} reads {source!r}, "
+                    f"which {producer_name} doesn't output"
+                )
+                continue
+            if produced is _UNKNOWN or input_name not in properties:
+                continue
+
+            produced_types = _json_types(produced, _definitions(producer.output_schema))
+            expected_types = _json_types(properties[input_name], input_definitions)
+            if produced_types is None or expected_types is None:
+                continue
+            if "integer" in produced_types:
+                produced_types = produced_types | {"number"}
+            if not produced_types & expected_types:
+                problems.append(
+                    f"Step {index} ({tool_name}): input {input_name!r} expects {'|'.join(sorted(expected_types))} "
+                    f"but {source!r} is {'|'.join(sorted(produced_types))}"
+                )
+        return problems
+
+    def estimate(self, bindings: PlanBindings) -> PlanEstimate:
+        """Estimate a compiled plan from the tools' recorded latencies and costs"""
+        steps = []
+        finish: List[float] = []
+        for step in bindings:
+            latency = self.metrics.latency(step.tool)
+            steps.append(StepEstimate(
+                index=step.index,
+                tool=step.tool,
+                latency=latency,
+                cost=self.metrics.cost(step.tool),
+                samples=self.metrics.calls(step.tool)
+            ))
+            finish.append(latency + max((finish[dependency] for dependency in step.dependencies), default=0.0))
+        return PlanEstimate(
+            steps=tuple(steps),
+            latency=max(finish, default=0.0),
+            sequential_latency=sum(step.latency for step in steps),
+            cost=sum(step.cost for step in steps)
+        )
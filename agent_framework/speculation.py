@@ -0,0 +1,162 @@
+import asyncio
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, TYPE_CHECKING
+from .planning.planners import PipelineStep, TASK_PLACEHOLDER
+from .utils.hashing import stable_hash
+
+if TYPE_CHECKING:
+    from .agent import Agent
+
+def _call_key(tool_name: str, inputs: Dict[str, Any]) -> str:
+    return stable_hash([tool_name, inputs])
+
+@dataclass
+class SpeculationStats:
+    """Counters describing how useful speculative tool calls have been"""
+    started: int = 0
+    hits: int = 0
+    wasted: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of speculative calls whose result was adopted by the plan"""
+        return self.hits / self.started if self.started else 0.0
+
+    @property
+    def waste_rate(self) -> float:
+        """Fraction of speculative calls that were cancelled or discarded"""
+        return self.wasted / self.started if self.started else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Get the counters and rates as a plain dict"""
+        return {**asdict(self), "hit_rate": self.hit_rate, "waste_rate": self.waste_rate}
+
+class FirstStepTable:
+    """Frequency table of the tool calls that open a run
+
+    Inputs equal to the raw task are generalized to "{task}", so a call
+    seen for one location predicts the same call for the next. Calls are
+    only predicted once they have opened enough runs to be worth the risk
+    of wasting an API call.
+    """
+
+    def __init__(self, min_support: int = 3, min_share: float = 0.5, max_entries: int = 64):
+        self.min_support = min_support
+        self.min_share = min_share
+        self.max_entries = max_entries
+        self.observations = 0
+        self._counts: Dict[str, Tuple[int, PipelineStep]] = {}
+
+    def record(self, task: str, tool_name: str, inputs: Dict[str, Any]) -> None:
+        """Record the first tool call made for a task"""
+        input_mapping = {
+            input_name: TASK_PLACEHOLDER if value == task else value
+            for input_name, value in inputs.items()
+        }
+        key = _call_key(tool_name, input_mapping)
+        count, step = self._counts.get(key, (0, PipelineStep(tool=tool_name, input_mapping=input_mapping)))
+        self._counts[key] = (count + 1, step)
+        self.observations += 1
+
+        if len(self._counts) > self.max_entries:
+            least_common = min(self._counts, key=lambda entry: self._counts[entry][0])
+            del self._counts[least_common]
+
+    def predict(self) -> List[PipelineStep]:
+        """Get the calls frequent enough to be started speculatively"""
+        return [
+            step for count, step in self._counts.values()
+            if count >= self.min_support and count / self.observations >= self.min_share
+        ]
+
+class SpeculationBatch:
+    """Speculative tool calls started for a single run"""
+
+    def __init__(self, speculator: "Speculator", task: str):
+        self.speculator = speculator
+        self.task = task
+        self._pending: Dict[str, Tuple[str, asyncio.Task]] = {}
+        self._first_call: Optional[Tuple[str, Dict[str, Any]]] = None
+
+    def start(self, agent: "Agent", tool_name: str, inputs: Dict[str, Any]) -> None:
+        """Start a tool call in the background"""
+        key = _call_key(tool_name, inputs)
+        if key in self._pending:
+            return
+        self._pending[key] = (tool_name, asyncio.ensure_future(agent._invoke_tool(tool_name, inputs)))
+        self.speculator.stats.started += 1
+
+    def adopt(self, tool_name: str, inputs: Dict[str, Any]) -> Optional[asyncio.Task]:
+        """Claim the speculative call matching a planned call, if one was started
+
+        Also records the call so the first call of the run can be learned.
+        """
+        if self._first_call is None:
+            self._first_call = (tool_name, inputs)
+
+        entry = self._pending.pop(_call_key(tool_name, inputs), None)
+        if entry is None:
+            return None
+        self.speculator.stats.hits += 1
+        return entry[1]
+
+    def retain(self, tool_names: Set[str]) -> None:
+        """Cancel speculative calls to tools the plan doesn't use"""
+        for key, (tool_name, _) in list(self._pending.items()):
+            if tool_name not in tool_names:
+                self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        _, task = self._pending.pop(key)
+        task.cancel()
+        # Retrieve the outcome so failed speculative calls aren't reported as unhandled
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self.speculator.stats.wasted += 1
+
+    def close(self) -> None:
+        """Discard any unclaimed calls and learn from the run's first call"""
+        for key in list(self._pending):
+            self._discard(key)
+        if self._first_call and self.speculator.table is not None:
+            self.speculator.table.record(self.task, *self._first_call)
+
+class Speculator:
+    """Starts likely first tool calls while the planner is still running
+
+    Candidate calls come from steps declared by the agent and, when a
+    frequency table is given, from calls that have frequently opened
+    earlier runs. A planned call with the same tool and identical inputs
+    adopts the speculative result; anything else is cancelled.
+    """
+
+    def __init__(
+        self,
+        steps: Optional[Sequence[PipelineStep]] = None,
+        table: Optional[FirstStepTable] = None
+    ):
+        self.steps = list(steps or [])
+        self.table = table
+        self.stats = SpeculationStats()
+
+    def predict(self, agent: "Agent", task: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Get the tool calls to start speculatively for a task"""
+        candidates = self.steps + (self.table.predict() if self.table is not None else [])
+        calls = []
+        for step in candidates:
+            if step.when is not None and not step.when(task):
+                continue
+            if not agent.tool_registry.get_tool(step.tool):
+                continue
+            inputs = {
+                input_name: task if value == TASK_PLACEHOLDER else value
+                for input_name, value in step.input_mapping.items()
+            }
+            calls.append((step.tool, inputs))
+        return calls
+
+    def start(self, agent: "Agent", task: str) -> SpeculationBatch:
+        """Start speculative calls for a run"""
+        batch = SpeculationBatch(self, task)
+        for tool_name, inputs in self.predict(agent, task):
+            batch.start(agent, tool_name, inputs)
+        return batch
@@ -1,12 +1,52 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, ClassVar, Type, Union
+from typing import Any, Dict, ClassVar, Optional, Sequence, Type, Union
 from ..models import ToolMetadata, ToolError
+from ..http import HttpClientPool
+from .cache import ToolCachePolicy
 
 class BaseTool(ABC):
     """Base class for all tools"""
     
     # Tool metadata as class variables
     metadata: ClassVar[Type[ToolMetadata]]
+
+    # How the tool registry manages instances: "singleton" shares one
+    # instance between all calls, "pooled" keeps up to pool_size instances
+    # that each serve one call at a time, and "per_call" creates a fresh
+    # instance for every call
+    instance_mode: ClassVar[str] = "singleton"
+    pool_size: ClassVar[int] = 4
+
+    # Opt-in result caching for tools whose result only depends on their
+    # inputs, e.g. ToolCachePolicy(ttl=600, key_fields=["location"])
+    cache_policy: ClassVar[Optional[ToolCachePolicy]] = None
+
+    # Whether identical concurrent calls may share one execution when the
+    # agent coalesces tool calls. Tools with a cache policy already share
+    # results; leave this off for tools that book, send or write anything
+    idempotent: ClassVar[bool] = False
+
+    # Base URLs of the web APIs the tool calls, warmed up by Agent.warm_up
+    http_hosts: ClassVar[Sequence[str]] = ()
+
+    _http_pool: Optional[HttpClientPool] = None
+
+    @property
+    def http(self) -> HttpClientPool:
+        """Shared HTTP connection pool, injected by the tool registry
+
+        Raises RuntimeError for an instance created outside a registry until
+        a pool is assigned, so no tool holds connections nothing closes.
+        """
+        if self._http_pool is None:
+            raise RuntimeError(
+                f"{type(self).__name__} has no HTTP pool; register it with an agent, or assign one with `tool.http = pool`"
+            )
+        return self._http_pool
+
+    @http.setter
+    def http(self, pool: HttpClientPool) -> None:
+        self._http_pool = pool
     
     @classmethod
     def get_metadata(cls) -> ToolMetadata:
@@ -17,4 +57,12 @@ class BaseTool(ABC):
     @abstractmethod
     async def execute(self, **inputs: Any) -> Union[Dict[str, Any], ToolError]:
         """Execute the tool with given inputs"""
-        pass 
\ No newline at end of file
+        pass
+
+    async def setup(self) -> None:
+        """Acquire resources before the instance serves its first call"""
+        pass
+
+    async def teardown(self) -> None:
+        """Release resources when the instance is retired"""
+        pass
@@ -0,0 +1,165 @@
+"""Result caching for idempotent tools"""
+import asyncio
+import copy
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Union
+from ..utils.cache import CacheStats, CacheStore, InMemoryCache, SQLiteCache
+from ..utils.hashing import stable_hash
+
+@dataclass(frozen=True)
+class ToolCachePolicy:
+    """How results of a tool may be cached
+
+    Tools opt in by setting ``cache_policy`` on their class. Only tools whose
+    result depends on nothing but their inputs (and the time of the call,
+    bounded by the TTL) should be cached.
+    """
+    ttl: float = field(metadata={"description": "Seconds a cached result is served as fresh"})
+    key_fields: Optional[Sequence[str]] = field(
+        default=None,
+        metadata={"description": "Inputs that identify a result (None for all inputs)"}
+    )
+    max_size: int = field(default=256, metadata={"description": "Maximum number of cached results for the tool"})
+    stale_while_revalidate: float = field(
+        default=0.0,
+        metadata={"description": "Seconds after the TTL during which a stale result is served while it is refreshed"}
+    )
+    normalize: bool = field(
+        default=True,
+        metadata={"description": "Ignore case and surrounding or repeated whitespace in string inputs"}
+    )
+
+@dataclass
+class ToolCacheStats(CacheStats):
+    """Counters describing how a tool's result cache is being used"""
+    stale_hits: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+class ToolResultCache:
+    """Caches tool results according to each tool's ``ToolCachePolicy``
+
+    Every tool gets its own LRU store, held in memory or, when a path is
+    given, in a SQLite database so results survive restarts. Within the
+    stale-while-revalidate window an expired result is returned at once
+    and refreshed in the background.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = path
+        self._stores: Dict[str, CacheStore] = {}
+        self._policies: Dict[str, ToolCachePolicy] = {}
+        self._stats: Dict[str, ToolCacheStats] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    def _store(self, tool_name: str, policy: ToolCachePolicy) -> CacheStore:
+        store = self._stores.get(tool_name)
+        if store is None:
+            if self.path:
+                table = "tool_" + re.sub(r"\W", "_", tool_name)
+                store = SQLiteCache(self.path, table=table, max_size=policy.max_size)
+            else:
+                store = InMemoryCache(max_size=policy.max_size)
+            self._stores[tool_name] = store
+            self._policies[tool_name] = policy
+            self._stats[tool_name] = ToolCacheStats()
+        return store
+
+    def key(self, tool_name: str, policy: ToolCachePolicy, inputs: Dict[str, Any]) -> str:
+        """Get the cache key for a call from its normalized key inputs"""
+        if policy.key_fields is not None:
+            inputs = {name: inputs.get(name) for name in policy.key_fields}
+        if policy.normalize:
+            inputs = _normalize(inputs)
+        return stable_hash([tool_name, inputs])
+
+    async def get_or_call(
+        self,
+        tool_name: str,
+        policy: ToolCachePolicy,
+        inputs: Dict[str, Any],
+        call: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Get a cached result for the call, or make the call and cache its result"""
+        store = self._store(tool_name, policy)
+        stats = self._stats[tool_name]
+        key = self.key(tool_name, policy, inputs)
+
+        entry = store.get(key)
+        if entry is not None:
+            result, fresh_until = entry
+            if time.time() < fresh_until:
+                stats.hits += 1
+                return copy.deepcopy(result)
+            stats.stale_hits += 1
+            self._refresh(tool_name, policy, key, call)
+            return copy.deepcopy(result)
+
+        stats.misses += 1
+        result = await call()
+        self._set(store, policy, key, result)
+        return copy.deepcopy(result)
+
+    def _set(self, store: CacheStore, policy: ToolCachePolicy, key: str, result: Dict[str, Any]) -> None:
+        # Entries outlive their TTL by the stale window so they can still be served while refreshing
+        store.set(key, (result, time.time() + policy.ttl), ttl=policy.ttl + policy.stale_while_revalidate)
+
+    def _refresh(
+        self,
+        tool_name: str,
+        policy: ToolCachePolicy,
+        key: str,
+        call: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> None:
+        if key in self._refreshing:
+            return
+        stats = self._stats[tool_name]
+
+        async def refresh() -> None:
+            try:
+                self._set(self._stores[tool_name], policy, key, await call())
+                stats.refreshes += 1
+            except Exception:
+                # The stale result was already served; the next call will try again
+                stats.refresh_errors += 1
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.ensure_future(refresh())
+
+    def invalidate(self, tool_name: str, inputs: Optional[Dict[str, Any]] = None) -> None:
+        """Remove one cached result, or every result of the tool when no inputs are given"""
+        store = self._stores.get(tool_name)
+        if store is None:
+            return
+        if inputs is None:
+            store.clear()
+        else:
+            store.delete(self.key(tool_name, self._policies[tool_name], inputs))
+        self._stats[tool_name].invalidations += 1
+
+    def stats(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """Get hit and miss counters for every cached tool"""
+        return {tool_name: stats.as_dict() for tool_name, stats in self._stats.items()}
+
+    async def aclose(self) -> None:
+        """Wait for background refreshes and close persistent stores"""
+        if self._refreshing:
+            await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+        for store in self._stores.values():
+            if isinstance(store, SQLiteCache):
+                store.close()
+        self._stores.clear()
+        self._policies.clear()
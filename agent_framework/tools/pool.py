@@ -0,0 +1,81 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Type
+from .base import BaseTool
+from ..http import HttpClientPool
+
+INSTANCE_MODES = ("singleton", "pooled", "per_call")
+
+class ToolInstancePool:
+    """Creates, hands out and retires instances of one tool implementation
+
+    Instances are created lazily on first use and set up once, so a tool
+    call is a method dispatch on a warm instance rather than a construction
+    plus resource setup. The implementation's ``instance_mode`` decides
+    whether instances are shared, pooled or created per call.
+    """
+
+    def __init__(self, implementation: Type[BaseTool], http_pool: Optional[HttpClientPool] = None):
+        mode = getattr(implementation, "instance_mode", "singleton")
+        if mode not in INSTANCE_MODES:
+            raise ValueError(
+                f"Invalid instance_mode {mode!r} for {implementation.__name__}. "
+                f"Must be one of: {', '.join(INSTANCE_MODES)}"
+            )
+        self.implementation = implementation
+        self.http_pool = http_pool
+        self.mode = mode
+        self.pool_size = max(1, getattr(implementation, "pool_size", 1))
+        self._instances: List[BaseTool] = []
+        self._idle: List[BaseTool] = []
+        # Created on first use so they bind to the running event loop
+        self._lock: Optional[asyncio.Lock] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _create(self) -> BaseTool:
+        instance = self.implementation()
+        if self.http_pool is not None:
+            instance.http = self.http_pool
+        await instance.setup()
+        return instance
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[BaseTool]:
+        """Borrow an instance for the duration of one call"""
+        if self.mode == "per_call":
+            instance = await self._create()
+            try:
+                yield instance
+            finally:
+                await instance.teardown()
+            return
+
+        if self.mode == "singleton":
+            if not self._instances:
+                if self._lock is None:
+                    self._lock = asyncio.Lock()
+                async with self._lock:
+                    if not self._instances:
+                        self._instances.append(await self._create())
+            yield self._instances[0]
+            return
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        async with self._slots:
+            instance = self._idle.pop() if self._idle else None
+            if instance is None:
+                instance = await self._create()
+                self._instances.append(instance)
+            try:
+                yield instance
+            finally:
+                self._idle.append(instance)
+
+    async def close(self) -> None:
+        """Tear down every instance created so far"""
+        instances, self._instances, self._idle = self._instances, [], []
+        await asyncio.gather(
+            *(instance.teardown() for instance in instances),
+            return_exceptions=True
+        )
@@ -0,0 +1,218 @@
+"""Shortlisting of relevant tools for a task on large registries"""
+import math
+import re
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set
+from ..models import Tool
+from ..utils.tool_registry import ToolRegistry
+
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from", "get", "i", "in",
+    "is", "it", "me", "my", "of", "on", "or", "please", "some", "that", "the", "this", "to", "use",
+    "want", "what", "with", "would", "you"
+})
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, breaking up snake_case and camelCase and dropping stopwords"""
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)
+    terms = []
+    for term in re.findall(r"[a-z0-9]+", text.lower()):
+        if term in _STOPWORDS:
+            continue
+        # Crude plural folding, so "restaurants" matches "restaurant"
+        if len(term) > 3 and term.endswith("s") and not term.endswith("ss"):
+            term = term[:-1]
+        terms.append(term)
+    return terms
+
+def tool_document(tool: Tool) -> List[str]:
+    """Get the terms a tool is indexed under: its name (counted twice), tags, description and input names"""
+    name_terms = tokenize(tool.name)
+    return (
+        name_terms * 2
+        + tokenize(" ".join(tool.tags))
+        + tokenize(tool.description)
+        + tokenize(" ".join(tool.input_schema.get("properties", {})))
+    )
+
+class EmbeddingBackend(ABC):
+    """Turns texts into vectors for semantic matching of tasks to tools"""
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed each text as a unit-length vector"""
+        pass
+
+class HashingEmbedding(EmbeddingBackend):
+    """Pure-CPU embedding from hashed terms and character trigrams
+
+    Not semantic, but the trigrams match related word forms ("forecast"
+    and "forecasting") that exact term matching misses. Swap in a model
+    backed embedding for synonym matching.
+    """
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> Counter:
+        features: Counter = Counter()
+        for term in tokenize(text):
+            features[term] += 1.0
+            padded = f"#{term}#"
+            for start in range(len(padded) - 2):
+                features[padded[start:start + 3]] += 0.5
+        return features
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        vectors = []
+        for text in texts:
+            vector = [0.0] * self.dimensions
+            for feature, weight in self._features(text).items():
+                vector[zlib.crc32(feature.encode()) % self.dimensions] += weight
+            norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+            vectors.append([value / norm for value in vector])
+        return vectors
+
+@dataclass
+class ToolMatch:
+    """A tool and how well it matches a query"""
+    name: str
+    score: float
+
+class ToolIndex:
+    """BM25 index over a registry's tools, optionally blended with embedding similarity
+
+    The index is rebuilt lazily whenever the registry's version changes.
+    With an embedding backend, each tool's score is its BM25 score
+    normalized to the best match, plus ``embedding_weight`` times its
+    cosine similarity to the query.
+    """
+
+    def __init__(
+        self,
+        tool_registry: ToolRegistry,
+        embedding: Optional[EmbeddingBackend] = None,
+        embedding_weight: float = 0.5,
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        self.tool_registry = tool_registry
+        self.embedding = embedding
+        self.embedding_weight = embedding_weight
+        self.k1 = k1
+        self.b = b
+        self._version: Optional[int] = None
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._average_length = 0.0
+        # Stored sparse, since hashed embeddings are mostly zeros
+        self._vectors: Dict[str, Dict[int, float]] = {}
+
+    def _build(self) -> None:
+        postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        lengths: Dict[str, int] = {}
+        tools = self.tool_registry.list_tools()
+        for tool in tools:
+            terms = tool_document(tool)
+            lengths[tool.name] = len(terms)
+            for term, count in Counter(terms).items():
+                postings[term][tool.name] = count
+
+        self._postings = dict(postings)
+        self._lengths = lengths
+        self._average_length = sum(lengths.values()) / len(lengths) if lengths else 0.0
+        self._vectors = {}
+        if self.embedding and tools:
+            texts = [" ".join([tool.name, tool.description, *tool.tags]) for tool in tools]
+            self._vectors = {
+                tool.name: {dimension: value for dimension, value in enumerate(vector) if value}
+                for tool, vector in zip(tools, self.embedding.embed(texts))
+            }
+        self._version = self.tool_registry.version
+
+    def _ensure_current(self) -> None:
+        if self._version != self.tool_registry.version:
+            self._build()
+
+    def query_coverage(self, query: str) -> float:
+        """Fraction of the query's terms that appear in any indexed tool"""
+        self._ensure_current()
+        terms = set(tokenize(query))
+        if not terms:
+            return 0.0
+        return sum(1 for term in terms if term in self._postings) / len(terms)
+
+    def scores(self, query: str) -> Dict[str, float]:
+        """Score every tool that matches the query"""
+        self._ensure_current()
+        tool_count = len(self._lengths)
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (tool_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for name, count in postings.items():
+                length_ratio = self._lengths[name] / (self._average_length or 1.0)
+                scores[name] += idf * count * (self.k1 + 1) / (count + self.k1 * (1 - self.b + self.b * length_ratio))
+
+        if self._vectors:
+            best = max(scores.values(), default=0.0) or 1.0
+            scores = defaultdict(float, {name: score / best for name, score in scores.items()})
+            query_vector = [(dimension, value) for dimension, value in enumerate(self.embedding.embed([query])[0]) if value]
+            for name, vector in self._vectors.items():
+                similarity = sum(value * vector.get(dimension, 0.0) for dimension, value in query_vector)
+                if similarity > 0:
+                    scores[name] += self.embedding_weight * similarity
+        return dict(scores)
+
+    def search(self, query: str, k: int) -> List[ToolMatch]:
+        """Get the ``k`` best matching tools, best first"""
+        ranked = sorted(self.scores(query).items(), key=lambda item: (-item[1], item[0]))
+        return [ToolMatch(name=name, score=score) for name, score in ranked[:k]]
+
+class ToolRetriever:
+    """Picks the tools worth describing to the planner for a task
+
+    Returns the top ``k`` tools, plus any ``pinned`` tools that every plan
+    may need. Matching can fail quietly (a task phrased in words no tool
+    description uses), so when fewer than ``min_coverage`` of the task's
+    terms match any tool the shortlist widens to ``fallback_k`` tools,
+    trading prompt size for recall; if too few tools match at all, the
+    rest are filled in registration order. Registries no larger than the
+    shortlist are returned whole.
+    """
+
+    def __init__(
+        self,
+        index: ToolIndex,
+        k: int = 8,
+        fallback_k: Optional[int] = None,
+        min_coverage: float = 0.5,
+        pinned: Sequence[str] = ()
+    ):
+        self.index = index
+        self.k = k
+        self.fallback_k = fallback_k if fallback_k is not None else k * 3
+        self.min_coverage = min_coverage
+        self.pinned = list(pinned)
+
+    def shortlist(self, task: str) -> List[str]:
+        """Get the names of the tools to plan with, in registration order"""
+        registered = [tool.name for tool in self.index.tool_registry.list_tools()]
+        if len(registered) <= self.k + len(self.pinned):
+            return registered
+
+        if self.index.query_coverage(task) >= self.min_coverage:
+            selected: Set[str] = {match.name for match in self.index.search(task, self.k)}
+        else:
+            selected = {match.name for match in self.index.search(task, self.fallback_k)}
+            for name in registered:
+                if len(selected) >= self.fallback_k:
+                    break
+                selected.add(name)
+        selected.update(name for name in self.pinned if name in self.index.tool_registry.tools)
+        return [name for name in registered if name in selected]
@@ -0,0 +1,290 @@
+"""JSON schemas compiled into fast validators for tool inputs and outputs"""
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from ..utils.hashing import stable_hash
+
+@dataclass(frozen=True)
+class SchemaViolation:
+    """A place where a value doesn't match its schema"""
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path or '<root>'}: {self.message}"
+
+_MISSING = object()
+
+def _join(path: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else str(key)
+
+# Python conditions for JSON types; bools are ints in Python but not numbers in JSON
+_TYPE_CONDITIONS: Dict[str, str] = {
+    "string": "isinstance({v}, str)",
+    "integer": "(isinstance({v}, int) and not isinstance({v}, bool) or isinstance({v}, float) and {v}.is_integer())",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "boolean": "isinstance({v}, bool)",
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, (list, tuple))",
+    "null": "{v} is None",
+}
+
+class _CodeGenerator:
+    """Generates the source of a validation function for a schema
+
+    Nested properties and array items become nested blocks of a single
+    function, and paths are only formatted when a violation is reported, so
+    a valid value costs a few inline checks per node. $refs are inlined,
+    except recursive ones, which become functions of their own. Keywords the
+    generator doesn't know are ignored, so unusual schemas are validated as
+    far as they can be rather than rejected.
+    """
+
+    def __init__(self, root: Dict[str, Any]):
+        self.definitions = {**root.get("definitions", {}), **root.get("$defs", {})}
+        self.namespace: Dict[str, Any] = {"SchemaViolation": SchemaViolation, "_join": _join, "_MISSING": _MISSING}
+        self.blocks: List[str] = []
+        self.ref_functions: Dict[str, str] = {}
+        self.ref_stack: List[str] = []
+        self.counter = 0
+
+    def name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def constant(self, value: Any) -> str:
+        name = self.name("_k")
+        self.namespace[name] = value
+        return name
+
+    def function(self, schema: Dict[str, Any], name: Optional[str] = None) -> str:
+        """Generate a function validating a whole value against ``schema`` and return its name"""
+        name = name or self.name("_validate")
+        body: List[str] = []
+        self.node(schema, "data", "path", body, 1, None)
+        self.blocks.append("\n".join([f"def {name}(data, path, errors):", *(body or ["    pass"])]))
+        return name
+
+    def ref_function(self, ref_name: str) -> str:
+        if ref_name not in self.ref_functions:
+            name = self.ref_functions[ref_name] = self.name("_validate")
+            outer_stack, self.ref_stack = self.ref_stack, [ref_name]
+            self.function(self.definitions[ref_name], name)
+            self.ref_stack = outer_stack
+        return self.ref_functions[ref_name]
+
+    def source(self) -> str:
+        return "\n\n".join(self.blocks) + "\n"
+
+    @staticmethod
+    def error(out: List[str], indent: int, path: str, message: str) -> None:
+        out.append("    " * indent + f"errors.append(SchemaViolation({path}, {message}))")
+
+    def node(self, schema: Any, v: str, path: str, out: List[str], indent: int, known_type: Optional[str]) -> None:
+        """Emit the checks of value ``v`` against ``schema`` into ``out``"""
+        if not isinstance(schema, dict):
+            return
+        pad = "    " * indent
+
+        ref = schema.get("$ref")
+        if isinstance(ref, str):
+            ref_name = ref.split("/")[-1]
+            if isinstance(self.definitions.get(ref_name), dict):
+                if ref_name in self.ref_stack:
+                    out.append(pad + f"{self.ref_function(ref_name)}({v}, {path}, errors)")
+                else:
+                    self.ref_stack.append(ref_name)
+                    self.node(self.definitions[ref_name], v, path, out, indent, known_type)
+                    self.ref_stack.pop()
+
+        schema_type = schema.get("type")
+        types = [schema_type] if isinstance(schema_type, str) else list(schema_type or [])
+        if types and all(name in _TYPE_CONDITIONS for name in types):
+            condition = " or ".join(_TYPE_CONDITIONS[name].format(v=v) for name in types)
+            out.append(pad + f"if not ({condition}):")
+            self.error(out, indent + 1, path, f"'expected {' or '.join(types)}, got ' + type({v}).__name__")
+            # The type check gates the rest, so a wrong type is reported once
+            rest: List[str] = []
+            self.keywords(schema, v, path, rest, indent + 1, types[0] if len(types) == 1 else None)
+            if rest:
+                out.append(pad + "else:")
+                out.extend(rest)
+        else:
+            self.keywords(schema, v, path, out, indent, known_type)
+
+    def keywords(self, schema: Dict[str, Any], v: str, path: str, out: List[str], indent: int, known_type: Optional[str]) -> None:
+        pad = "    " * indent
+
+        if "enum" in schema:
+            allowed = list(schema["enum"])
+            out.append(pad + f"if {v} not in {self.constant(allowed)}:")
+            self.error(out, indent + 1, path, repr(f"must be one of {allowed}"))
+        if "const" in schema:
+            out.append(pad + f"if {v} != {self.constant(schema['const'])}:")
+            self.error(out, indent + 1, path, repr(f"must be {schema['const']!r}"))
+
+        for option in schema.get("allOf", []):
+            self.node(option, v, path, out, indent, known_type)
+
+        options = schema.get("anyOf") or schema.get("oneOf")
+        if options:
+            non_null = [option for option in options if option != {"type": "null"}]
+            if len(options) == 2 and len(non_null) == 1:
+                # Optional[X] as Pydantic writes it
+                inner: List[str] = []
+                self.node(non_null[0], v, path, inner, indent + 1, None)
+                if inner:
+                    out.append(pad + f"if {v} is not None:")
+                    out.extend(inner)
+            else:
+                option_functions = self.name("_options")
+                self.blocks.append(f"{option_functions} = ({', '.join(self.function(option) for option in options)},)")
+                out.append(pad + f"for _option in {option_functions}:")
+                out.append(pad + "    _option_errors = []")
+                out.append(pad + f"    _option({v}, '', _option_errors)")
+                out.append(pad + "    if not _option_errors:")
+                out.append(pad + "        break")
+                out.append(pad + "else:")
+                self.error(out, indent + 1, path, repr("doesn't match any of the allowed schemas"))
+
+        self.object_keywords(schema, v, path, out, indent, known_type)
+        self.array_keywords(schema, v, path, out, indent, known_type)
+        self.scalar_keywords(schema, v, path, out, indent, known_type)
+
+    @staticmethod
+    def guarded(out: List[str], indent: int, v: str, json_type: str, known_type: Optional[str], body: List[str]) -> None:
+        """Emit ``body``, generated at ``indent + 1``, behind a type check unless the type is already known"""
+        if not body:
+            return
+        if known_type == json_type:
+            out.extend(line[4:] for line in body)
+            return
+        out.append("    " * indent + f"if {_TYPE_CONDITIONS[json_type].format(v=v)}:")
+        out.extend(body)
+
+    def object_keywords(self, schema: Dict[str, Any], v: str, path: str, out: List[str], indent: int, known_type: Optional[str]) -> None:
+        properties = schema.get("properties", {})
+        additional = schema.get("additionalProperties", True)
+        body: List[str] = []
+        pad = "    " * (indent + 1)
+
+        for name in schema.get("required", []):
+            body.append(pad + f"if {name!r} not in {v}:")
+            self.error(body, indent + 2, f"_join({path}, {name!r})", repr("is required"))
+        for name, property_schema in properties.items():
+            item = self.name("_v")
+            inner: List[str] = []
+            self.node(property_schema, item, f"_join({path}, {name!r})", inner, indent + 2, None)
+            if inner:
+                body.append(pad + f"{item} = {v}.get({name!r}, _MISSING)")
+                body.append(pad + f"if {item} is not _MISSING:")
+                body.extend(inner)
+        if additional is False or isinstance(additional, dict):
+            key, item = self.name("_key"), self.name("_v")
+            body.append(pad + f"for {key}, {item} in {v}.items():")
+            body.append(pad + f"    if {key} not in {self.constant(frozenset(properties))}:")
+            if additional is False:
+                self.error(body, indent + 3, f"_join({path}, {key})", repr("is not an allowed property"))
+            else:
+                inner = []
+                self.node(additional, item, f"_join({path}, {key})", inner, indent + 3, None)
+                body.extend(inner or [pad + "        pass"])
+        self.guarded(out, indent, v, "object", known_type, body)
+
+    def array_keywords(self, schema: Dict[str, Any], v: str, path: str, out: List[str], indent: int, known_type: Optional[str]) -> None:
+        body: List[str] = []
+        pad = "    " * (indent + 1)
+
+        items = schema.get("items")
+        if isinstance(items, dict) and items:
+            index, item = self.name("_i"), self.name("_v")
+            inner: List[str] = []
+            self.node(items, item, f"_join({path}, {index})", inner, indent + 2, None)
+            if inner:
+                body.append(pad + f"for {index}, {item} in enumerate({v}):")
+                body.extend(inner)
+        for keyword, operator, description in (("minItems", "<", "at least"), ("maxItems", ">", "at most")):
+            if keyword in schema:
+                body.append(pad + f"if len({v}) {operator} {int(schema[keyword])}:")
+                self.error(body, indent + 2, path, repr(f"must have {description} {schema[keyword]} items"))
+        self.guarded(out, indent, v, "array", known_type, body)
+
+    def scalar_keywords(self, schema: Dict[str, Any], v: str, path: str, out: List[str], indent: int, known_type: Optional[str]) -> None:
+        pad = "    " * (indent + 1)
+
+        numeric: List[str] = []
+        for keyword, operator, symbol in (
+            ("minimum", "<", ">="),
+            ("maximum", ">", "<="),
+            ("exclusiveMinimum", "<=", ">"),
+            ("exclusiveMaximum", ">=", "<"),
+        ):
+            limit = schema.get(keyword)
+            if isinstance(limit, (int, float)) and not isinstance(limit, bool):
+                numeric.append(pad + f"if {v} {operator} {limit!r}:")
+                self.error(numeric, indent + 2, path, repr(f"must be {symbol} {limit}"))
+        self.guarded(out, indent, v, "number", "number" if known_type in ("number", "integer") else known_type, numeric)
+
+        text: List[str] = []
+        for keyword, operator, description in (("minLength", "<", "at least"), ("maxLength", ">", "at most")):
+            if keyword in schema:
+                text.append(pad + f"if len({v}) {operator} {int(schema[keyword])}:")
+                self.error(text, indent + 2, path, repr(f"must be {description} {schema[keyword]} characters"))
+        if "pattern" in schema:
+            text.append(pad + f"if not {self.constant(re.compile(schema['pattern']))}.search({v}):")
+            self.error(text, indent + 2, path, repr(f"must match {schema['pattern']!r}"))
+        self.guarded(out, indent, v, "string", known_type, text)
+
+class SchemaValidator:
+    """A JSON schema compiled into a generated Python function, reusable for any number of values"""
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        generator = _CodeGenerator(schema)
+        entry = generator.function(schema)
+        self.source = generator.source()
+        exec(compile(self.source, "<schema validator>", "exec"), generator.namespace)
+        self._validate = generator.namespace[entry]
+
+    def validate(self, value: Any) -> List[SchemaViolation]:
+        """Get every violation of the schema, or an empty list if the value is valid"""
+        errors: List[SchemaViolation] = []
+        self._validate(value, "", errors)
+        return errors
+
+_validators: Dict[str, SchemaValidator] = {}
+
+def compile_schema(schema: Dict[str, Any]) -> SchemaValidator:
+    """Get the validator for a schema, compiling it only the first time the schema is seen"""
+    key = stable_hash(schema)
+    validator = _validators.get(key)
+    if validator is None:
+        validator = _validators[key] = SchemaValidator(schema)
+    return validator
+
+@dataclass(frozen=True)
+class ToolValidators:
+    """Compiled validators for one tool's inputs and output"""
+    inputs: SchemaValidator
+    output: SchemaValidator
+    required: frozenset
+
+    @classmethod
+    def for_schemas(cls, input_schema: Dict[str, Any], output_schema: Dict[str, Any]) -> "ToolValidators":
+        return cls(
+            inputs=compile_schema(input_schema),
+            output=compile_schema(output_schema),
+            required=frozenset(input_schema.get("required", []))
+        )
+
+    def validate_inputs(self, inputs: Dict[str, Any]) -> List[SchemaViolation]:
+        """Check call inputs, treating None for an optional input as omitted like tools do"""
+        if any(value is None and name not in self.required for name, value in inputs.items()):
+            inputs = {name: value for name, value in inputs.items() if value is not None or name in self.required}
+        return self.inputs.validate(inputs)
+
+    def validate_output(self, output: Any) -> List[SchemaViolation]:
+        """Check a tool result"""
+        return self.output.validate(output)
@@ -0,0 +1,12 @@
+"""Utilities for building stable cache keys"""
+import hashlib
+import json
+from typing import Any
+
+def canonical_json(data: Any) -> str:
+    """Serialize data to JSON with a deterministic key order and spacing"""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+def stable_hash(data: Any) -> str:
+    """Get a hex digest of data that is stable across processes and runs"""
+    return hashlib.sha256(canonical_json(data).encode("utf-8")).hexdigest()
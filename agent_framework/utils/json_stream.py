@@ -0,0 +1,172 @@
+"""Incremental parsing of JSON documents that arrive in chunks"""
+import json
+from dataclasses import dataclass
+from typing import Any, Collection, List, Optional, Tuple, Union
+
+Path = Tuple[Union[str, int], ...]
+
+@dataclass
+class JsonValue:
+    """A value that has been completely received"""
+    path: Path
+    value: Any
+
+@dataclass
+class JsonStringDelta:
+    """Newly received text of a string value that is still streaming"""
+    path: Path
+    text: str
+
+JsonEvent = Union[JsonValue, JsonStringDelta]
+
+_WHITESPACE = " \t\r\n"
+
+class _Frame:
+    __slots__ = ("kind", "path", "start", "key", "index", "state")
+
+    def __init__(self, kind: str, path: Path, start: int):
+        self.kind = kind
+        self.path = path
+        self.start = start
+        self.key: Optional[str] = None
+        self.index = 0
+        # Objects move through key -> colon -> value -> comma; arrays through value -> comma
+        self.state = "key" if kind == "{" else "value"
+
+    def child_path(self) -> Path:
+        return self.path + ((self.key,) if self.kind == "{" else (self.index,))
+
+class JsonStreamParser:
+    """Parses a JSON document chunk by chunk, reporting values as they complete
+
+    Every value nested at most ``max_depth`` levels deep is reported once
+    its closing character arrives. With the default depth of 2 these are
+    the top-level fields of an object and the items of top-level arrays.
+    String values at the paths in ``stream_strings`` are also reported as
+    deltas while they stream. Text before the document starts, such as a
+    Markdown code fence, is skipped.
+    """
+
+    def __init__(self, max_depth: int = 2, stream_strings: Collection[Path] = ()):
+        self.max_depth = max_depth
+        self.stream_strings = {tuple(path) for path in stream_strings}
+        self.buffer = ""
+        self.done = False
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._started = False
+        # State of the string or scalar currently being read
+        self._string_start: Optional[int] = None
+        self._string_is_key = False
+        self._escape = False
+        self._unicode_left = 0
+        self._streamed_upto = 0
+        self._scalar_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[JsonEvent]:
+        """Consume the next chunk and return the events it completes"""
+        self.buffer += chunk
+        events: List[JsonEvent] = []
+        buffer = self.buffer
+        while self._pos < len(buffer) and not self.done:
+            char = buffer[self._pos]
+            if self._string_start is not None:
+                self._read_string_char(char, events)
+            elif self._scalar_start is not None and (char in _WHITESPACE or char in ",]}"):
+                self._complete(self._scalar_start, self._pos, events)
+                self._scalar_start = None
+                continue  # Let the delimiter be processed normally
+            elif self._scalar_start is None:
+                self._read_structural_char(char, events)
+            self._pos += 1
+
+        self._stream_partial_string(events)
+        return events
+
+    def _read_structural_char(self, char: str, events: List[JsonEvent]) -> None:
+        if not self._started:
+            if char in "{[":
+                self._started = True
+                self._stack.append(_Frame(char, (), self._pos))
+            return
+
+        if char in _WHITESPACE:
+            return
+        frame = self._stack[-1]
+
+        if char in "}]":
+            self._stack.pop()
+            self._complete(frame.start, self._pos + 1, events, path=frame.path)
+            return
+        if char == ",":
+            frame.state = "key" if frame.kind == "{" else "value"
+            if frame.kind == "[":
+                frame.index += 1
+            return
+        if char == ":":
+            frame.state = "value"
+            return
+
+        if char == '"':
+            self._string_start = self._pos
+            self._string_is_key = frame.kind == "{" and frame.state == "key"
+            self._streamed_upto = self._pos + 1
+        elif char in "{[":
+            self._stack.append(_Frame(char, frame.child_path(), self._pos))
+        else:
+            self._scalar_start = self._pos
+
+    def _read_string_char(self, char: str, events: List[JsonEvent]) -> None:
+        if self._unicode_left:
+            self._unicode_left -= 1
+        elif self._escape:
+            self._escape = False
+            if char == "u":
+                self._unicode_left = 4
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            start, self._string_start = self._string_start, None
+            if self._string_is_key:
+                frame = self._stack[-1]
+                frame.key = json.loads(self.buffer[start:self._pos + 1])
+                frame.state = "colon"
+            else:
+                self._stream_partial_string(events, end=self._pos)
+                self._complete(start, self._pos + 1, events)
+
+    def _stream_partial_string(self, events: List[JsonEvent], end: Optional[int] = None) -> None:
+        """Report the decodable text of the streaming string received since the last delta"""
+        if self._string_start is None and end is None or self._string_is_key or not self._stack:
+            return
+        path = self._stack[-1].child_path()
+        if path not in self.stream_strings:
+            return
+
+        if end is None:
+            end = self._pos
+            # Hold back an escape sequence that hasn't fully arrived
+            if self._escape or self._unicode_left:
+                end = self.buffer.rfind("\\", self._streamed_upto, end)
+        if end > self._streamed_upto:
+            raw = self.buffer[self._streamed_upto:end]
+            events.append(JsonStringDelta(path=path, text=json.loads(f'"{raw}"')))
+            self._streamed_upto = end
+
+    def _complete(self, start: int, end: int, events: List[JsonEvent], path: Optional[Path] = None) -> None:
+        """Handle a value that ended at ``end``, reporting it if it is shallow enough"""
+        if path is None:
+            path = self._stack[-1].child_path()
+        if len(path) <= self.max_depth:
+            events.append(JsonValue(path=path, value=json.loads(self.buffer[start:end])))
+        if not self._stack:
+            self.done = True
+            return
+        self._stack[-1].state = "comma"
+
+    def result(self) -> Any:
+        """Parse the complete document"""
+        if not self.done:
+            raise ValueError("JSON document is incomplete")
+        start = next(index for index, char in enumerate(self.buffer) if char in "{[")
+        return json.loads(self.buffer[start:self._pos])
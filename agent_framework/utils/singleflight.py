@@ -0,0 +1,73 @@
+"""Coalescing of identical concurrent calls"""
+import asyncio
+import copy
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+@dataclass
+class SingleFlightStats:
+    """Counters describing how many calls were coalesced"""
+    calls: int = 0
+    coalesced: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Get the counters as a plain dict"""
+        return asdict(self)
+
+class _Flight:
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Runs at most one call per key at a time, sharing its outcome with every caller
+
+    Callers arriving while a call with the same key is in flight await the
+    same result or exception instead of starting a duplicate. The call runs
+    as its own task, so cancelling one caller leaves it running for the
+    others; it is only cancelled once every caller has gone. Callers that
+    joined an existing flight get a deep copy of the result, so no two
+    callers share a mutable result.
+    """
+
+    def __init__(self, copy_results: bool = True):
+        self.copy_results = copy_results
+        self.stats = SingleFlightStats()
+        self._flights: Dict[str, _Flight] = {}
+
+    def in_flight(self, key: str) -> bool:
+        """Check whether a call with the key is currently running"""
+        return key in self._flights
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run the call, or join the call already running under the same key"""
+        self.stats.calls += 1
+        flight = self._flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.stats.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+        if leader or not self.copy_results:
+            return result
+        return copy.deepcopy(result)
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Retrieve the outcome so failures nobody awaited aren't reported as unhandled
+        if not flight.task.cancelled():
+            flight.task.exception()
@@ -0,0 +1,37 @@
+"""Token count estimates for LLM requests"""
+from functools import lru_cache
+from typing import Any, Optional, Sequence
+
+# Tokens OpenAI chat models add around every message for role and framing
+MESSAGE_OVERHEAD = 4
+# Rough characters per token for English text when no tokenizer is installed
+CHARS_PER_TOKEN = 4
+
+@lru_cache(maxsize=16)
+def _encoding(model: str) -> Optional[Any]:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """Count tokens in text, using tiktoken when it is installed and a character estimate otherwise"""
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def estimate_message_tokens(messages: Sequence[Any], model: str = "gpt-4") -> int:
+    """Estimate prompt tokens for chat messages, given as LLMMessage objects or dicts"""
+    total = 3  # Every reply is primed with the assistant role
+    for message in messages:
+        if isinstance(message, dict):
+            content = message.get("content") or ""
+        else:
+            content = getattr(message, "content", "") or ""
+        total += MESSAGE_OVERHEAD + count_tokens(str(content), model)
+    return total
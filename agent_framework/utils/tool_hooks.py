@@ -1,6 +1,7 @@
 from typing import Any, Dict, List, Optional
 from datetime import datetime
-from .hooks import ToolContext, ToolHooks, ToolSelectionHooks
+from ..models import ToolContext
+from .hooks import ToolHooks, ToolSelectionHooks
 from .logging import AgentLogger
 
 class LoggingToolHooks(ToolHooks):
@@ -1,14 +1,81 @@
-from typing import Dict, List, Optional, Type, Any
+import asyncio
+import copy
+from types import MappingProxyType
+from typing import Any, AsyncContextManager, Callable, Dict, FrozenSet, List, Mapping, Optional, Set, Type
 from dataclasses import dataclass, field
 from ..models import Tool, ToolMetadata
 from ..tools.base import BaseTool
+from ..tools.pool import ToolInstancePool
+from ..tools.validation import SchemaViolation, ToolValidators
+from ..http import HttpClientPool
+from .hashing import stable_hash
+
+def _read_only(*args: Any, **kwargs: Any) -> None:
+    raise TypeError("Registry snapshots are read-only; copy them to make changes")
+
+class _FrozenDict(dict):
+    """Read-only dict that still serializes to JSON like a plain one; copies are plain dicts"""
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+class _FrozenList(list):
+    """Read-only list that still serializes to JSON like a plain one; copies are plain lists"""
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self) -> List[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Any]:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return _FrozenList(_freeze(item) for item in value)
+    return value
 
 @dataclass
 class ToolRegistry:
-    """Central registry for tool management"""
+    """Central registry for tool management
+
+    Every change to the registered tools bumps ``version``. Derived views
+    (the tag index, formatted tool list and fingerprint) are built once per
+    version and shared as read-only snapshots, which raise TypeError if
+    modified. Downstream caches can key on the version to know when to rebuild.
+
+    Tool instances get the registry's ``http_pool``. A pool passed in is
+    shared, so ``aclose`` leaves it to its owner and only closes a pool the
+    registry created itself.
+    """
     
     tools: Dict[str, Tool] = field(default_factory=dict)
     _implementations: Dict[str, Type["BaseTool"]] = field(default_factory=dict)
+    http_pool: Optional[HttpClientPool] = field(default=None, repr=False)
+    _pools: Dict[str, ToolInstancePool] = field(default_factory=dict, repr=False)
+    _retired_pools: List[ToolInstancePool] = field(default_factory=list, repr=False)
+    _tag_index: Dict[str, Set[str]] = field(default_factory=dict, repr=False)
+    _validators: Dict[str, ToolValidators] = field(default_factory=dict, repr=False)
+    _snapshots: Dict[str, Any] = field(default_factory=dict, repr=False)
+    _fingerprint: Optional[str] = field(default=None, repr=False)
+    version: int = field(default=0, repr=False)
+
+    def __post_init__(self) -> None:
+        self._owns_http_pool = self.http_pool is None
+        if self.http_pool is None:
+            self.http_pool = HttpClientPool()
     
     def register(self, *, metadata: ToolMetadata, implementation: Type["BaseTool"]) -> None:
         """Register a tool and its implementation"""
@@ -25,8 +92,42 @@ class ToolRegistry:
             hooks=None  # Hooks will be set by the agent
         )
             
+        pool = ToolInstancePool(implementation, http_pool=self.http_pool)
         self.tools[metadata.name] = tool
         self._implementations[metadata.name] = implementation
+        self._pools[metadata.name] = pool
+        self._validators[metadata.name] = ToolValidators.for_schemas(tool.input_schema, tool.output_schema)
+        for tag in tool.tags:
+            self._tag_index.setdefault(tag, set()).add(tool.name)
+        self._changed()
+
+    def unregister(self, name: str) -> None:
+        """Remove a tool; its instances are torn down when the registry is closed
+
+        Raises KeyError if no tool is registered under the name.
+        """
+        tool = self.tools.pop(name)
+        self._implementations.pop(name, None)
+        self._validators.pop(name, None)
+        if (pool := self._pools.pop(name, None)) is not None:
+            self._retired_pools.append(pool)
+        for tag in tool.tags:
+            names = self._tag_index.get(tag)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._tag_index[tag]
+        self._changed()
+
+    def _changed(self) -> None:
+        self.version += 1
+        self._fingerprint = None
+        self._snapshots.clear()
+
+    def _snapshot(self, key: str, build: Callable[[], Any]) -> Any:
+        if key not in self._snapshots:
+            self._snapshots[key] = build()
+        return self._snapshots[key]
     
     def get_tool(self, name: str) -> Optional[Tool]:
         """Get tool by name"""
@@ -36,23 +137,98 @@ class ToolRegistry:
         """Get tool implementation by name"""
         return self._implementations.get(name)
     
+    def validate_inputs(self, name: str, inputs: Dict[str, Any]) -> List[SchemaViolation]:
+        """Check call inputs against the tool's input schema, compiled when it was registered"""
+        validators = self._validators.get(name)
+        return validators.validate_inputs(inputs) if validators else []
+
+    def validate_output(self, name: str, output: Any) -> List[SchemaViolation]:
+        """Check a tool result against the tool's output schema"""
+        validators = self._validators.get(name)
+        return validators.validate_output(output) if validators else []
+
+    def acquire(self, name: str) -> AsyncContextManager[BaseTool]:
+        """Borrow a ready-to-use instance of a tool for one call
+
+        Raises KeyError if no implementation is registered under the name.
+        """
+        return self._pools[name].acquire()
+
+    async def warm_up(self) -> None:
+        """Open HTTP connections to the hosts registered tools declare"""
+        await self.http_pool.warm_up(
+            host
+            for implementation in self._implementations.values()
+            for host in getattr(implementation, "http_hosts", ())
+        )
+
+    async def aclose(self) -> None:
+        """Tear down all tool instances created by the registry and close its own HTTP connections"""
+        pools = [*self._pools.values(), *self._retired_pools]
+        self._retired_pools.clear()
+        await asyncio.gather(*(pool.close() for pool in pools))
+        if self._owns_http_pool:
+            await self.http_pool.close()
+
     def list_tools(self) -> List[Tool]:
         """Get list of all registered tools"""
         return list(self.tools.values())
+
+    def tag_index(self) -> Mapping[str, FrozenSet[str]]:
+        """Get a read-only mapping of each tag to the names of the tools that have it"""
+        return self._snapshot("tag_index", lambda: MappingProxyType({
+            tag: frozenset(names) for tag, names in self._tag_index.items()
+        }))
     
     def get_tools_by_tags(self, tags: List[str]) -> List[Tool]:
         """Get tools that have all specified tags"""
-        return [
-            tool for tool in self.tools.values()
-            if all(tag in tool.tags for tag in tags)
-        ]
+        if not tags:
+            return self.list_tools()
+        index = self.tag_index()
+        matches = frozenset.intersection(*(index.get(tag, frozenset()) for tag in tags))
+        if len(matches) == len(self.tools):
+            return self.list_tools()
+        # Keep registration order
+        order = self._snapshot("order", lambda: {name: position for position, name in enumerate(self.tools)})
+        return [self.tools[name] for name in sorted(matches, key=order.__getitem__)]
     
-    def get_all_tools(self) -> Dict[str, Tool]:
-        """Get all registered tools"""
-        return self.tools.copy() 
+    def fingerprint(self) -> str:
+        """Get a hash of the registered tools' names and schemas
+
+        The hash only changes when the set of tools or their schemas change,
+        so it can be used to key caches that depend on the available tools
+        and outlive the process, unlike ``version``.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = stable_hash([
+                [tool.name, tool.input_schema, tool.output_schema]
+                for tool in sorted(self.tools.values(), key=lambda tool: tool.name)
+            ])
+        return self._fingerprint
 
-    def get_formatted_tools(self) -> List[Dict[str, Any]]:
-        """Format tools into OpenAI function calling format
+    def get_all_tools(self) -> Mapping[str, Tool]:
+        """Get a read-only view of all registered tools"""
+        return self._snapshot("all_tools", lambda: MappingProxyType(dict(self.tools)))
+
+    def _formatted_by_name(self) -> Mapping[str, Dict[str, Any]]:
+        return self._snapshot("formatted", lambda: MappingProxyType({
+            tool.name: _freeze({
+                "type": "function",
+                "function": {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": {
+                        "type": "object",
+                        "properties": tool.input_schema.get("properties", {}),
+                        "required": tool.input_schema.get("required", [])
+                    }
+                }
+            })
+            for tool in self.tools.values()
+        }))
+
+    def get_formatted_tools(self, names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Format tools, or only the named ones, into OpenAI function calling format
         
         Returns a list of tools formatted as:
         {
@@ -67,20 +243,12 @@ class ToolRegistry:
                 }
             }
         }
+
+        The tool dicts are shared between calls, so they are read-only and
+        raise TypeError if modified; ``copy.deepcopy`` gives a plain, mutable
+        copy. They serialize to JSON like plain dicts.
         """
-        formatted_tools = []
-        for tool in self.list_tools():
-            tool_schema = tool.input_schema
-            formatted_tools.append({
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": {
-                        "type": "object",
-                        "properties": tool_schema.get("properties", {}),
-                        "required": tool_schema.get("required", [])
-                    }
-                }
-            })
-        return formatted_tools
+        formatted = self._formatted_by_name()
+        if names is None:
+            return self._snapshot("formatted_list", lambda: _FrozenList(formatted.values()))
+        return [formatted[name] for name in names if name in formatted]
@@ -0,0 +1,88 @@
+"""Microbenchmark compiled tool schema validation against naive per-call validation
+
+Run from the repository root:
+
+    python -m benchmarks.bench_schema_validation
+
+Compares, per call, for a small flat schema and a nested schema:
+  - compiled: the validator compiled once at registration and reused
+  - recompiled: compiling the schema on every call
+  - pydantic: constructing the tool's Pydantic input model on every call,
+    as tools that validate their own inputs do
+"""
+import argparse
+import timeit
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from agent_framework.tools.validation import SchemaValidator, compile_schema
+
+class Coordinates(BaseModel):
+    latitude: float
+    longitude: float
+
+class Location(BaseModel):
+    address: str
+    city: str
+    country: str
+    coordinates: Coordinates
+
+class Restaurant(BaseModel):
+    name: str
+    rating: float
+    review_count: int
+    cuisine_types: List[str]
+    location: Location
+    url: Optional[str] = None
+
+class RestaurantList(BaseModel):
+    restaurants: List[Restaurant]
+    total_found: int
+
+class WeatherInput(BaseModel):
+    location: str
+    days: int = 1
+    units: str = "metric"
+
+def restaurant(index: int) -> Dict[str, Any]:
+    return {
+        "name": f"Restaurant {index}",
+        "rating": 4.5,
+        "review_count": 120,
+        "cuisine_types": ["italian", "pizza"],
+        "location": {
+            "address": "1 Main St",
+            "city": "Seattle",
+            "country": "US",
+            "coordinates": {"latitude": 47.6, "longitude": -122.3}
+        },
+        "url": None
+    }
+
+CASES = {
+    "flat": (WeatherInput, {"location": "Seattle, WA", "days": 3, "units": "metric"}),
+    "nested x10": (RestaurantList, {"restaurants": [restaurant(i) for i in range(10)], "total_found": 10}),
+}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'case':>12} {'compiled us':>12} {'recompiled us':>14} {'pydantic us':>12}")
+    for case, (model, value) in CASES.items():
+        schema = model.model_json_schema()
+        validator = compile_schema(schema)
+        assert validator.validate(value) == []
+
+        def per_call(statement) -> float:
+            return timeit.timeit(statement, number=args.number) / args.number * 1e6
+
+        compiled = per_call(lambda: validator.validate(value))
+        recompiled = per_call(lambda: SchemaValidator(schema).validate(value))
+        pydantic = per_call(lambda: model(**value))
+        print(f"{case:>12} {compiled:>12.2f} {recompiled:>14.2f} {pydantic:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark tool shortlisting on synthetic registries
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tool_retrieval
+
+Each synthetic tool covers one action on one subject in one domain. Each
+query asks for one tool in different words, with some of the tool's
+terms left out and unrelated words added. Reports the index build time,
+query latency, recall@k (how often the wanted tool is shortlisted), the
+rate of low-confidence fallbacks, and the planning catalog size with
+and without shortlisting.
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+from agent_framework.models import ToolMetadata
+from agent_framework.planning.catalog import ToolCatalog
+from agent_framework.tools.base import BaseTool
+from agent_framework.tools.retrieval import HashingEmbedding, ToolIndex, ToolRetriever
+from agent_framework.utils.tool_registry import ToolRegistry
+
+DOMAINS = [
+    "weather", "restaurant", "event", "flight", "hotel", "music", "movie", "stock", "news", "calendar",
+    "email", "github", "invoice", "recipe", "fitness", "translation", "map", "traffic", "sports", "podcast"
+]
+ACTIONS = ["search", "get", "create", "update", "delete", "summarize", "recommend", "compare", "track", "book"]
+SUBJECTS = [
+    "forecast", "review", "listing", "price", "schedule", "alert", "report", "history", "detail", "ranking",
+    "playlist", "ticket", "reservation", "route", "profile"
+]
+FILLER = ["please", "quickly", "for my trip", "today", "I need to", "can you", "help me", "tomorrow"]
+
+class SyntheticTool(BaseTool):
+    async def execute(self, **inputs: Any) -> Dict[str, Any]:
+        return {}
+
+def build_registry(size: int, rng: random.Random) -> Tuple[ToolRegistry, List[Tuple[str, str, str, str]]]:
+    combos = [(d, a, s) for d in DOMAINS for a in ACTIONS for s in SUBJECTS]
+    rng.shuffle(combos)
+    registry = ToolRegistry()
+    specs = []
+    for domain, action, subject in combos[:size]:
+        name = f"{domain}_{subject}_{action}"
+        registry.register(
+            metadata=ToolMetadata(
+                name=name,
+                description=f"{action.title()} {domain} {subject}s for a location or user",
+                tags=[domain, subject, action],
+                input_schema={
+                    "type": "object",
+                    "properties": {"location": {"type": "string"}, f"{subject}_id": {"type": "string"}},
+                    "required": ["location"]
+                },
+                output_schema={"type": "object", "properties": {f"{subject}s": {"type": "array", "items": {"type": "object"}}}}
+            ),
+            implementation=SyntheticTool
+        )
+        specs.append((name, domain, action, subject))
+    return registry, specs
+
+def make_query(spec: Tuple[str, str, str, str], rng: random.Random) -> str:
+    _, domain, action, subject = spec
+    words = [domain, subject + rng.choice(["", "s"]), action]
+    if rng.random() < 0.3:
+        words.remove(rng.choice(words))  # Underspecified queries
+    rng.shuffle(words)
+    return " ".join(rng.sample(FILLER, 2) + words)
+
+def run(size: int, queries: int, k: int, embedding: bool, rng: random.Random) -> Dict[str, Any]:
+    registry, specs = build_registry(size, rng)
+    index = ToolIndex(registry, embedding=HashingEmbedding() if embedding else None)
+    retriever = ToolRetriever(index, k=k)
+    catalog = ToolCatalog(registry)
+
+    started = time.perf_counter()
+    index.search("warm up", 1)
+    build_time = time.perf_counter() - started
+
+    latencies, hits, fallbacks, tokens = [], 0, 0, []
+    for _ in range(queries):
+        spec = rng.choice(specs)
+        query = make_query(spec, rng)
+        started = time.perf_counter()
+        shortlist = retriever.shortlist(query)
+        latencies.append(time.perf_counter() - started)
+        hits += spec[0] in shortlist
+        fallbacks += len(shortlist) > k
+        tokens.append(catalog.tokens(shortlist))
+
+    latencies.sort()
+    return {
+        "tools": size,
+        "build_ms": build_time * 1000,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "recall": hits / queries,
+        "fallback": fallbacks / queries,
+        "catalog_tokens": catalog.tokens(),
+        "shortlist_tokens": statistics.mean(tokens)
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("-k", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    header = f"{'tools':>6} {'backend':>10} {'build ms':>9} {'p50 ms':>7} {'p95 ms':>7} {'recall@k':>9} {'fallback':>9} {'catalog tok':>12} {'shortlist tok':>14}"
+    print(header)
+    for size in args.sizes:
+        for embedding in (False, True):
+            result = run(size, args.queries, args.k, embedding, random.Random(args.seed))
+            print(
+                f"{result['tools']:>6} {'bm25+hash' if embedding else 'bm25':>10} {result['build_ms']:>9.1f} "
+                f"{result['p50_ms']:>7.2f} {result['p95_ms']:>7.2f} {result['recall']:>9.1%} "
+                f"{result['fallback']:>9.1%} {result['catalog_tokens']:>12} {result['shortlist_tokens']:>14.0f}"
+            )
+
+if __name__ == "__main__":
+    main()
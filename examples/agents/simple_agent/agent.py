@@ -3,7 +3,7 @@ from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
 
 from agent_framework.agent import Agent
-from agent_framework.state import AgentState
+from agent_framework.context import RunContext
 from agent_framework.models import VerbosityLevel, ToolSelectionHooks
 from agent_framework.llm.models import LLMConfig
 from agent_framework.llm.openai_provider import OpenAIProvider
@@ -29,7 +29,6 @@ class SimpleAgent(Agent):
             metadata=metadata,
             llm_provider=llm_provider
         )
-        self.state = AgentState()
         
         # Set up template environment
         template_dir = Path(__file__).parent / "templates"
@@ -64,7 +63,7 @@ class SimpleAgent(Agent):
             implementation=KeywordExtractorTool
         )
 
-    async def _format_result(self, task: str, results: List[tuple[str, Dict[str, Any]]]) -> str:
+    async def _format_result(self, task: str, results: List[tuple[str, Dict[str, Any]]], run: RunContext) -> str:
         """Format the final result from tool executions"""
         # Simple agent just returns the raw results
         return str(results) 
\ No newline at end of file
@@ -2,7 +2,7 @@ from typing import List, Dict, Any, Tuple
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
 from agent_framework.agent import Agent
-from agent_framework.state import AgentState
+from agent_framework.context import RunContext
 from agent_framework.llm.models import LLMMessage
 from .tools.event_finder import EventFinderTool
 from .tools.weather_retriever import WeatherRetrieverTool
@@ -14,7 +14,6 @@ class TravelAgent(Agent):
     """Agent that helps users find weather-appropriate events and matching restaurants"""
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.state = AgentState()
         
         # Set up template environment
         template_dir = Path(__file__).parent / "templates"
@@ -29,14 +28,7 @@ class TravelAgent(Agent):
 
     def _create_planning_prompt(self, task: str) -> List[LLMMessage]:
         """Create a planning prompt for travel planning"""
-        tools_description = "\n".join([
-            f"Tool: {tool.name}\n"
-            f"Description: {tool.description}\n"
-            f"Tags: {', '.join(tool.tags)}\n"
-            f"Input Schema: {tool.input_schema}\n"
-            f"Output Schema: {tool.output_schema}\n"
-            for tool in self.tool_registry.get_all_tools().values()
-        ])
+        tools_description = self.tool_catalog.render(self._planning_tools(task))
 
         # Get the planning template
         template = self.template_env.get_template("planning.j2")
@@ -83,7 +75,7 @@ class TravelAgent(Agent):
 
         self._setup_logger(logger=self.logger)
 
-    async def _format_result(self, task: str, results: List[Tuple[str, Dict[str, Any]]]) -> str:
+    async def _format_result(self, task: str, results: List[Tuple[str, Dict[str, Any]]], run: RunContext) -> str:
         """Format the final result showing the connection between events, weather, and dining"""
         # Since itinerary_builder is the last tool executed and contains the complete narrative,
         # we should use its output as the final result
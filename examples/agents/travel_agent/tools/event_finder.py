@@ -4,11 +4,15 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from agent_framework.tools.base import BaseTool
+from agent_framework.tools.cache import ToolCachePolicy
 from agent_framework.models import ToolMetadata
 
 class EventFinderTool(BaseTool):
     """Tool for finding local events using Ticketmaster API"""
 
+    http_hosts = ["https://app.ticketmaster.com"]
+    cache_policy = ToolCachePolicy(ttl=3600, stale_while_revalidate=600)
+
     @classmethod
     def get_metadata(cls) -> ToolMetadata:
         """Get tool metadata"""
@@ -170,20 +174,20 @@ class EventFinderTool(BaseTool):
                 raise ValueError(f"Invalid category. Must be one of: {', '.join(self.CATEGORY_MAPPING.keys())}")
             params["segmentId"] = self.CATEGORY_MAPPING[category]
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(base_url, params=params) as response:
-                    if response.status == 401:
-                        raise ValueError("Invalid API key")
-                    elif response.status == 429:
-                        raise Exception("Rate limit exceeded. Please try again later.")
-                    elif response.status != 200:
-                        raise Exception(f"Ticketmaster API error: {await response.text()}")
+        session = await self.http.session()
+        try:
+            async with session.get(base_url, params=params) as response:
+                if response.status == 401:
+                    raise ValueError("Invalid API key")
+                elif response.status == 429:
+                    raise Exception("Rate limit exceeded. Please try again later.")
+                elif response.status != 200:
+                    raise Exception(f"Ticketmaster API error: {await response.text()}")
                     
-                    data = await response.json()
+                data = await response.json()
 
-            except aiohttp.ClientError as e:
-                raise Exception(f"Network error while fetching events: {str(e)}")
+        except aiohttp.ClientError as e:
+            raise Exception(f"Network error while fetching events: {str(e)}")
 
         # Process results
         events = []
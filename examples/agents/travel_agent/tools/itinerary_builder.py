@@ -5,6 +5,7 @@ from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 from agent_framework.tools.base import BaseTool
+from agent_framework.events import is_streaming, emit_token
 from agent_framework.models import ToolMetadata
 from agent_framework.llm.openai_provider import OpenAIProvider
 from agent_framework.llm.models import LLMMessage, LLMConfig
@@ -40,6 +41,10 @@ class ItineraryBuilderTool(BaseTool):
         )
         self.llm = OpenAIProvider(config=llm_config)
 
+    async def teardown(self) -> None:
+        """Close the LLM client's HTTP connections"""
+        await self.llm.client.close()
+
     @classmethod
     def get_metadata(cls) -> ToolMetadata:
         """Get tool metadata"""
@@ -120,11 +125,23 @@ class ItineraryBuilderTool(BaseTool):
         ]
 
         try:
-            # Generate the itinerary using structured output
-            response = await self.llm.generate_structured(
-                messages=prompt,
-                output_model=ItineraryOutput
-            )
+            if is_streaming():
+                # Stream the narrative as it is generated; the stream ends with the validated output
+                async for chunk in self.llm.generate_structured_stream(
+                    messages=prompt,
+                    output_model=ItineraryOutput,
+                    stream_fields=["itinerary"]
+                ):
+                    if chunk.text:
+                        await emit_token(chunk.text)
+                    elif chunk.result is not None:
+                        response = chunk.result
+            else:
+                # Generate the itinerary using structured output
+                response = await self.llm.generate_structured(
+                    messages=prompt,
+                    output_model=ItineraryOutput
+                )
             
             return {
                 "itinerary": response.itinerary,
@@ -3,11 +3,15 @@ import os
 from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 from agent_framework.tools.base import BaseTool
+from agent_framework.tools.cache import ToolCachePolicy
 from agent_framework.models import ToolMetadata
 
 class RestaurantRecommenderTool(BaseTool):
     """Tool for finding and recommending restaurants using Yelp Fusion API"""
 
+    http_hosts = ["https://api.yelp.com"]
+    cache_policy = ToolCachePolicy(ttl=3600, stale_while_revalidate=600)
+
     # Price level mapping for Yelp API
     PRICE_LEVELS = {
         "budget": "1,2",      # $ and $$
@@ -204,20 +208,20 @@ class RestaurantRecommenderTool(BaseTool):
         if cuisine:
             params["categories"] = cuisine
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(base_url, headers=headers, params=params) as response:
-                    if response.status == 401:
-                        raise ValueError("Invalid API key")
-                    elif response.status == 429:
-                        raise Exception("Rate limit exceeded. Please try again later.")
-                    elif response.status != 200:
-                        raise Exception(f"Yelp API error: {await response.text()}")
+        session = await self.http.session()
+        try:
+            async with session.get(base_url, headers=headers, params=params) as response:
+                if response.status == 401:
+                    raise ValueError("Invalid API key")
+                elif response.status == 429:
+                    raise Exception("Rate limit exceeded. Please try again later.")
+                elif response.status != 200:
+                    raise Exception(f"Yelp API error: {await response.text()}")
                     
-                    data = await response.json()
+                data = await response.json()
 
-            except aiohttp.ClientError as e:
-                raise Exception(f"Network error while fetching restaurants: {str(e)}")
+        except aiohttp.ClientError as e:
+            raise Exception(f"Network error while fetching restaurants: {str(e)}")
 
         # Filter results by minimum rating
         restaurants = []
@@ -1,13 +1,16 @@
-import aiohttp
 import os
 from typing import Dict, Any, List
 from dotenv import load_dotenv
 from agent_framework.tools.base import BaseTool
+from agent_framework.tools.cache import ToolCachePolicy
 from agent_framework.models import ToolMetadata
 
 class WeatherRetrieverTool(BaseTool):
     """Tool for retrieving weather data"""
 
+    http_hosts = ["http://api.weatherapi.com"]
+    cache_policy = ToolCachePolicy(ttl=600, key_fields=["location"], stale_while_revalidate=300)
+
     @classmethod
     def get_metadata(cls) -> ToolMetadata:
         """Get tool metadata"""
@@ -46,23 +49,23 @@ class WeatherRetrieverTool(BaseTool):
         # API endpoint
         url = "http://api.weatherapi.com/v1/current.json"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url,
-                params={
-                    "key": api_key,
-                    "q": location,
-                    "aqi": "no"
-                }
-            ) as response:
-                if response.status != 200:
-                    raise Exception(f"Weather API error: {await response.text()}")
+        session = await self.http.session()
+        async with session.get(
+            url,
+            params={
+                "key": api_key,
+                "q": location,
+                "aqi": "no"
+            }
+        ) as response:
+            if response.status != 200:
+                raise Exception(f"Weather API error: {await response.text()}")
                     
-                data = await response.json()
+            data = await response.json()
                 
-                return {
-                    "location": data["location"]["name"],
-                    "temperature": data["current"]["temp_c"],
-                    "weather_condition": data["current"]["condition"]["text"],
-                    "precipitation_chance": data["current"].get("precip_mm", 0) * 100  # Convert to percentage
-                } 
\ No newline at end of file
+            return {
+                "location": data["location"]["name"],
+                "temperature": data["current"]["temp_c"],
+                "weather_condition": data["current"]["condition"]["text"],
+                "precipitation_chance": data["current"].get("precip_mm", 0) * 100  # Convert to percentage
+            } 
\ No newline at end of file
@@ -75,8 +75,8 @@ class GalileoAgentLogger(AgentLogger):
                 # Always include complete context in the input
                 input_data = {
                     "task": context.task,
-                    "message_history": context.message_history or [],
-                    "available_tools": context.available_tools,
+                    "message_history": list(context.message_history),
+                    "available_tools": list(context.available_tools),
                     "previous_tools": context.previous_tools,
                     "previous_results": context.previous_results
                 }
@@ -100,7 +100,7 @@ class GalileoAgentLogger(AgentLogger):
                         "confidence": confidence,
                         "reasoning": reasoning
                     },
-                    tools=context.available_tools,
+                    tools=list(context.available_tools),
                     metadata={"type": "selection"}
                 )
         
@@ -4,7 +4,8 @@ from jinja2 import Environment, FileSystemLoader
 
 from agent_framework.agent import Agent
 from agent_framework.llm.models import LLMMessage
-from agent_framework.state import AgentState
+from agent_framework.context import RunContext
+from agent_framework.planning import PipelineStep
 from typing import Sequence, Union
 
 from .tools.weather_retriever import WeatherRetrieverTool
@@ -14,10 +15,29 @@ from .logging.GalileoAgentLogger import GalileoAgentLogger
 
 class WeatherVibesAgent(Agent):
     """Agent that determines if you need an umbrella and suggests weather-appropriate YouTube videos"""
+
+    # The task is a location and the tools always run in the same order,
+    # so there is nothing for the LLM to plan
+    pipeline = [
+        PipelineStep(
+            tool="weather_retriever",
+            reasoning="First, get weather data",
+            input_mapping={"location": "{task}"}
+        ),
+        PipelineStep(
+            tool="umbrella_decider",
+            reasoning="Then, decide if umbrella needed",
+            input_mapping={"weather_data": "weather_retriever"}
+        ),
+        PipelineStep(
+            tool="youtube_weather_vibes",
+            reasoning="Finally, find videos matching the weather vibe",
+            input_mapping={"weather_data": "weather_retriever"}
+        ),
+    ]
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.state = AgentState()
         
         # Set up template environment
         template_dir = Path(__file__).parent / "templates"
@@ -55,11 +75,15 @@ class WeatherVibesAgent(Agent):
         
         self._setup_logger(logger=self.logger)
 
-    async def _format_result(self, task: str, results: List[Tuple[str, Dict[str, Any]]]) -> str:
+    def _plan_template(self, task: str) -> Tuple[str, Dict[str, str]]:
+        """The task is just a location, so every run shares one cached plan"""
+        return "{location}", {"location": task.strip()}
+
+    async def _format_result(self, task: str, results: List[Tuple[str, Dict[str, Any]]], run: RunContext) -> str:
         """Format the final result from tool executions"""
-        weather_data = self.state.get_tool_result("weather_retriever")
-        umbrella_needed = self.state.get_tool_result("umbrella_decider")
-        youtube_vibes = self.state.get_tool_result("youtube_weather_vibes")
+        weather_data = run.state.get_tool_result("weather_retriever")
+        umbrella_needed = run.state.get_tool_result("umbrella_decider")
+        youtube_vibes = run.state.get_tool_result("youtube_weather_vibes")
         
         # Format umbrella decision
         result = "You need an umbrella today!" if umbrella_needed else "No umbrella needed today!"
@@ -1,4 +1,3 @@
-import aiohttp
 import os
 from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
@@ -10,6 +9,8 @@ from pydantic import BaseModel
 class YoutubeWeatherVibesTool(BaseTool):
     """Tool for finding YouTube videos that match weather vibes"""
 
+    http_hosts = ["https://www.googleapis.com"]
+
     @classmethod
     def get_metadata(cls) -> ToolMetadata:
         """Get tool metadata"""
@@ -123,43 +124,43 @@ class YoutubeWeatherVibesTool(BaseTool):
         # API endpoint
         url = "https://www.googleapis.com/youtube/v3/search"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url,
-                params={
-                    "key": api_key,
-                    "part": "snippet",
-                    "q": search_query,
-                    "type": "video",
-                    "maxResults": 5,
-                    "videoEmbeddable": "true"
-                }
-            ) as response:
-                if response.status != 200:
-                    raise Exception(f"YouTube API error: {await response.text()}")
+        session = await self.http.session()
+        async with session.get(
+            url,
+            params={
+                "key": api_key,
+                "part": "snippet",
+                "q": search_query,
+                "type": "video",
+                "maxResults": 5,
+                "videoEmbeddable": "true"
+            }
+        ) as response:
+            if response.status != 200:
+                raise Exception(f"YouTube API error: {await response.text()}")
                     
-                data = await response.json()
+            data = await response.json()
                 
-                videos = []
-                for item in data.get("items", []):
-                    video_id = item.get("id", {}).get("videoId")
-                    if video_id:
-                        videos.append({
-                            "title": item.get("snippet", {}).get("title", ""),
-                            "channel_title": item.get("snippet", {}).get("channelTitle", ""),
-                            "description": item.get("snippet", {}).get("description", ""),
-                            "thumbnail_url": item.get("snippet", {}).get("thumbnails", {}).get("high", {}).get("url", ""),
-                            "video_id": video_id,
-                            "video_url": f"https://www.youtube.com/watch?v={video_id}"
-                        })
+            videos = []
+            for item in data.get("items", []):
+                video_id = item.get("id", {}).get("videoId")
+                if video_id:
+                    videos.append({
+                        "title": item.get("snippet", {}).get("title", ""),
+                        "channel_title": item.get("snippet", {}).get("channelTitle", ""),
+                        "description": item.get("snippet", {}).get("description", ""),
+                        "thumbnail_url": item.get("snippet", {}).get("thumbnails", {}).get("high", {}).get("url", ""),
+                        "video_id": video_id,
+                        "video_url": f"https://www.youtube.com/watch?v={video_id}"
+                    })
                 
-                return {
-                    "weather_condition": weather_condition,
-                    "temperature": temperature,
-                    "search_query": search_query,
-                    "videos": videos,
-                    "mock_data": False
-                }
+            return {
+                "weather_condition": weather_condition,
+                "temperature": temperature,
+                "search_query": search_query,
+                "videos": videos,
+                "mock_data": False
+            }
     
     def _generate_search_query(self, weather_condition: str, temperature: float) -> str:
         """Generate a search query based on weather condition and temperature"""
@@ -0,0 +1,89 @@
+"""Small tools and an agent for exercising runs without an API"""
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from agent_framework.agent import Agent
+from agent_framework.context import RunContext
+from agent_framework.models import TaskAnalysis, ToolMetadata, VerbosityLevel
+from agent_framework.tools.base import BaseTool
+
+class CallLog:
+    """Records the order in which tools start and finish"""
+
+    def __init__(self):
+        self.events: List[tuple] = []
+
+    def calls(self, tool_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the inputs of every call, or only of calls to ``tool_name``"""
+        return [
+            inputs for event, name, inputs in self.events
+            if event == "start" and (tool_name is None or name == tool_name)
+        ]
+
+    def position(self, event: str, tool_name: str) -> int:
+        """Get the position of the first ``event`` ("start" or "end") of a tool"""
+        return next(
+            position for position, (logged, name, _) in enumerate(self.events)
+            if logged == event and name == tool_name
+        )
+
+def make_tool(
+    name: str,
+    log: CallLog,
+    properties: Optional[Dict[str, Any]] = None,
+    required: Optional[List[str]] = None,
+    delay: float = 0.0,
+    result: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    fail: Callable[[int], bool] = lambda call: False,
+    output_title: Optional[str] = None
+) -> Type[BaseTool]:
+    """Create a tool that logs its calls, sleeps for ``delay`` and fails on the calls ``fail`` picks"""
+
+    class LoggingTool(BaseTool):
+        calls = 0
+
+        @classmethod
+        def get_metadata(cls) -> ToolMetadata:
+            return ToolMetadata(
+                name=name,
+                description=f"The {name} tool",
+                tags=[name],
+                input_schema={"type": "object", "properties": properties or {}, "required": required or []},
+                output_schema={"type": "object", "title": output_title or f"{name}_output"}
+            )
+
+        async def execute(self, **inputs: Any) -> Dict[str, Any]:
+            call = type(self).calls
+            type(self).calls += 1
+            log.events.append(("start", name, inputs))
+            await asyncio.sleep(delay)
+            log.events.append(("end", name, inputs))
+            if fail(call):
+                raise RuntimeError(f"{name} failed")
+            return result(inputs) if result else {"tool": name, "inputs": inputs}
+
+    LoggingTool.__name__ = f"{name}_tool"
+    return LoggingTool
+
+def make_plan(*steps: Dict[str, Any]) -> TaskAnalysis:
+    """Build a plan from execution plan steps"""
+    return TaskAnalysis(
+        input_analysis="test plan",
+        available_tools=[step["tool"] for step in steps],
+        tool_capabilities={},
+        execution_plan=[{"reasoning": f"Run {step['tool']}", **step} for step in steps],
+        requirements_coverage={},
+        chain_of_thought=[]
+    )
+
+class ToolAgent(Agent):
+    """Agent with the given tools whose result is the list of tool names and results"""
+
+    def __init__(self, tools: List[Type[BaseTool]], **kwargs: Any):
+        kwargs.setdefault("verbosity", VerbosityLevel.NONE)
+        super().__init__(**kwargs)
+        for tool in tools:
+            self.tool_registry.register(metadata=tool.get_metadata(), implementation=tool)
+
+    async def _format_result(self, task: str, results: List[tuple], run: RunContext) -> List[tuple]:
+        return results
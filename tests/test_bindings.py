@@ -0,0 +1,65 @@
+"""Plan steps compiled into input bindings"""
+import pytest
+
+from agent_framework.exceptions import BindingError
+from agent_framework.planning import BindingCompiler
+from agent_framework.planning.bindings import LiteralValue, StepOutput, TaskText
+from agent_framework.utils.tool_registry import ToolRegistry
+
+from tests.helpers import CallLog, make_tool
+
+def compiler(*tools) -> BindingCompiler:
+    registry = ToolRegistry()
+    for tool in tools:
+        registry.register(metadata=tool.get_metadata(), implementation=tool)
+    return BindingCompiler(registry)
+
+def step(tool: str, **input_mapping) -> dict:
+    return {"tool": tool, "reasoning": f"Run {tool}", "input_mapping": input_mapping}
+
+LOG = CallLog()
+WEATHER = make_tool("weather", LOG, {"location": {"type": "string"}}, output_title="WeatherOutput")
+EVENTS = make_tool("events", LOG, {"location": {"type": "string"}}, output_title="EventsOutput")
+NOTE = make_tool("note", LOG, {"text": {"type": "string"}, "events": {"type": "array"}}, required=["text"])
+
+@pytest.mark.parametrize("value", ["3.5", "v1.2", "e.g.", "St. Louis"])
+def test_dotted_literals_are_kept(value):
+    plan = compiler(WEATHER, NOTE).compile([step("weather", location="{task}"), step("note", text=value)])
+
+    assert plan[1].inputs == {"text": LiteralValue(value)}
+    assert plan[1].dependencies == frozenset()
+
+def test_references_bind_to_latest_step():
+    plan = compiler(WEATHER, EVENTS, NOTE).compile([
+        step("events", location="{task}"),
+        step("weather", location="{task}"),
+        step("note", text="weather.summary", events="events.items")
+    ])
+
+    assert plan[0].inputs == {"location": TaskText()}
+    assert plan[2].inputs == {"text": StepOutput(1, ("summary",)), "events": StepOutput(0, ("items",))}
+    assert plan[2].dependencies == frozenset({0, 1})
+
+def test_reference_to_tool_without_earlier_step_is_rejected():
+    with pytest.raises(BindingError, match="no earlier step runs"):
+        compiler(WEATHER, NOTE).compile([step("note", text="weather.summary")])
+
+def test_unbound_required_input_is_rejected():
+    with pytest.raises(BindingError, match="required inputs"):
+        compiler(WEATHER, NOTE).compile([step("weather", location="{task}"), step("note", events=[])])
+
+@pytest.mark.parametrize("keyword", ["allOf", "anyOf", "oneOf"])
+def test_nested_refs_bind_to_matching_producer(keyword):
+    consumer = make_tool(
+        "consumer",
+        LOG,
+        {"weather_data": {keyword: [{"$ref": "#/$defs/WeatherOutput"}, {"type": "null"}]}}
+    )
+    plan = compiler(EVENTS, WEATHER, consumer).compile([
+        {"tool": "weather", "reasoning": "Get the weather"},
+        {"tool": "events", "reasoning": "Find events"},
+        {"tool": "consumer", "reasoning": "Use the weather"}
+    ])
+
+    assert plan[2].inputs == {"weather_data": StepOutput(0)}
+    assert plan[2].dependencies == frozenset({0})
@@ -0,0 +1,96 @@
+"""Checkpointing failed runs and resuming them from each checkpoint store"""
+import asyncio
+
+import pytest
+
+from agent_framework.checkpoint import FileCheckpointStore, MemoryCheckpointStore, SQLiteCheckpointStore
+from agent_framework.exceptions import ToolExecutionError
+from agent_framework.planning import PipelineStep, Planner, StaticPlanner
+
+from tests.helpers import CallLog, ToolAgent, make_tool
+
+STORES = {
+    "memory": lambda tmp_path: MemoryCheckpointStore(),
+    "sqlite": lambda tmp_path: SQLiteCheckpointStore(tmp_path / "checkpoints.db"),
+    "file": lambda tmp_path: FileCheckpointStore(tmp_path / "checkpoints.log", fsync=False)
+}
+
+PIPELINE = [
+    PipelineStep(tool="weather_retriever", input_mapping={"location": "{task}"}),
+    PipelineStep(tool="umbrella_decider", input_mapping={"weather_data": "weather_retriever"})
+]
+
+def checkpointed_agent(log: CallLog, store, planner=None) -> ToolAgent:
+    return ToolAgent(
+        [
+            make_tool("weather_retriever", log, {"location": {"type": "string"}}, required=["location"]),
+            # Fails the first time it runs, so the run has to be resumed
+            make_tool(
+                "umbrella_decider", log, {"weather_data": {"type": "object"}}, required=["weather_data"],
+                fail=lambda call: call == 0
+            )
+        ],
+        planner=planner or StaticPlanner(PIPELINE),
+        checkpoint_store=store
+    )
+
+@pytest.fixture(params=sorted(STORES))
+def store(request, tmp_path):
+    store = STORES[request.param](tmp_path)
+    yield store
+    store.close()
+
+def test_failed_run_resumes_without_rerunning_completed_steps(store):
+    log = CallLog()
+    agent = checkpointed_agent(log, store)
+
+    with pytest.raises(ToolExecutionError) as failure:
+        asyncio.run(agent.run("Seattle"))
+    assert failure.value.task_id is not None
+
+    results = asyncio.run(agent.resume(failure.value.task_id))
+
+    assert [tool_name for tool_name, _ in results] == ["weather_retriever", "umbrella_decider"]
+    assert log.calls("weather_retriever") == [{"location": "Seattle"}]
+    assert len(log.calls("umbrella_decider")) == 2
+
+def test_completed_run_returns_stored_result(store):
+    log = CallLog()
+    agent = checkpointed_agent(log, store)
+
+    with pytest.raises(ToolExecutionError) as failure:
+        asyncio.run(agent.run("Seattle", task_id="order-1234"))
+    assert failure.value.task_id == "order-1234"
+    asyncio.run(agent.resume("order-1234"))
+    results = asyncio.run(agent.resume("order-1234"))
+
+    assert [tool_name for tool_name, _ in results] == ["weather_retriever", "umbrella_decider"]
+    assert len(log.events) == 6
+
+class FlakyPlanner(Planner):
+    """Raises a non-framework error the first time it plans"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def plan(self, agent, task, run=None):
+        self.calls += 1
+        if self.calls == 1:
+            raise ValueError("planner unavailable")
+        return await StaticPlanner(PIPELINE).plan(agent, task, run)
+
+def test_other_errors_are_raised_unchanged(store):
+    log = CallLog()
+    agent = checkpointed_agent(log, store, planner=FlakyPlanner())
+
+    with pytest.raises(ValueError) as failure:
+        asyncio.run(agent.run("Seattle", task_id="order-1234"))
+    assert not hasattr(failure.value, "task_id")
+
+    # Resumable with the ID chosen up front; the run is planned again
+    with pytest.raises(ToolExecutionError):
+        asyncio.run(agent.resume("order-1234"))
+    results = asyncio.run(agent.resume("order-1234"))
+
+    assert [tool_name for tool_name, _ in results] == ["weather_retriever", "umbrella_decider"]
+    assert len(log.calls("weather_retriever")) == 1
@@ -0,0 +1,39 @@
+"""Coalescing of identical concurrent tool calls"""
+import asyncio
+
+from agent_framework.planning import PipelineStep
+
+from tests.helpers import CallLog, ToolAgent, make_tool
+
+def run_twice(tool, **kwargs) -> None:
+    class PipelineAgent(ToolAgent):
+        pipeline = [PipelineStep(tool=tool.get_metadata().name, input_mapping={"item": "{task}"})]
+
+    async def scenario():
+        agent = PipelineAgent([tool], **kwargs)
+        return await asyncio.gather(agent.run("same"), agent.run("same"))
+
+    first, second = asyncio.run(scenario())
+    assert first == second
+
+def tool(name: str, log: CallLog, idempotent: bool):
+    base = make_tool(name, log, {"item": {"type": "string"}}, delay=0.05)
+    return type(f"{name}_tool", (base,), {"idempotent": idempotent})
+
+def test_idempotent_tool_calls_are_coalesced():
+    log = CallLog()
+    run_twice(tool("lookup", log, idempotent=True), coalesce_tool_calls=True)
+
+    assert len(log.calls("lookup")) == 1
+
+def test_other_tool_calls_are_not_coalesced():
+    log = CallLog()
+    run_twice(tool("book", log, idempotent=False), coalesce_tool_calls=True)
+
+    assert len(log.calls("book")) == 2
+
+def test_coalescing_is_off_by_default():
+    log = CallLog()
+    run_twice(tool("lookup", log, idempotent=True))
+
+    assert len(log.calls("lookup")) == 2
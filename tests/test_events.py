@@ -0,0 +1,75 @@
+"""EventStream buffering and Agent.run_stream"""
+import asyncio
+
+from agent_framework.events import EventStream, TokenDelta, emit_token
+from agent_framework.planning import PipelineStep
+
+from tests.helpers import CallLog, ToolAgent, make_tool
+
+def event(text: str = "x") -> TokenDelta:
+    return TokenDelta(task_id="task", tool_name="tool", text=text)
+
+def test_emit_after_close_is_dropped():
+    async def scenario():
+        stream = EventStream(max_size=1)
+        stream.close()
+        await asyncio.wait_for(stream.emit(event()), timeout=1)
+        return await stream.next()
+
+    assert asyncio.run(scenario()) is None
+
+def test_close_releases_blocked_emitters():
+    async def scenario():
+        stream = EventStream(max_size=1)
+        await stream.emit(event("kept"))
+        blocked = asyncio.ensure_future(stream.emit(event("dropped")))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        stream.close()
+        await asyncio.wait_for(blocked, timeout=1)
+        return [await stream.next(), await stream.next()]
+
+    kept, end = asyncio.run(scenario())
+    assert kept.text == "kept"
+    assert end is None
+
+def test_run_stream_yields_events_in_order():
+    log = CallLog()
+
+    class PipelineAgent(ToolAgent):
+        pipeline = [PipelineStep(tool="search", input_mapping={"query": "{task}"})]
+
+    async def scenario():
+        agent = PipelineAgent([make_tool("search", log, {"query": {"type": "string"}})])
+        return [event.type async for event in agent.run_stream("cats")]
+
+    assert asyncio.run(scenario()) == ["plan_ready", "step_started", "step_finished", "final_result"]
+
+def test_disconnected_consumer_does_not_block_shared_call():
+    # A streamed run and a plain run share one in-flight call of a tool streaming many tokens.
+    # The stream's consumer leaves after the first event, and the plain run must still finish.
+    log = CallLog()
+
+    class StreamingTool(make_tool("writer", log, {"topic": {"type": "string"}}, delay=0.05)):
+        idempotent = True
+
+        async def execute(self, **inputs):
+            await super().execute(**inputs)
+            for _ in range(20):
+                await emit_token("token ")
+            return {"text": "done"}
+
+    class PipelineAgent(ToolAgent):
+        pipeline = [PipelineStep(tool="writer", input_mapping={"topic": "{task}"})]
+
+    async def scenario():
+        agent = PipelineAgent([StreamingTool], coalesce_tool_calls=True)
+        stream = agent.run_stream("cats", max_buffered_events=2)
+        await stream.__anext__()
+        plain = asyncio.ensure_future(agent.run("cats"))
+        await asyncio.sleep(0.01)
+        await stream.aclose()
+        return await asyncio.wait_for(plain, timeout=2)
+
+    assert asyncio.run(scenario()) == [("writer", {"text": "done"})]
+    assert len(log.calls("writer")) == 1
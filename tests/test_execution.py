@@ -0,0 +1,144 @@
+"""Plan execution: step scheduling, failure propagation, resuming and re-planning"""
+import asyncio
+
+import pytest
+
+from agent_framework.checkpoint import MemoryCheckpointStore
+from agent_framework.exceptions import ToolExecutionError
+from agent_framework.planning import PipelineStep, StaticPlanner
+
+from tests.helpers import CallLog, ToolAgent, make_plan, make_tool
+
+OBJECT = {"type": "object"}
+
+# Two independent lookups feeding a summary
+PIPELINE = [
+    PipelineStep(tool="weather_retriever", input_mapping={"location": "{task}"}),
+    PipelineStep(tool="event_finder", input_mapping={"location": "{task}"}),
+    PipelineStep(
+        tool="summarizer",
+        input_mapping={"weather_data": "weather_retriever", "events": "event_finder"}
+    )
+]
+
+def pipeline_agent(log: CallLog, planner=None, fail=None, **kwargs) -> ToolAgent:
+    """Agent running PIPELINE, where ``fail`` maps tool names to the calls that fail"""
+    fail = fail or {}
+    return ToolAgent(
+        [
+            make_tool(
+                "weather_retriever", log, {"location": {"type": "string"}}, delay=0.05,
+                fail=fail.get("weather_retriever", lambda call: False)
+            ),
+            make_tool(
+                "event_finder", log, {"location": {"type": "string"}}, delay=0.01,
+                fail=fail.get("event_finder", lambda call: False)
+            ),
+            make_tool("summarizer", log, {"weather_data": OBJECT, "events": OBJECT}),
+            make_tool("forecast_retriever", log, {"location": {"type": "string"}})
+        ],
+        planner=planner or StaticPlanner(PIPELINE),
+        **kwargs
+    )
+
+def test_independent_steps_run_in_parallel():
+    log = CallLog()
+    asyncio.run(pipeline_agent(log).run("Seattle"))
+
+    # Both lookups start before either finishes
+    assert log.position("start", "event_finder") < log.position("end", "weather_retriever")
+    assert log.position("start", "weather_retriever") < log.position("end", "event_finder")
+
+def test_dependent_steps_wait_for_their_inputs():
+    log = CallLog()
+    asyncio.run(pipeline_agent(log).run("Seattle"))
+
+    assert log.position("start", "summarizer") > log.position("end", "weather_retriever")
+    assert log.position("start", "summarizer") > log.position("end", "event_finder")
+    summary = log.calls("summarizer")[0]
+    assert summary["weather_data"]["tool"] == "weather_retriever"
+    assert summary["events"]["tool"] == "event_finder"
+
+def test_results_are_in_plan_order():
+    # event_finder finishes first, but the results follow the plan
+    results = asyncio.run(pipeline_agent(CallLog()).run("Seattle"))
+
+    assert [tool_name for tool_name, _ in results] == ["weather_retriever", "event_finder", "summarizer"]
+
+def test_concurrency_cap_runs_steps_one_at_a_time():
+    log = CallLog()
+    asyncio.run(pipeline_agent(log, max_concurrent_steps=1).run("Seattle"))
+
+    assert [event for event, _, _ in log.events] == ["start", "end"] * 3
+
+def test_failed_step_stops_its_dependents():
+    log = CallLog()
+    agent = pipeline_agent(log, fail={"event_finder": lambda call: True})
+
+    with pytest.raises(ToolExecutionError) as failure:
+        asyncio.run(agent.run("Seattle"))
+
+    assert failure.value.tool_name == "event_finder"
+    assert log.calls("summarizer") == []
+
+def test_resume_skips_steps_completed_in_parallel():
+    # event_finder fails after weather_retriever has started alongside it
+    log = CallLog()
+    agent = pipeline_agent(
+        log, fail={"event_finder": lambda call: call == 0},
+        checkpoint_store=MemoryCheckpointStore(), recover_failed_steps=True, max_replans=0
+    )
+
+    with pytest.raises(ToolExecutionError) as failure:
+        asyncio.run(agent.run("Seattle"))
+    results = asyncio.run(agent.resume(failure.value.task_id))
+
+    assert [tool_name for tool_name, _ in results] == ["weather_retriever", "event_finder", "summarizer"]
+    assert len(log.calls("weather_retriever")) == 1
+    assert len(log.calls("event_finder")) == 2
+    assert len(log.calls("summarizer")) == 1
+
+class ReplanningPlanner(StaticPlanner):
+    """Runs the event lookup before PIPELINE's other steps, replacing it with the given steps when it fails"""
+
+    def __init__(self, *remaining):
+        super().__init__([PIPELINE[1], PIPELINE[0], PIPELINE[2]])
+        self.remaining = remaining
+        self.replans = []
+
+    async def replan(self, agent, task, plan, completed, failures, run=None):
+        self.replans.append((list(completed), sorted(failures)))
+        return make_plan(*self.remaining)
+
+def test_replan_keeps_completed_results_under_new_indices():
+    log = CallLog()
+    planner = ReplanningPlanner(
+        {"tool": "forecast_retriever", "input_mapping": {"location": "{task}"}},
+        {"tool": "summarizer", "input_mapping": {"weather_data": "weather_retriever", "events": "forecast_retriever"}}
+    )
+    agent = pipeline_agent(
+        log, planner=planner, fail={"event_finder": lambda call: True}, recover_failed_steps=True
+    )
+    results = asyncio.run(agent.run("Seattle"))
+
+    # Only weather_retriever completed; the summary never ran after the failed lookup
+    assert planner.replans == [([1], [0])]
+    assert [tool_name for tool_name, _ in results] == ["weather_retriever", "forecast_retriever", "summarizer"]
+    # The kept result moves from index 1 to 0 without running again, and later steps bind to it
+    assert len(log.calls("weather_retriever")) == 1
+    assert len(log.calls("forecast_retriever")) == 1
+    summary = log.calls("summarizer")[0]
+    assert summary["weather_data"]["tool"] == "weather_retriever"
+    assert summary["events"]["tool"] == "forecast_retriever"
+
+def test_replan_gives_up_after_max_replans():
+    log = CallLog()
+    planner = ReplanningPlanner({"tool": "event_finder", "input_mapping": {"location": "{task}"}})
+    agent = pipeline_agent(
+        log, planner=planner, fail={"event_finder": lambda call: True}, recover_failed_steps=True, max_replans=1
+    )
+
+    with pytest.raises(ToolExecutionError):
+        asyncio.run(agent.run("Seattle"))
+    assert len(planner.replans) == 1
+    assert len(log.calls("event_finder")) == 2
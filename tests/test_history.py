@@ -0,0 +1,53 @@
+"""Message history bounds and blob spilling"""
+import asyncio
+import os
+
+from agent_framework.history import BlobRef, BlobStore, MessageHistory
+from agent_framework.planning import PipelineStep
+
+from tests.helpers import CallLog, ToolAgent, make_tool
+
+PAYLOAD = {"text": "x" * 100}
+
+def blob_count(store: BlobStore) -> int:
+    return sum(len(files) for _, _, files in os.walk(store.directory))
+
+def test_agent_keeps_results_inline_by_default():
+    log = CallLog()
+    seen = []
+
+    class PipelineAgent(ToolAgent):
+        pipeline = [PipelineStep(tool="search", input_mapping={"query": "{task}"})]
+
+        async def _format_result(self, task, results, run):
+            seen.extend(run.message_history)
+            return results
+
+    agent = PipelineAgent([make_tool("search", log, {"query": {"type": "string"}}, result=lambda _: PAYLOAD)])
+    asyncio.run(agent.run("cats"))
+
+    assert seen[0]["result"] == PAYLOAD
+    assert agent.blob_store is None
+
+def test_large_payloads_are_spilled_and_released_on_close(tmp_path):
+    store = BlobStore(str(tmp_path))
+    history = MessageHistory(inline_bytes=10, blob_store=store)
+    history.append({"role": "tool", "result": PAYLOAD})
+    history.append({"role": "tool", "result": PAYLOAD})
+
+    ref = history[0]["result"]
+    assert isinstance(ref, BlobRef)
+    assert ref.load() == PAYLOAD
+    assert blob_count(store) == 1
+
+    history.close()
+    assert blob_count(store) == 0
+
+def test_evicted_entries_release_their_blobs(tmp_path):
+    store = BlobStore(str(tmp_path))
+    history = MessageHistory(max_entries=1, inline_bytes=10, blob_store=store)
+    history.append({"role": "tool", "result": PAYLOAD})
+    history.append({"role": "tool", "result": {"text": "y" * 100}})
+
+    assert len(history) == 1
+    assert blob_count(store) == 1
@@ -0,0 +1,53 @@
+"""Shared HTTP pool lifecycle and its injection into tools"""
+import asyncio
+
+import pytest
+
+from agent_framework.http import HttpClientPool
+from agent_framework.utils.tool_registry import ToolRegistry
+
+from tests.helpers import CallLog, make_tool
+
+def test_session_from_another_event_loop_is_closed_when_replaced():
+    pool = HttpClientPool()
+    first = asyncio.run(pool.session())
+
+    async def replace():
+        second = await pool.session()
+        await pool.close()
+        return second
+
+    second = asyncio.run(replace())
+    assert second is not first
+    assert first.closed
+
+def test_tools_get_the_registry_pool():
+    pool = HttpClientPool()
+    tool = make_tool("fetch", CallLog())
+    registry = ToolRegistry(http_pool=pool)
+    registry.register(metadata=tool.get_metadata(), implementation=tool)
+
+    async def borrow():
+        async with registry.acquire("fetch") as instance:
+            return instance.http
+
+    assert asyncio.run(borrow()) is pool
+
+def test_tool_outside_a_registry_has_no_pool():
+    with pytest.raises(RuntimeError, match="no HTTP pool"):
+        make_tool("fetch", CallLog())().http
+
+def test_registry_leaves_shared_pool_open():
+    async def scenario():
+        pool = HttpClientPool()
+        session = await pool.session()
+        await ToolRegistry(http_pool=pool).aclose()
+        assert not session.closed
+
+        own = ToolRegistry()
+        own_session = await own.http_pool.session()
+        await own.aclose()
+        assert own_session.closed
+        await pool.close()
+
+    asyncio.run(scenario())
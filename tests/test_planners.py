@@ -0,0 +1,111 @@
+"""Planners: declarative pipelines, plan caching and fallback chains"""
+import asyncio
+
+import pytest
+
+from agent_framework.exceptions import PlanningError
+from agent_framework.llm.local_provider import LocalProvider
+from agent_framework.llm.models import StructuredChunk
+from agent_framework.planning import LLMPlanner, PipelineStep, PlanCache, Planner, PlannerChain, StaticPlanner
+
+from tests.helpers import CallLog, ToolAgent, make_plan, make_tool
+
+def pipeline_agent(log: CallLog) -> ToolAgent:
+    class PipelineAgent(ToolAgent):
+        pipeline = [
+            PipelineStep(tool="weather_retriever", input_mapping={"location": "{task}"}),
+            PipelineStep(tool="umbrella_decider", input_mapping={"weather_data": "weather_retriever"})
+        ]
+
+    return PipelineAgent([
+        make_tool("weather_retriever", log, {"location": {"type": "string"}}, required=["location"]),
+        make_tool("umbrella_decider", log, {"weather_data": {"type": "object"}}, required=["weather_data"])
+    ])
+
+@pytest.mark.parametrize("task", ["Seattle", "St. Louis", "Washington D.C.", "weather_retriever"])
+def test_task_is_passed_as_text(task):
+    log = CallLog()
+    asyncio.run(pipeline_agent(log).run(task))
+
+    assert log.calls("weather_retriever") == [{"location": task}]
+    assert log.calls("umbrella_decider")[0]["weather_data"]["inputs"] == {"location": task}
+
+def test_plan_keeps_task_placeholder():
+    log = CallLog()
+    agent = pipeline_agent(log)
+    plan = asyncio.run(StaticPlanner(agent.pipeline).plan(agent, "St. Louis"))
+
+    assert plan.execution_plan[0]["input_mapping"] == {"location": "{task}"}
+
+class PartialPlanner(Planner):
+    """Streams the given steps, returning them as a plan only when ``complete``"""
+
+    def __init__(self, steps, complete: bool):
+        self.steps = steps
+        self.complete = complete
+
+    async def plan(self, agent, task, run=None):
+        return make_plan(*self.steps) if self.complete else None
+
+    async def plan_incremental(self, agent, task, on_step, run=None):
+        for step in self.steps:
+            on_step(step)
+        return await self.plan(agent, task, run)
+
+class TruncatedStreamProvider(LocalProvider):
+    """Streams plan steps but ends before the complete plan"""
+
+    def __init__(self, steps):
+        super().__init__()
+        self.steps = steps
+
+    async def generate_structured_stream(self, messages, output_model, config=None, stream_fields=()):
+        for index, step in enumerate(self.steps):
+            yield StructuredChunk(path=("execution_plan", index), value=step)
+
+STEPS = make_plan({"tool": "weather_retriever", "input_mapping": {"location": "{task}"}}).execution_plan
+
+def test_chain_fallback_skips_steps_already_submitted():
+    steps = STEPS + make_plan({"tool": "umbrella_decider"}).execution_plan
+    chain = PlannerChain([PartialPlanner(steps[:1], complete=False), PartialPlanner(steps, complete=True)])
+    submitted = []
+    plan = asyncio.run(chain.plan_incremental(pipeline_agent(CallLog()), "Seattle", submitted.append))
+
+    assert submitted == steps
+    assert plan.execution_plan == steps
+
+def test_chain_fallback_must_keep_steps_already_submitted():
+    other = make_plan({"tool": "umbrella_decider"}).execution_plan
+    chain = PlannerChain([PartialPlanner(STEPS, complete=False), PartialPlanner(other, complete=True)])
+
+    with pytest.raises(PlanningError):
+        asyncio.run(chain.plan_incremental(pipeline_agent(CallLog()), "Seattle", lambda step: None))
+
+def test_incomplete_streamed_plan_is_not_cached():
+    agent = pipeline_agent(CallLog())
+    agent.llm_provider = TruncatedStreamProvider(STEPS)
+    planner = LLMPlanner(plan_cache=PlanCache())
+    submitted = []
+
+    assert asyncio.run(planner.plan_incremental(agent, "Seattle", submitted.append)) is None
+    assert submitted == STEPS
+    assert len(planner.plan_cache.store) == 0
+
+def test_invalid_plan_is_not_cached():
+    agent = pipeline_agent(CallLog())
+    # Refers to a tool no earlier step runs
+    agent.llm_provider = LocalProvider([
+        make_plan({"tool": "umbrella_decider", "input_mapping": {"weather_data": "weather_retriever"}})
+    ])
+    planner = LLMPlanner(plan_cache=PlanCache())
+    asyncio.run(planner.plan(agent, "Seattle"))
+
+    assert len(planner.plan_cache.store) == 0
+
+def test_valid_plan_is_cached():
+    agent = pipeline_agent(CallLog())
+    agent.llm_provider = LocalProvider([make_plan(*STEPS)])
+    planner = LLMPlanner(plan_cache=PlanCache())
+    asyncio.run(planner.plan(agent, "Seattle"))
+
+    assert planner.plan_cache.get(agent, "Seattle").execution_plan == STEPS
@@ -0,0 +1,104 @@
+"""ResilientProvider retries, hedging and deadlines, exercised against LocalProvider"""
+import asyncio
+import time
+
+import pytest
+
+from agent_framework.llm.local_provider import LocalProvider
+from agent_framework.llm.models import LLMMessage
+from agent_framework.llm.resilience import LatencyHistogram, ResilientProvider, call_deadline
+
+MESSAGES = [LLMMessage(role="user", content="hello")]
+
+class RateLimited(Exception):
+    status_code = 429
+
+def generate(provider: ResilientProvider) -> str:
+    return asyncio.run(provider.generate(MESSAGES)).content
+
+def fast_histogram(latency: float = 0.01, samples: int = 20) -> LatencyHistogram:
+    histogram = LatencyHistogram()
+    for _ in range(samples):
+        histogram.record(latency)
+    return histogram
+
+def test_retries_transient_errors():
+    local = LocalProvider([RateLimited(), RateLimited(), "ok"])
+    provider = ResilientProvider(local, max_retries=2, base_delay=0)
+
+    assert generate(provider) == "ok"
+    assert len(local.calls) == 3
+    assert provider.stats.retries == 2
+    assert provider.stats.failures == 0
+
+def test_gives_up_after_max_retries():
+    local = LocalProvider([RateLimited()])
+    provider = ResilientProvider(local, max_retries=1, base_delay=0)
+
+    with pytest.raises(RateLimited):
+        generate(provider)
+    assert len(local.calls) == 2
+    assert provider.stats.failures == 1
+
+def test_does_not_retry_permanent_errors():
+    local = LocalProvider([ValueError("bad request"), "ok"])
+    provider = ResilientProvider(local, max_retries=2, base_delay=0)
+
+    with pytest.raises(ValueError):
+        generate(provider)
+    assert len(local.calls) == 1
+
+def test_hedges_slow_calls():
+    # The first request stalls; the hedge sent after the p95 latency answers quickly
+    local = LocalProvider(["ok"], latency=lambda call: 5.0 if call == 0 else 0.01)
+    provider = ResilientProvider(local, hedge=True, min_hedge_delay=0.01, histogram=fast_histogram())
+
+    started = time.monotonic()
+    assert generate(provider) == "ok"
+    assert time.monotonic() - started < 1.0
+    assert len(local.calls) == 2
+    assert provider.stats.hedges == 1
+    assert provider.stats.hedge_wins == 1
+
+def test_no_hedge_before_enough_samples():
+    local = LocalProvider(["ok"], latency=0.05)
+    provider = ResilientProvider(local, hedge=True, min_hedge_delay=0.01, histogram=fast_histogram(samples=5))
+
+    assert generate(provider) == "ok"
+    assert len(local.calls) == 1
+    assert provider.stats.hedges == 0
+
+def test_deadline_bounds_call_including_retries():
+    local = LocalProvider([RateLimited()], latency=0.02)
+    provider = ResilientProvider(local, max_retries=100, base_delay=0, deadline=0.2)
+
+    started = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        generate(provider)
+    assert time.monotonic() - started < 1.0
+    assert provider.stats.deadline_exceeded == 1
+    assert provider.stats.retries > 0
+
+def test_call_deadline_overrides_provider_deadline():
+    local = LocalProvider(["ok"], latency=0.5)
+    provider = ResilientProvider(local, deadline=10.0)
+
+    async def call() -> None:
+        with call_deadline(0.05):
+            await provider.generate(MESSAGES)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(call())
+    assert provider.stats.deadline_exceeded == 1
+
+def test_factory_leaves_retries_to_the_wrapper(monkeypatch):
+    from agent_framework.config import AgentConfiguration
+    from agent_framework.factory import AgentFactory
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    config = AgentConfiguration.from_dict({"api_keys": {"openai": "test"}, "llm_max_retries": 3, "coalesce_calls": False})
+    provider = AgentFactory(config).get_llm_provider()
+
+    assert isinstance(provider, ResilientProvider)
+    assert provider.max_retries == 3
+    assert provider.provider.client.max_retries == 0
@@ -0,0 +1,43 @@
+"""ToolContext construction, including the deprecated previous_* arguments"""
+from datetime import datetime
+
+import pytest
+
+from agent_framework.models import ToolContext
+
+def context(**kwargs) -> ToolContext:
+    return ToolContext(
+        task="cats",
+        tool_name="search",
+        inputs={"query": "cats"},
+        available_tools=[],
+        message_history=[],
+        agent_id="agent",
+        task_id="task",
+        start_time=datetime(2024, 1, 1),
+        metadata={},
+        **kwargs
+    )
+
+def test_previous_lists_default_to_empty():
+    tool_context = context()
+
+    assert tool_context.previous_tools == []
+    assert tool_context.previous_results == []
+    assert tool_context.previous_errors == []
+
+def test_previous_lists_are_still_accepted():
+    with pytest.deprecated_call():
+        tool_context = context(previous_tools=["weather"], previous_results=[{"rain": True}], previous_errors=[])
+
+    assert tool_context.previous_tools == ["weather"]
+    assert tool_context.previous_results == [{"rain": True}]
+    assert tool_context.previous_errors == []
+
+def test_contexts_compare_and_print_like_dataclasses():
+    other = context()
+    other.inputs = {"query": "dogs"}
+
+    assert context() == context()
+    assert context() != other
+    assert repr(context()).startswith("ToolContext(task='cats', tool_name='search'")